@@ -1,13 +1,28 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file, make_response
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, make_response, g
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-import sqlite3
+import atexit
 import os
 import random
 import json
-from datetime import datetime
-from ml_model import get_dropout_percentage, can_user_signup
-from languages import get_text, get_available_languages
+import logging
+from log_config import configure_logging, should_log_payload
+from ml_model import (get_dropout_percentage, get_dropout_batch, can_user_signup, warm_up,
+                      reload_model, start_model_watcher, get_model_status, registry)
+from languages import BUNDLE_VERSIONS, get_available_languages, get_bundle, get_text
+from migrations import migrate
+from db import ConnectionPool, connect, transaction
+from score_writer import ScoreWriter
+from skills import skill_profile
+from sessions import ServerSideSessionInterface, create_store
+from documents import DOWNLOAD_OFFLOAD, DocumentStore, UploadError, parse_upload, send_document
+from previews import PreviewWorker, can_preview
+from passwords import PasswordHasher, PasswordHasherBusy
+from login_guard import LoginGuard
+from page_cache import PageCache
+from assets import Assets
+from response_compression import CompressionMiddleware
+from leaderboard import LEADERBOARD_PAGE_SIZE, LEADERBOARD_MAX_LIMIT, board_around, board_page, board_standing
 
 # Python 3.14 compatibility fix for Flask
 import sys
@@ -17,109 +32,108 @@ if sys.version_info >= (3, 13):
         # Add stub for deprecated get_loader
         pkgutil.get_loader = lambda name: None
 
-DATABASE = 'hexecutioners.db'
+configure_logging()
+logger = logging.getLogger(__name__)
+payload_logger = logging.getLogger(__name__ + '.payloads')
+
+DATABASE = os.environ.get('HEXECUTIONERS_DB', 'hexecutioners.db')
 ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'pdf', 'png'}
+SCORE_BATCH_LIMIT = 10000  # Max assessments per /api/score-batch request
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_change_this'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
+# DOWNLOAD_OFFLOAD=x-sendfile lets the front server send document downloads
+app.config['USE_X_SENDFILE'] = DOWNLOAD_OFFLOAD == 'x-sendfile'
 
 # Create uploads folder if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+# Uploads are streamed into a content-addressed store (DOCUMENT_STORE,
+# uploads/store by default; see documents.py)
+document_store = DocumentStore()
+
+# The ML model loads lazily on the first prediction. Pre-fork servers that
+# import the app in the master (gunicorn --preload) can set DROPOUT_PRELOAD=1
+# to load it once there and share it copy-on-write with every worker.
+if os.environ.get('DROPOUT_PRELOAD') == '1':
+    warm_up()
+
+# New bundles in the model registry are picked up by polling every
+# DROPOUT_MODEL_WATCH_INTERVAL seconds, or on POST /admin/reload-model
+# with the MODEL_ADMIN_TOKEN in the X-Admin-Token header.
+MODEL_ADMIN_TOKEN = os.environ.get('MODEL_ADMIN_TOKEN')
+if float(os.environ.get('DROPOUT_MODEL_WATCH_INTERVAL', '0')) > 0:
+    start_model_watcher(float(os.environ['DROPOUT_MODEL_WATCH_INTERVAL']))
+
+# Page scripts and styles are built from static/src into fingerprinted,
+# precompressed files under /assets/ (see assets.py); templates link them
+# with asset_url()
+assets = Assets(app)
+
+# Game and module pages depend only on their template, language and asset
+# build; they are rendered once and served from memory, precompressed (see
+# page_cache.py)
+page_cache = PageCache(app, version=assets.version)
+
+# Everything else text-like (dynamic pages, JSON) is compressed on the way
+# out in the best encoding the client accepts (see response_compression.py)
+compression = CompressionMiddleware(app.wsgi_app)
+app.wsgi_app = compression
+
+# Connections are reused across requests (see db.py); each request
+# borrows at most one and gives it back on teardown
+db_pool = ConnectionPool(DATABASE)
 
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """This request's pooled connection, opened on first use"""
+    if 'db' not in g:
+        g.db = db_pool.acquire()
+    return g.db
+
+# Session values live server-side (see sessions.py); the cookie only
+# carries an opaque session id
+app.session_interface = ServerSideSessionInterface(create_store(pool=db_pool))
+
+# Previews and thumbnails of uploads are made off the request thread
+preview_worker = PreviewWorker(DATABASE, document_store)
+atexit.register(preview_worker.close)
+
+# Password KDFs run in a bounded pool (see passwords.py); when it is
+# saturated, login and signup answer 503 instead of piling up
+password_hasher = PasswordHasher()
+PASSWORD_BUSY_MESSAGE = 'Too many sign-ins right now, please try again in a moment'
+PASSWORD_BUSY_RETRY_AFTER = 5
+LOGIN_THROTTLED_MESSAGE = 'Too many login attempts, please wait a moment and try again'
+
+# Rate limits for /login (see login_guard.py)
+login_guard = LoginGuard()
+
+# Score events are buffered and written in batches; whatever is still
+# buffered when the process exits is written by close()
+score_writer = ScoreWriter(DATABASE)
+atexit.register(score_writer.close)
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_pool.release(conn)
 
 def init_db():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Create users table if it doesn't exist
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='users'")
-    if not cursor.fetchone():
-        conn.execute('''
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL
-            )
-        ''')
-    
-    # Create game_scores table if it doesn't exist
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='game_scores'")
-    if not cursor.fetchone():
-        conn.execute('''
-            CREATE TABLE game_scores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                game_name TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-    
-    # Create documents table if it doesn't exist
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='documents'")
-    if not cursor.fetchone():
-        conn.execute('''
-            CREATE TABLE documents (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                document_type TEXT NOT NULL,
-                file_path TEXT NOT NULL,
-                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-    
-    # Create assessments table if it doesn't exist
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='assessments'")
-    if not cursor.fetchone():
-        conn.execute('''
-            CREATE TABLE assessments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                age TEXT NOT NULL,
-                passed12th TEXT NOT NULL,
-                gender TEXT NOT NULL,
-                familyMembers TEXT NOT NULL,
-                earningMembers TEXT NOT NULL,
-                highestEducation TEXT NOT NULL,
-                familyHealthCondition TEXT NOT NULL,
-                familySupport TEXT NOT NULL,
-                dailyChores TEXT NOT NULL,
-                groupActivities TEXT NOT NULL,
-                sportsRating INTEGER NOT NULL,
-                communicationRating INTEGER NOT NULL,
-                technologyComfort TEXT NOT NULL,
-                pastProgram TEXT NOT NULL,
-                reasonForJoining TEXT NOT NULL,
-                dailyCommitment TEXT NOT NULL,
-                travelComfort TEXT NOT NULL,
-                workExperience TEXT NOT NULL,
-                healthCondition TEXT NOT NULL,
-                programBenefit TEXT NOT NULL,
-                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-    
-    conn.commit()
-    conn.close()
+    """Bring the database schema up to date (see migrations.py)"""
+    conn = connect(DATABASE)
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
 
 # Initialize database on app startup
 try:
     init_db()
 except Exception as e:
-    print(f"Warning: Database initialization error: {e}")
+    logger.warning("Database initialization error: %s", e)
 
 @app.route('/')
 def index():
@@ -143,7 +157,35 @@ def pre_assessment():
     if lang not in ['en', 'hi', 'kn']:
         lang = 'en'
     
-    return render_template('pre_assessment.html', lang=lang)
+    return render_template('pre_assessment.html', lang=lang, translation_bundles=translation_bundle_urls())
+
+# A year: bundle URLs carry a content version, so a changed bundle gets a new URL
+TRANSLATION_BUNDLE_MAX_AGE = 365 * 24 * 3600
+
+def translation_bundle_urls():
+    """Current versioned bundle URL for each language, for pages that switch language"""
+    return {code: url_for('translation_bundle', lang=code, version=version)
+            for code, version in BUNDLE_VERSIONS.items()}
+
+@app.route('/i18n/<lang>.<version>.json')
+def translation_bundle(lang, version):
+    """One language's compiled translations (see languages.py), cacheable forever"""
+    bundle = get_bundle(lang)
+    if bundle is None:
+        return '', 404
+    
+    data, current = bundle
+    if version != current:
+        # A page cached before the last deploy: point it at the current bundle
+        return redirect(url_for('translation_bundle', lang=lang, version=current))
+    
+    response = make_response(data)
+    response.mimetype = 'application/json'
+    response.cache_control.public = True
+    response.cache_control.max_age = TRANSLATION_BUNDLE_MAX_AGE
+    response.cache_control.immutable = True
+    response.set_etag(current)
+    return response.make_conditional(request)
 
 @app.route('/submit-pre-assessment', methods=['POST'])
 def submit_pre_assessment():
@@ -154,38 +196,36 @@ def submit_pre_assessment():
     try:
         data = request.json
         
-        # Log raw frontend data
-        print("\n" + "="*100)
-        print("FRONTEND DATA RECEIVED - RAW JSON:")
-        print("="*100)
-        print(json.dumps(data, indent=2, ensure_ascii=False))
-        print("="*100 + "\n")
+        # Full payload dumps are sampled (LOG_PAYLOAD_SAMPLE) and off by default
+        if should_log_payload(payload_logger):
+            payload_logger.debug("Pre-assessment payload: %s", json.dumps(data, ensure_ascii=False))
         
         # Get language from request
         lang = data.get('language', 'en')
         
         # Get dropout percentage from ML model
-        dropout_percentage = get_dropout_percentage(data)
+        dropout_percentage, model_version = get_dropout_percentage(data, return_version=True)
         can_signup = can_user_signup(dropout_percentage, threshold=70)
         
         # Store in session for use during signup
         session['pre_assessment_data'] = data
         session['dropout_percentage'] = dropout_percentage
         session['can_signup'] = can_signup
+        session['model_version'] = model_version
         session['language'] = lang
         
-        print(f"Assessment submitted - Dropout risk: {dropout_percentage}%, Can signup: {can_signup}")
+        logger.info("Pre-assessment submitted - dropout risk: %d%%, can signup: %s, model: %s",
+                    dropout_percentage, can_signup, model_version)
         
         return jsonify({
             'success': True,
             'dropout_percentage': dropout_percentage,
-            'can_signup': can_signup
+            'can_signup': can_signup,
+            'model_version': model_version
         })
     
     except Exception as e:
-        print(f"Pre-assessment error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Pre-assessment error")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/submit-pre-login-assessment', methods=['POST'])
@@ -196,64 +236,125 @@ def submit_pre_login_assessment():
     """
     return submit_pre_assessment()
 
+@app.route('/api/score-batch', methods=['POST'])
+def score_batch():
+    """
+    Score many pre-assessments in one request (intake drives)
+    Accepts a JSON list of assessments, or {"assessments": [...]}
+    Results are returned in input order
+    """
+    data = request.get_json(silent=True)
+    assessments = data.get('assessments') if isinstance(data, dict) else data
+    
+    if not isinstance(assessments, list) or not all(isinstance(a, dict) for a in assessments):
+        return jsonify({'success': False, 'error': 'Expected a list of assessments'}), 400
+    
+    if len(assessments) > SCORE_BATCH_LIMIT:
+        return jsonify({'success': False, 'error': f'At most {SCORE_BATCH_LIMIT} assessments per batch'}), 413
+    
+    dropout_percentages, model_version = get_dropout_batch(assessments, return_version=True)
+    results = [
+        {
+            'dropout_percentage': dropout_percentage,
+            'can_signup': can_user_signup(dropout_percentage, threshold=70)
+        }
+        for dropout_percentage in dropout_percentages
+    ]
+    
+    return jsonify({'success': True, 'results': results, 'model_version': model_version})
+
+def _is_model_admin():
+    return bool(MODEL_ADMIN_TOKEN) and request.headers.get('X-Admin-Token') == MODEL_ADMIN_TOKEN
+
+@app.route('/admin/reload-model', methods=['POST'])
+def admin_reload_model():
+    """
+    Load, validate and swap in a model bundle from the registry
+    Optional JSON {"version": "..."} switches to that version (and makes it
+    CURRENT once it passes validation). In-flight requests finish on the old model
+    """
+    if not _is_model_admin():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    try:
+        if version:
+            registry.resolve(version)
+    except FileNotFoundError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    
+    reload_model(version or None, wait=bool(data.get('wait')))
+    return jsonify({'success': True, 'status': get_model_status()}), 202
+
+@app.route('/admin/model-status')
+def admin_model_status():
+    if not _is_model_admin():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    return jsonify({'success': True, 'status': get_model_status()})
+
+@app.route('/admin/compression-stats')
+def admin_compression_stats():
+    """Bytes saved by response compression in this worker process"""
+    if not _is_model_admin():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    return jsonify({'success': True, 'stats': compression.stats()})
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         
+        # Floods are turned away before they cost a query or a KDF run
+        retry_after = login_guard.admit(request.remote_addr, username)
+        if retry_after:
+            lang = session.get('language', 'en')
+            return (render_template('login.html', error=LOGIN_THROTTLED_MESSAGE, lang=lang), 429,
+                    {'Retry-After': str(retry_after)})
+        
         conn = get_db_connection()
         user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
-        conn.close()
         
-        if user and check_password_hash(user['password'], password):
+        try:
+            if user:
+                verified, rehash = password_hasher.verify(user['password'], password)
+            else:
+                # Same cost as a real check, so timing doesn't reveal usernames
+                verified, rehash = password_hasher.verify_dummy(password), False
+        except PasswordHasherBusy:
+            lang = session.get('language', 'en')
+            return (render_template('login.html', error=PASSWORD_BUSY_MESSAGE, lang=lang), 503,
+                    {'Retry-After': str(PASSWORD_BUSY_RETRY_AFTER)})
+        
+        if verified:
+            login_guard.succeeded(username)
+            
+            # Stored with older KDF parameters: upgrade while we have the password
+            if rehash:
+                try:
+                    new_hash = password_hasher.hash(password)
+                    conn.execute('UPDATE users SET password = ? WHERE id = ?', (new_hash, user['id']))
+                    logger.info("Rehashed password for user %s", user['id'])
+                except PasswordHasherBusy:
+                    pass
+            
+            session.regenerate()
             session['user_id'] = user['id']
             session['username'] = user['username']
             
-            # Create assessments table if it doesn't exist
-            conn = get_db_connection()
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS assessments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    age TEXT NOT NULL,
-                    passed12th TEXT NOT NULL,
-                    gender TEXT NOT NULL,
-                    familyMembers TEXT NOT NULL,
-                    earningMembers TEXT NOT NULL,
-                    highestEducation TEXT NOT NULL,
-                    familyHealthCondition TEXT NOT NULL,
-                    familySupport TEXT NOT NULL,
-                    dailyChores TEXT NOT NULL,
-                    groupActivities TEXT NOT NULL,
-                    sportsRating INTEGER NOT NULL,
-                    communicationRating INTEGER NOT NULL,
-                    technologyComfort TEXT NOT NULL,
-                    pastProgram TEXT NOT NULL,
-                    reasonForJoining TEXT NOT NULL,
-                    dailyCommitment TEXT NOT NULL,
-                    travelComfort TEXT NOT NULL,
-                    workExperience TEXT NOT NULL,
-                    healthCondition TEXT NOT NULL,
-                    programBenefit TEXT NOT NULL,
-                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id)
-                )
-            ''')
-            conn.commit()
-            
             # Check if user has completed assessment (post-login assessment)
             assessment = conn.execute(
                 'SELECT id FROM assessments WHERE user_id = ?',
                 (user['id'],)
             ).fetchone()
-            conn.close()
             
             if not assessment:
                 return redirect(url_for('assessment'))
             
             return redirect(url_for('dashboard'))
         else:
+            login_guard.failed(username)
             lang = session.get('language', 'en')
             return render_template('login.html', error=get_text('invalid_credentials', lang), lang=lang)
     
@@ -267,53 +368,59 @@ def signup():
         email = request.form.get('email', '').strip()
         password = request.form.get('password', '')
         
-        hashed_password = generate_password_hash(password)
+        try:
+            hashed_password = password_hasher.hash(password)
+        except PasswordHasherBusy:
+            lang = session.get('language', 'en')
+            return (render_template('signup.html', error=PASSWORD_BUSY_MESSAGE, lang=lang), 503,
+                    {'Retry-After': str(PASSWORD_BUSY_RETRY_AFTER)})
         conn = get_db_connection()
         
         try:
-            user_id = conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
-                        (username, email, hashed_password)).lastrowid
-            
-            # Store pre-assessment data for new user
-            assessment_data = session.get('pre_assessment_data', {})
-            conn.execute(
-                '''INSERT INTO assessments (
-                    user_id, age, passed12th, gender, familyMembers, earningMembers,
-                    highestEducation, familyHealthCondition, familySupport, dailyChores,
-                    groupActivities, sportsRating, communicationRating, technologyComfort,
-                    pastProgram, reasonForJoining, dailyCommitment, travelComfort,
-                    workExperience, healthCondition, programBenefit
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                (
-                    user_id,
-                    assessment_data.get('age'),
-                    assessment_data.get('passed12th'),
-                    assessment_data.get('gender'),
-                    assessment_data.get('familyMembers'),
-                    assessment_data.get('earningMembers'),
-                    assessment_data.get('highestEducation'),
-                    assessment_data.get('familyHealthCondition'),
-                    assessment_data.get('familySupport'),
-                    assessment_data.get('dailyChores'),
-                    assessment_data.get('groupActivities'),
-                    int(assessment_data.get('sportsRating', 0)),
-                    int(assessment_data.get('communicationRating', 0)),
-                    assessment_data.get('technologyComfort'),
-                    assessment_data.get('pastProgram'),
-                    assessment_data.get('reasonForJoining'),
-                    assessment_data.get('dailyCommitment'),
-                    assessment_data.get('travelComfort'),
-                    assessment_data.get('workExperience'),
-                    assessment_data.get('healthCondition'),
-                    assessment_data.get('programBenefit')
+            with transaction(conn):
+                user_id = conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                            (username, email, hashed_password)).lastrowid
+                
+                # Store pre-assessment data for new user
+                assessment_data = session.get('pre_assessment_data', {})
+                conn.execute(
+                    '''INSERT INTO assessments (
+                        user_id, age, passed12th, gender, familyMembers, earningMembers,
+                        highestEducation, familyHealthCondition, familySupport, dailyChores,
+                        groupActivities, sportsRating, communicationRating, technologyComfort,
+                        pastProgram, reasonForJoining, dailyCommitment, travelComfort,
+                        workExperience, healthCondition, programBenefit, model_version
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (
+                        user_id,
+                        assessment_data.get('age'),
+                        assessment_data.get('passed12th'),
+                        assessment_data.get('gender'),
+                        assessment_data.get('familyMembers'),
+                        assessment_data.get('earningMembers'),
+                        assessment_data.get('highestEducation'),
+                        assessment_data.get('familyHealthCondition'),
+                        assessment_data.get('familySupport'),
+                        assessment_data.get('dailyChores'),
+                        assessment_data.get('groupActivities'),
+                        int(assessment_data.get('sportsRating', 0)),
+                        int(assessment_data.get('communicationRating', 0)),
+                        assessment_data.get('technologyComfort'),
+                        assessment_data.get('pastProgram'),
+                        assessment_data.get('reasonForJoining'),
+                        assessment_data.get('dailyCommitment'),
+                        assessment_data.get('travelComfort'),
+                        assessment_data.get('workExperience'),
+                        assessment_data.get('healthCondition'),
+                        assessment_data.get('programBenefit'),
+                        session.get('model_version')
+                    )
                 )
-            )
             
-            conn.commit()
-            conn.close()
+            # The answers are now stored with the account
+            session.pop('pre_assessment_data', None)
             return redirect(url_for('login'))
         except Exception as e:
-            conn.close()
             lang = session.get('language', 'en')
             return render_template('signup.html', error=str(e), lang=lang)
     
@@ -327,24 +434,10 @@ def dashboard():
     
     conn = get_db_connection()
     
-    # Create table if it doesn't exist
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS game_scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            game_name TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    conn.commit()
-    
     scores = conn.execute(
         'SELECT game_name, MAX(score) as best_score FROM game_scores WHERE user_id = ? GROUP BY game_name',
         (session['user_id'],)
     ).fetchall()
-    conn.close()
     
     game_scores = {score['game_name']: score['best_score'] for score in scores}
     
@@ -356,58 +449,47 @@ def games():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('games.html', username=session['username'], lang=lang)
+    return page_cache.render('games.html', username=session['username'], lang=lang)
 
 @app.route('/game/number-guess')
 def number_guess():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('number_guess.html', lang=lang)
+    return page_cache.render('number_guess.html', lang=lang)
 
 @app.route('/game/memory')
 def memory_game():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('memory.html', lang=lang)
+    return page_cache.render('memory.html', lang=lang)
 
 @app.route('/game/trivia')
 def trivia_game():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('trivia.html', lang=lang)
+    return page_cache.render('trivia.html', lang=lang)
 
 @app.route('/api/save-score', methods=['POST'])
 def save_score():
     if 'user_id' not in session:
         return jsonify({'success': False}), 401
     
-    data = request.json
+    data = request.json or {}
     game_name = data.get('game_name')
-    score = data.get('score')
-    
-    conn = get_db_connection()
-    
-    # Create table if it doesn't exist
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS game_scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            game_name TEXT NOT NULL,
-            score INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+    try:
+        score = int(data.get('score'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid score'}), 400
+    if not isinstance(game_name, str) or not game_name:
+        return jsonify({'success': False, 'error': 'Invalid game name'}), 400
     
-    conn.execute(
-        'INSERT INTO game_scores (user_id, game_name, score) VALUES (?, ?, ?)',
-        (session['user_id'], game_name, score)
-    )
-    conn.commit()
-    conn.close()
+    # Written in batches by a background thread (see score_writer.py)
+    saved = score_writer.submit(session['user_id'], game_name, score)
+    if not saved:
+        return jsonify({'success': False, 'error': 'Score could not be saved, please retry'}), 503
     
     return jsonify({'success': True})
 
@@ -430,41 +512,11 @@ def assessment():
     
     # Check if user has already completed assessment
     conn = get_db_connection()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS assessments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            age TEXT NOT NULL,
-            passed12th TEXT NOT NULL,
-            gender TEXT NOT NULL,
-            familyMembers TEXT NOT NULL,
-            earningMembers TEXT NOT NULL,
-            highestEducation TEXT NOT NULL,
-            familyHealthCondition TEXT NOT NULL,
-            familySupport TEXT NOT NULL,
-            dailyChores TEXT NOT NULL,
-            groupActivities TEXT NOT NULL,
-            sportsRating INTEGER NOT NULL,
-            communicationRating INTEGER NOT NULL,
-            technologyComfort TEXT NOT NULL,
-            pastProgram TEXT NOT NULL,
-            reasonForJoining TEXT NOT NULL,
-            dailyCommitment TEXT NOT NULL,
-            travelComfort TEXT NOT NULL,
-            workExperience TEXT NOT NULL,
-            healthCondition TEXT NOT NULL,
-            programBenefit TEXT NOT NULL,
-            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    conn.commit()
     
     existing_assessment = conn.execute(
         'SELECT id FROM assessments WHERE user_id = ?',
         (session['user_id'],)
     ).fetchone()
-    conn.close()
     
     if existing_assessment:
         return redirect(url_for('dashboard'))
@@ -482,37 +534,6 @@ def submit_assessment():
         
         conn = get_db_connection()
         
-        # Create table if it doesn't exist
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS assessments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                age TEXT NOT NULL,
-                passed12th TEXT NOT NULL,
-                gender TEXT NOT NULL,
-                familyMembers TEXT NOT NULL,
-                earningMembers TEXT NOT NULL,
-                highestEducation TEXT NOT NULL,
-                familyHealthCondition TEXT NOT NULL,
-                familySupport TEXT NOT NULL,
-                dailyChores TEXT NOT NULL,
-                groupActivities TEXT NOT NULL,
-                sportsRating INTEGER NOT NULL,
-                communicationRating INTEGER NOT NULL,
-                technologyComfort TEXT NOT NULL,
-                pastProgram TEXT NOT NULL,
-                reasonForJoining TEXT NOT NULL,
-                dailyCommitment TEXT NOT NULL,
-                travelComfort TEXT NOT NULL,
-                workExperience TEXT NOT NULL,
-                healthCondition TEXT NOT NULL,
-                programBenefit TEXT NOT NULL,
-                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-        conn.commit()
-        
         conn.execute(
             '''INSERT INTO assessments (
                 user_id, age, passed12th, gender, familyMembers, earningMembers,
@@ -545,14 +566,12 @@ def submit_assessment():
                 data.get('programBenefit')
             )
         )
-        conn.commit()
-        conn.close()
         
-        print(f"Assessment submitted for user {session['user_id']}")
+        logger.info("Assessment submitted for user %s", session['user_id'])
         return jsonify({'success': True, 'message': 'Assessment submitted successfully'})
     
     except Exception as e:
-        print(f"Assessment error: {str(e)}")
+        logger.exception("Assessment error")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/skip-assessment', methods=['POST'])
@@ -563,37 +582,6 @@ def skip_assessment():
     try:
         conn = get_db_connection()
         
-        # Create table if it doesn't exist
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS assessments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                age TEXT NOT NULL,
-                passed12th TEXT NOT NULL,
-                gender TEXT NOT NULL,
-                familyMembers TEXT NOT NULL,
-                earningMembers TEXT NOT NULL,
-                highestEducation TEXT NOT NULL,
-                familyHealthCondition TEXT NOT NULL,
-                familySupport TEXT NOT NULL,
-                dailyChores TEXT NOT NULL,
-                groupActivities TEXT NOT NULL,
-                sportsRating INTEGER NOT NULL,
-                communicationRating INTEGER NOT NULL,
-                technologyComfort TEXT NOT NULL,
-                pastProgram TEXT NOT NULL,
-                reasonForJoining TEXT NOT NULL,
-                dailyCommitment TEXT NOT NULL,
-                travelComfort TEXT NOT NULL,
-                workExperience TEXT NOT NULL,
-                healthCondition TEXT NOT NULL,
-                programBenefit TEXT NOT NULL,
-                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-        ''')
-        conn.commit()
-        
         # Mark assessment as skipped
         conn.execute(
             '''INSERT INTO assessments (
@@ -607,12 +595,10 @@ def skip_assessment():
              'skipped', 'skipped', 'skipped', 'skipped', 'skipped', 0, 0, 'skipped',
              'skipped', 'skipped', 'skipped', 'skipped', 'skipped', 'skipped', 'skipped')
         )
-        conn.commit()
-        conn.close()
         
         return jsonify({'success': True})
     except Exception as e:
-        print(f"Skip assessment error: {str(e)}")
+        logger.exception("Skip assessment error")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/profile')
@@ -622,25 +608,11 @@ def profile():
     
     conn = get_db_connection()
     
-    # Create documents table if it doesn't exist
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            document_type TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    conn.commit()
-    
     user = conn.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],)).fetchone()
     documents = conn.execute(
         'SELECT * FROM documents WHERE user_id = ? ORDER BY uploaded_at DESC',
         (session['user_id'],)
     ).fetchall()
-    conn.close()
     
     doc_dict = {}
     for doc in documents:
@@ -656,7 +628,6 @@ def user_details():
     
     conn = get_db_connection()
     user = conn.execute('SELECT * FROM users WHERE id = ?', (session['user_id'],)).fetchone()
-    conn.close()
     
     lang = session.get('language', 'en')
     return render_template('user_details.html', user=user, lang=lang)
@@ -668,24 +639,10 @@ def upload_documents_page():
     
     conn = get_db_connection()
     
-    # Create documents table if it doesn't exist
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            document_type TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    conn.commit()
-    
     documents = conn.execute(
         'SELECT * FROM documents WHERE user_id = ? AND document_type IN (?, ?) ORDER BY uploaded_at DESC',
         (session['user_id'], 'Aadhar Card', '12th Marksheet')
     ).fetchall()
-    conn.close()
     
     doc_dict = {}
     for doc in documents:
@@ -695,65 +652,68 @@ def upload_documents_page():
 
 @app.route('/upload-document', methods=['POST'])
 def upload_document():
+    staged = None
     try:
         if 'user_id' not in session:
             return jsonify({'success': False, 'error': 'Not authenticated'}), 401
         
-        if 'document' not in request.files:
-            return jsonify({'success': False, 'error': 'No file provided'}), 400
-        
-        file = request.files['document']
-        doc_type = request.form.get('document_type')
+        # The body is streamed into the store as it arrives (see documents.py);
+        # request.files/request.form must not be touched, or Werkzeug buffers it
+        try:
+            fields, staged = parse_upload(request.stream, request.content_type, document_store,
+                                          allowed_extensions=ALLOWED_EXTENSIONS)
+        except UploadError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        print(f"Upload attempt - File: {file.filename}, Type: {doc_type}, User: {session['user_id']}")
+        doc_type = fields.get('document_type')
         
-        if file.filename == '':
-            return jsonify({'success': False, 'error': 'No file selected'}), 400
+        if staged is None:
+            return jsonify({'success': False, 'error': 'No file provided'}), 400
         
-        if not allowed_file(file.filename):
-            return jsonify({'success': False, 'error': 'Invalid file type. Only JPG, PNG, and PDF allowed'}), 400
+        logger.info("Upload attempt - file: %s, type: %s, user: %s, %d bytes",
+                    staged.filename, doc_type, session['user_id'], staged.size)
         
         if not doc_type:
+            document_store.discard(staged)
             return jsonify({'success': False, 'error': 'Document type not specified'}), 400
         
-        # Create user upload folder
-        user_folder = os.path.join(app.config['UPLOAD_FOLDER'], str(session['user_id']))
-        os.makedirs(user_folder, exist_ok=True)
-        print(f"User folder created: {user_folder}")
-        
-        # Generate secure filename
-        file_ext = file.filename.rsplit('.', 1)[1].lower()
-        filename = secure_filename(f"{doc_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_ext}")
-        filepath = os.path.join(user_folder, filename)
-        
-        # Save file
-        file.save(filepath)
-        print(f"File saved to: {filepath}")
-        
-        # Verify file was saved
-        if not os.path.exists(filepath):
-            return jsonify({'success': False, 'error': 'File save failed'}), 500
-        
-        # Save to database
+        # Save to database, replacing the old document of the same type; the
+        # store is only changed under the write lock this transaction holds
         conn = get_db_connection()
+        with transaction(conn):
+            replaced = [row['file_path'] for row in conn.execute(
+                'SELECT file_path FROM documents WHERE user_id = ? AND document_type = ?',
+                (session['user_id'], doc_type)
+            )]
+            conn.execute('DELETE FROM documents WHERE user_id = ? AND document_type = ?', 
+                         (session['user_id'], doc_type))
+            filepath = document_store.place(staged)
+            status = 'pending' if can_preview(staged.extension) else 'skipped'
+            doc_id = conn.execute(
+                '''INSERT INTO documents (user_id, document_type, file_path, content_hash, size, processing_status)
+                VALUES (?, ?, ?, ?, ?, ?)''',
+                (session['user_id'], doc_type, filepath, staged.content_hash, staged.size, status)
+            ).lastrowid
+            document_store.release(conn, replaced, app.config['UPLOAD_FOLDER'])
         
-        # Delete old document of same type
-        conn.execute('DELETE FROM documents WHERE user_id = ? AND document_type = ?', 
-                     (session['user_id'], doc_type))
+        if status == 'pending':
+            preview_worker.submit(doc_id, filepath)
         
-        # Insert new document
-        conn.execute(
-            'INSERT INTO documents (user_id, document_type, file_path) VALUES (?, ?, ?)',
-            (session['user_id'], doc_type, filepath)
-        )
-        conn.commit()
-        conn.close()
+        # Files leaked by failed uploads are swept now and then (see documents.py)
+        try:
+            document_store.maybe_reclaim(conn)
+        except Exception:
+            logger.exception("Sweeping orphaned document files failed")
         
-        print(f"Document saved to database successfully")
+        logger.info("Document %s saved for user %s as %s", staged.filename, session['user_id'], filepath)
         return jsonify({'success': True, 'message': f'{doc_type} uploaded successfully'})
     
+    except RequestEntityTooLarge:
+        document_store.discard(staged)
+        return jsonify({'success': False, 'error': 'File too large'}), 413
     except Exception as e:
-        print(f"Upload error: {str(e)}")
+        document_store.discard(staged)
+        logger.exception("Upload error")
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'}), 500
 
 @app.route('/download-document/<int:doc_id>')
@@ -766,63 +726,111 @@ def download_document(doc_id):
         'SELECT * FROM documents WHERE id = ? AND user_id = ?',
         (doc_id, session['user_id'])
     ).fetchone()
-    conn.close()
     
-    if not doc or not os.path.exists(doc['file_path']):
+    if not doc:
+        return redirect(url_for('profile'))
+    
+    # ETag, If-None-Match, Range and proxy offload are handled there
+    extension = doc['file_path'].rsplit('.', 1)[-1].lower()
+    download_name = secure_filename(f"{doc['document_type']}.{extension}")
+    try:
+        return send_document(request, doc['file_path'], download_name, doc['content_hash'],
+                             app.config['UPLOAD_FOLDER'])
+    except FileNotFoundError:
+        logger.warning("Document %s is missing its file %s", doc_id, doc['file_path'])
         return redirect(url_for('profile'))
+
+@app.route('/document-preview/<int:doc_id>/<kind>')
+def document_preview(doc_id, kind):
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    if kind not in ('preview', 'thumbnail'):
+        return '', 404
     
-    return send_file(doc['file_path'], as_attachment=True)
+    conn = get_db_connection()
+    doc = conn.execute(
+        'SELECT preview_path, thumbnail_path, content_hash FROM documents WHERE id = ? AND user_id = ?',
+        (doc_id, session['user_id'])
+    ).fetchone()
+    
+    path = doc[kind + '_path'] if doc else None
+    if not path:
+        return '', 404
+    
+    try:
+        return send_document(request, path, f"{kind}.{path.rsplit('.', 1)[-1]}", f"{doc['content_hash']}-{kind}",
+                             app.config['UPLOAD_FOLDER'], as_attachment=False)
+    except FileNotFoundError:
+        return '', 404
 
 @app.route('/grid-escape')
 def grid_escape():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('grid_escape.html', lang=lang)
+    return page_cache.render('grid_escape.html', lang=lang)
 
 @app.route('/pattern-lock')
 def pattern_lock():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('pattern_lock.html', lang=lang)
+    return page_cache.render('pattern_lock.html', lang=lang)
 
 @app.route('/chart-detective')
 def chart_detective():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('chart_detective.html', lang=lang)
+    return page_cache.render('chart_detective.html', lang=lang)
 
 @app.route('/learning-modules')
 def learning_modules():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     lang = session.get('language', 'en')
-    return render_template('learning_modules.html', lang=lang)
+    return page_cache.render('learning_modules.html', lang=lang)
 
 @app.route('/leaderboard')
 def leaderboard():
     if 'user_id' not in session:
         return redirect(url_for('login'))
     
-    conn = get_db_connection()
+    # The page loads its rows from /api/leaderboard one slice at a time
+    lang = session.get('language', 'en')
+    return render_template('leaderboard.html', current_user_id=session['user_id'],
+                           page_size=LEADERBOARD_PAGE_SIZE, lang=lang)
+
+@app.route('/api/leaderboard')
+def api_leaderboard():
+    """
+    One page of a leaderboard as JSON
+    Query: game (optional), window (all, week, today), limit, cursor
+    (next_cursor of the previous page) and around=N for the N rows above
+    and below the current user. The first page also carries the user's
+    own standing as "me".
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not authenticated'}), 401
     
-    # Get all users with their scores
-    users = conn.execute(
-        '''SELECT u.id, u.username, 
-           COALESCE(SUM(CAST(gs.score AS INTEGER)), 0) as total_score,
-           COUNT(DISTINCT gs.id) as games_played
-        FROM users u
-        LEFT JOIN game_scores gs ON u.id = gs.user_id
-        GROUP BY u.id
-        ORDER BY total_score DESC'''
-    ).fetchall()
+    game = request.args.get('game') or None
+    window = request.args.get('window', 'all')
+    limit = min(max(request.args.get('limit', LEADERBOARD_PAGE_SIZE, type=int), 1), LEADERBOARD_MAX_LIMIT)
+    cursor = request.args.get('cursor') or None
+    around = min(max(request.args.get('around', 0, type=int), 0), LEADERBOARD_MAX_LIMIT)
     
-    conn.close()
+    conn = get_db_connection()
+    try:
+        rows, next_cursor = board_page(conn, game, window, limit, cursor)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    lang = session.get('language', 'en')
-    return render_template('leaderboard.html', users=users, current_user_id=session['user_id'], lang=lang)
+    result = {'success': True, 'game': game, 'window': window, 'rows': rows, 'next_cursor': next_cursor}
+    if cursor is None:
+        result['me'] = board_standing(conn, session['user_id'], game, window)
+    if around:
+        result['around'] = board_around(conn, session['user_id'], game, window, around)
+    return jsonify(result)
 
 @app.route('/skill-performance')
 def skill_performance():
@@ -831,16 +839,11 @@ def skill_performance():
     
     conn = get_db_connection()
     
-    # Get user's game scores to calculate skills
-    game_scores = conn.execute(
-        'SELECT game_name, score FROM game_scores WHERE user_id = ? ORDER BY game_name',
-        (session['user_id'],)
-    ).fetchall()
-    
-    conn.close()
+    # Aggregates are maintained on every score save; this is one indexed read
+    profile = skill_profile(conn, session['user_id'])
     
     lang = session.get('language', 'en')
-    return render_template('skill_performance.html', game_scores=game_scores, lang=lang)
+    return render_template('skill_performance.html', profile=profile, lang=lang)
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,359 @@
+"""
+Fingerprinted, precompressed page scripts and styles
+Every page used to carry its CSS and JavaScript inline, so each navigation
+downloaded them again. They now live in static/src (css/<page>.css,
+js/<page>.js) and build() turns each into static/dist/<name>.<hash>.<ext>:
+minified, named after a hash of its content, and stored alongside .gz and,
+when the brotli package is installed, .br copies compressed once at
+maximum level. manifest.json maps source names to built ones.
+
+Templates link them with asset_url('js/games.js'). /assets/ serves the
+variant the browser accepts, with a year's immutable caching: a changed
+file gets a new name, so pages pick it up without anyone revalidating.
+
+The minifiers are deliberately conservative. CSS loses comments and
+redundant whitespace; JavaScript loses comments, indentation and blank
+lines but keeps its line breaks, so automatic semicolon insertion behaves
+exactly as in the source. Strings, template literals and regular
+expressions are copied untouched.
+
+Build as a deploy step with `python assets.py`. Otherwise the app builds
+at startup when the manifest is missing or older than a source file, and
+checks again on every asset_url() call in debug mode.
+
+Tunable from the environment:
+    ASSET_SOURCE   sources (default static/src)
+    ASSET_DIST     build output (default static/dist)
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import sys
+import threading
+
+from flask import abort, request, send_file, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ASSET_SOURCE = os.environ.get('ASSET_SOURCE', os.path.join('static', 'src'))
+ASSET_DIST = os.environ.get('ASSET_DIST', os.path.join('static', 'dist'))
+# A year: built names change with their content
+ASSET_MAX_AGE = 365 * 24 * 3600
+MANIFEST = 'manifest.json'
+# File suffix of each precompressed variant, by Content-Encoding
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+_CSS_COMMENTS = re.compile(r'(/\*.*?\*/)|("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')', re.S)
+_CSS_STRINGS = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')')
+
+
+def _squeeze_css(text):
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r' ?([{};,>]) ?', r'\1', text)
+    return text.replace(': ', ':').replace(';}', '}')
+
+
+def minify_css(source):
+    """source without comments or redundant whitespace"""
+    # Comments become whitespace; strings are kept as they are
+    text = _CSS_COMMENTS.sub(lambda match: ' ' if match.group(1) else match.group(2), source)
+    parts = _CSS_STRINGS.split(text)
+    # split() puts the strings it matched at the odd indexes
+    return ''.join(part if index % 2 else _squeeze_css(part) for index, part in enumerate(parts)).strip()
+
+
+# A / after one of these, or after one of the keywords, starts a regular
+# expression; after anything else it divides
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'instanceof',
+                   'new', 'delete', 'void', 'throw', 'yield', 'await'}
+_WORD = re.compile(r'[\w$]+$')
+
+
+def _end_of_string(source, i):
+    """Index just past the string literal opening at source[i]"""
+    quote = source[i]
+    i += 1
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == quote or c == '\n':
+            return i + 1 if c == quote else i
+        i += 1
+    return i
+
+
+def _end_of_regex(source, i):
+    """Index just past the body of the regular expression opening at source[i]"""
+    i += 1
+    in_class = False
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            return i + 1
+        i += 1
+    return i
+
+
+def _end_of_template(source, i):
+    """Index just past the template literal opening at source[i]"""
+    i += 1
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+        elif c == '`':
+            return i + 1
+        elif source.startswith('${', i):
+            i = _end_of_substitution(source, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _end_of_substitution(source, i):
+    """Index just past the } closing a ${ substitution whose body starts at i"""
+    depth = 0
+    while i < len(source):
+        c = source[i]
+        if c in '\'"':
+            i = _end_of_string(source, i)
+        elif c == '`':
+            i = _end_of_template(source, i)
+        elif c == '{':
+            depth += 1
+            i += 1
+        elif c == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return i
+
+
+def _starts_regex(out):
+    """Whether a / following the output so far starts a regular expression"""
+    code = ''.join(out[-16:]).rstrip()
+    if not code or code[-1] in _REGEX_AFTER:
+        return True
+    word = _WORD.search(code)
+    return bool(word) and word.group() in _REGEX_KEYWORDS
+
+
+def minify_js(source):
+    """source without comments, indentation, trailing spaces or blank lines"""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        c = source[i]
+        if c == '\n':
+            while out and out[-1] == ' ':
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            i += 1
+        elif c in ' \t\r':
+            if out and out[-1] not in ' \n':
+                out.append(' ')
+            i += 1
+        elif c in '\'"':
+            end = _end_of_string(source, i)
+            out.append(source[i:end])
+            i = end
+        elif c == '`':
+            end = _end_of_template(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            # Keep a line break the comment contained; it may end a statement
+            gap = '\n' if '\n' in source[i:end] else ' '
+            if out and out[-1] not in ' \n':
+                out.append(gap)
+            elif gap == '\n' and out and out[-1] == ' ':
+                out[-1] = '\n'
+            i = end
+        elif c == '/' and _starts_regex(out):
+            end = _end_of_regex(source, i)
+            out.append(source[i:end])
+            i = end
+        else:
+            out.append(c)
+            i += 1
+    while out and out[-1] in ' \n':
+        out.pop()
+    return ''.join(out)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _write(path, data):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _sources(source):
+    for directory, _, names in os.walk(source):
+        for name in sorted(names):
+            if os.path.splitext(name)[1] in MINIFIERS:
+                path = os.path.join(directory, name)
+                yield os.path.relpath(path, source).replace(os.sep, '/'), path
+
+
+def build(source=ASSET_SOURCE, dist=ASSET_DIST):
+    """
+    Minify, fingerprint and precompress every file under source into dist
+    Returns the manifest: {source name: built name}. Files from earlier
+    builds are left in place, for pages rendered before a deploy.
+    """
+    manifest = {}
+    for name, path in _sources(source):
+        stem, extension = os.path.splitext(name)
+        with open(path, encoding='utf-8') as f:
+            data = MINIFIERS[extension](f.read()).encode('utf-8')
+        built = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+        target = os.path.join(dist, built)
+        manifest[name] = built
+        if os.path.exists(target):
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _write(target, data)
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) < len(data):
+            _write(target + ENCODINGS['gzip'], compressed)
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            if len(compressed) < len(data):
+                _write(target + ENCODINGS['br'], compressed)
+        logger.info("Built %s (%d bytes minified)", built, len(data))
+
+    os.makedirs(dist, exist_ok=True)
+    _write(os.path.join(dist, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def is_stale(source=ASSET_SOURCE, dist=ASSET_DIST):
+    """Whether dist's manifest is missing, or older than a file under source"""
+    try:
+        built_at = os.stat(os.path.join(dist, MANIFEST)).st_mtime_ns
+        with open(os.path.join(dist, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return True
+    names = set()
+    for name, path in _sources(source):
+        names.add(name)
+        if os.stat(path).st_mtime_ns > built_at:
+            return True
+    return names != set(manifest)
+
+
+class Assets:
+    """Built assets for one Flask app: the asset_url() template global and /assets/"""
+
+    def __init__(self, app=None, source=ASSET_SOURCE, dist=ASSET_DIST):
+        self.source = source
+        self.dist = dist
+        self.manifest = {}
+        self.build_id = None
+        self._built = frozenset()
+        self._lock = threading.Lock()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.load()
+        app.add_template_global(self.url, 'asset_url')
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.send)
+
+    def load(self):
+        """Read the manifest, building first if the sources have changed"""
+        with self._lock:
+            if is_stale(self.source, self.dist):
+                manifest = build(self.source, self.dist)
+            else:
+                with open(os.path.join(self.dist, MANIFEST), encoding='utf-8') as f:
+                    manifest = json.load(f)
+            self.manifest = manifest
+            self._built = frozenset(manifest.values())
+            self.build_id = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+    def _refresh(self):
+        if self.app is not None and self.app.debug and is_stale(self.source, self.dist):
+            self.load()
+
+    def url(self, name):
+        """URL of the current build of the source file name (e.g. 'js/games.js')"""
+        self._refresh()
+        return url_for('asset', filename=self.manifest[name])
+
+    def version(self):
+        """
+        Id of the current build, changing whenever any built name does
+        Pages that link assets are only valid for the build they were
+        rendered with (see page_cache.py)
+        """
+        self._refresh()
+        return self.build_id
+
+    def send(self, filename):
+        """The built file, precompressed if the client accepts it, cacheable for a year"""
+        if filename not in self._built:
+            abort(404)
+        path = os.path.join(self.dist, filename)
+        offered = [encoding for encoding, suffix in ENCODINGS.items() if os.path.exists(path + suffix)]
+        encoding = request.accept_encodings.best_match(offered) if offered else None
+        if encoding:
+            path += ENCODINGS[encoding]
+
+        # The name already carries the content hash
+        etag = filename.rsplit('.', 2)[-2] + ('-' + encoding if encoding else '')
+        response = send_file(path, mimetype=mimetypes.guess_type(filename)[0], etag=etag,
+                             conditional=True, max_age=ASSET_MAX_AGE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    built = build(*sys.argv[1:3])
+    print(f"Built {len(built)} assets into {sys.argv[2] if len(sys.argv) > 2 else ASSET_DIST}")
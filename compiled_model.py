@@ -0,0 +1,419 @@
+"""
+Compiled tree-ensemble evaluator for the LightGBM dropout model
+Flattens the booster's dumped trees into array-backed node tables and
+scores encoded rows with vectorized NumPy traversal, without lightgbm
+
+A compiled engine records the fingerprint of the bundle it came from, and
+is stored next to it (models/<version>.npz beside models/<version>.pkl),
+so a reload to another bundle can never keep running the old trees.
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# LightGBM missing value handling per split (MissingType in the C++ code)
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+
+# LightGBM's kZeroThreshold, used for Zero missing handling
+ZERO_THRESHOLD = 1e-35
+
+# Node decisions are 64-bit masks over per-feature bins
+MAX_BINS = 64
+
+
+class CompiledEnsemble:
+    """
+    Binary LightGBM ensemble compiled to flat NumPy node tables
+
+    Every raw feature value is first mapped to a small per-feature bin
+    (the interval between split thresholds for numeric features, the
+    category code for categorical ones, plus dedicated NaN and zero bins).
+    Each internal node stores its feature index and a bitset of the bins
+    that go left, so numeric and categorical splits are the same test.
+    children holds [right, left] per node; leaves point to themselves.
+
+    Rows are scored with a bitvector traversal (QuickScorer-style): a node
+    that sends a row right rules out every leaf of its left subtree, so
+    the exit leaf of a tree is the leftmost leaf not ruled out by any node.
+    Because a node's outcome depends only on the bin of its feature, the
+    ruled-out leaves are precomputed per (feature, bin, tree), and scoring
+    a row is one gather and AND-reduction over features for all trees.
+    """
+
+    def __init__(self, split_feature, left_bins, children, leaf_value, roots,
+                 feature_bins, sigmoid=1.0, average_output=False):
+        self.split_feature = split_feature
+        self.left_bins = left_bins
+        self.children = children
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.feature_bins = feature_bins
+        self.sigmoid = float(sigmoid)
+        self.average_output = bool(average_output)
+        self._build_leaf_tables()
+
+        # Categorical features are binned together in one vectorized pass
+        self._categorical_features = np.array(
+            [f for f, b in enumerate(feature_bins) if isinstance(b, _CategoricalBins)], dtype=np.intp
+        )
+        self._n_categories = np.array(
+            [feature_bins[f].n_categories for f in self._categorical_features], dtype=np.float64
+        )
+        self._numeric_features = [
+            (f, b) for f, b in enumerate(feature_bins) if isinstance(b, _NumericBins) and b.used
+        ]
+
+    @classmethod
+    def from_booster(cls, booster):
+        """Compile a trained lightgbm.Booster"""
+        return cls.from_dump(booster.dump_model())
+
+    @classmethod
+    def from_dump(cls, dump):
+        """Compile the dict returned by Booster.dump_model()"""
+        objective = dump.get('objective', '')
+        if dump.get('num_class', 1) != 1 or not objective.startswith('binary'):
+            raise ValueError(f"Only binary objectives can be compiled, got '{objective}'")
+
+        sigmoid = 1.0
+        for part in objective.split()[1:]:
+            if part.startswith('sigmoid:'):
+                sigmoid = float(part.split(':', 1)[1])
+
+        n_features = dump['max_feature_idx'] + 1
+        trees = [tree['tree_structure'] for tree in dump['tree_info']]
+
+        # Collect split points per feature to lay out the bins
+        thresholds = [set() for _ in range(n_features)]
+        categories = [set() for _ in range(n_features)]
+        is_categorical = [False] * n_features
+        for tree in trees:
+            stack = [tree]
+            while stack:
+                node = stack.pop()
+                if 'split_index' not in node:
+                    continue
+                feature = node['split_feature']
+                if node['decision_type'] == '==':
+                    is_categorical[feature] = True
+                    categories[feature].update(int(c) for c in str(node['threshold']).split('||'))
+                else:
+                    thresholds[feature].add(float(node['threshold']))
+                stack.append(node['left_child'])
+                stack.append(node['right_child'])
+
+        feature_bins = []
+        for feature in range(n_features):
+            if is_categorical[feature]:
+                feature_bins.append(_CategoricalBins(max(categories[feature]) + 1))
+            else:
+                feature_bins.append(_NumericBins(sorted(thresholds[feature])))
+            if feature_bins[-1].n_bins > MAX_BINS:
+                raise ValueError(f"Feature {feature} needs more than {MAX_BINS} bins")
+
+        # Flatten every tree into the shared node tables
+        split_feature = []
+        left_bins = []
+        children = []
+        leaf_value = []
+        roots = []
+
+        def add_node():
+            split_feature.append(0)
+            left_bins.append(0)
+            children.append([0, 0])
+            leaf_value.append(0.0)
+            return len(split_feature) - 1
+
+        for tree in trees:
+            roots.append(add_node())
+            stack = [(tree, roots[-1])]
+            while stack:
+                node, index = stack.pop()
+                if 'split_index' not in node:
+                    children[index] = [index, index]
+                    leaf_value[index] = float(node['leaf_value'])
+                    continue
+
+                feature = node['split_feature']
+                split_feature[index] = feature
+                left_bins[index] = feature_bins[feature].left_mask(node)
+                children[index] = [add_node(), add_node()]
+                stack.append((node['right_child'], children[index][0]))
+                stack.append((node['left_child'], children[index][1]))
+
+        return cls(
+            split_feature=np.asarray(split_feature, dtype=np.intp),
+            left_bins=np.asarray(left_bins, dtype=np.uint64),
+            children=np.asarray(children, dtype=np.intp).reshape(-1),
+            leaf_value=np.asarray(leaf_value, dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            feature_bins=feature_bins,
+            sigmoid=sigmoid,
+            average_output=dump.get('average_output', False),
+        )
+
+    def _build_leaf_tables(self):
+        """
+        Number each tree's leaves left to right, then precompute for every
+        (feature, bin, tree) the bitvector of leaves still reachable
+        """
+        n_trees = len(self.roots)
+        n_features = len(self.feature_bins)
+        n_bins = max(b.n_bins for b in self.feature_bins) if self.feature_bins else 1
+
+        leaf_values = [[] for _ in range(n_trees)]
+        all_leaves = (1 << 64) - 1
+        reachable = np.full((n_features, n_bins, n_trees), all_leaves, dtype=np.uint64)
+
+        for tree, root in enumerate(self.roots):
+            # Iterative in-order walk; each node records its left-subtree leaf range
+            leaves = leaf_values[tree]
+            stack = [(int(root), False)]
+            first_leaf = {}
+            while stack:
+                index, visited = stack.pop()
+                right, left = self.children[2 * index], self.children[2 * index + 1]
+                if left == index:
+                    leaves.append(self.leaf_value[index])
+                    continue
+                if not visited:
+                    first_leaf[index] = len(leaves)
+                    stack.append((index, True))
+                    stack.append((int(left), False))
+                else:
+                    # Left subtree done: its leaves are first_leaf[index] .. len(leaves) - 1
+                    ruled_out = ((1 << len(leaves)) - 1) ^ ((1 << first_leaf[index]) - 1)
+                    still_reachable = np.uint64(all_leaves ^ ruled_out)
+                    feature = self.split_feature[index]
+                    left_bins = int(self.left_bins[index])
+                    for bin_index in range(self.feature_bins[feature].n_bins):
+                        if not (left_bins >> bin_index) & 1:
+                            reachable[feature, bin_index, tree] &= still_reachable
+                    stack.append((int(right), False))
+
+            if len(leaves) > 64:
+                raise ValueError(f"Tree {tree} has more than 64 leaves")
+
+        max_leaves = max((len(leaves) for leaves in leaf_values), default=1)
+        self.leaf_table = np.zeros((n_trees, max_leaves), dtype=np.float64)
+        for tree, leaves in enumerate(leaf_values):
+            self.leaf_table[tree, :len(leaves)] = leaves
+        self.reachable = reachable
+
+    def _bin_rows(self, X_rows):
+        """Map an (n_rows, n_features) float matrix to per-feature bins"""
+        bins = np.zeros(X_rows.shape, dtype=np.intp)
+        if len(self._categorical_features):
+            bins[:, self._categorical_features] = _CategoricalBins.bin_codes(
+                X_rows[:, self._categorical_features], self._n_categories
+            )
+        for feature, feature_bins in self._numeric_features:
+            bins[:, feature] = feature_bins.bin_values(X_rows[:, feature])
+        return bins
+
+    def predict_raw(self, X_rows, chunk_size=1024):
+        """Raw ensemble score (sum of leaf values) for each row"""
+        X_rows = np.asarray(X_rows, dtype=np.float64)
+        if X_rows.ndim == 1:
+            X_rows = X_rows.reshape(1, -1)
+
+        feature_index = np.arange(len(self.feature_bins))
+        tree_index = np.arange(len(self.roots))
+        raw = np.empty(len(X_rows))
+        for start in range(0, len(X_rows), chunk_size):
+            bins = self._bin_rows(X_rows[start:start + chunk_size])
+            # (rows, features, trees) -> leaves still reachable per (row, tree)
+            leaves = np.bitwise_and.reduce(self.reachable[feature_index, bins], axis=1)
+            # The exit leaf is the lowest set bit
+            lowest = leaves & (~leaves + np.uint64(1))
+            exit_leaf = np.frexp(lowest.astype(np.float64))[1] - 1
+            raw[start:start + chunk_size] = self.leaf_table[tree_index, exit_leaf].sum(axis=1)
+
+        if self.average_output:
+            raw /= len(self.roots)
+        return raw
+
+    def predict(self, X_rows):
+        """Dropout probability (class 1) for each row, like Booster.predict"""
+        raw = self.predict_raw(X_rows)
+        raw *= -self.sigmoid
+        np.exp(raw, out=raw)
+        raw += 1.0
+        return np.reciprocal(raw, out=raw)
+
+    def save(self, path, metadata=None):
+        """
+        Save the node tables (plus optional JSON metadata) to an .npz file
+        Loading it back needs only NumPy
+        """
+        header = {
+            'sigmoid': self.sigmoid,
+            'average_output': self.average_output,
+            'feature_bins': [b.to_dict() for b in self.feature_bins],
+            'metadata': metadata or {},
+        }
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                split_feature=self.split_feature,
+                left_bins=self.left_bins,
+                children=self.children,
+                leaf_value=self.leaf_value,
+                roots=self.roots,
+                header=np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8),
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Load an ensemble saved with save(); returns (ensemble, metadata)"""
+        with np.load(path) as data:
+            header = json.loads(data['header'].tobytes().decode('utf-8'))
+            ensemble = cls(
+                split_feature=data['split_feature'],
+                left_bins=data['left_bins'],
+                children=data['children'],
+                leaf_value=data['leaf_value'],
+                roots=data['roots'],
+                feature_bins=[_bins_from_dict(b) for b in header['feature_bins']],
+                sigmoid=header['sigmoid'],
+                average_output=header['average_output'],
+            )
+        return ensemble, header['metadata']
+
+
+class _NumericBins:
+    """
+    Bins for a numeric feature: one per interval between thresholds,
+    then a NaN bin and a zero bin for LightGBM's missing value handling
+    """
+
+    def __init__(self, thresholds):
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.used = len(self.thresholds) > 0
+        self.nan_bin = len(self.thresholds) + 1
+        self.zero_bin = len(self.thresholds) + 2
+        self.n_bins = len(self.thresholds) + 3
+
+    def bin_values(self, values):
+        bins = np.searchsorted(self.thresholds, values, side='left')
+        bins[np.abs(values) <= ZERO_THRESHOLD] = self.zero_bin
+        bins[np.isnan(values)] = self.nan_bin
+        return bins
+
+    def left_mask(self, node):
+        threshold = float(node['threshold'])
+        missing_type = MISSING_TYPES[node.get('missing_type', 'None')]
+        default_left = bool(node.get('default_left', False))
+
+        # value <= thresholds[i] exactly when its bin is <= i
+        split_at = int(np.searchsorted(self.thresholds, threshold, side='left'))
+        mask = (1 << (split_at + 1)) - 1
+
+        zero_left = default_left if missing_type == MISSING_ZERO else 0.0 <= threshold
+        nan_left = default_left if missing_type != MISSING_NONE else 0.0 <= threshold
+        if zero_left:
+            mask |= 1 << self.zero_bin
+        if nan_left:
+            mask |= 1 << self.nan_bin
+        return mask
+
+    def to_dict(self):
+        return {'kind': 'numeric', 'thresholds': self.thresholds.tolist()}
+
+
+class _CategoricalBins:
+    """
+    Bins for a categorical feature: one per category code seen in a split,
+    then one shared bin for codes that always go right (in LightGBM 4.x
+    that is NaN, negative codes and codes no split mentions)
+    """
+
+    def __init__(self, n_categories):
+        self.n_categories = int(n_categories)
+        self.used = True
+        self.n_bins = self.n_categories + 1
+
+    @staticmethod
+    def bin_codes(codes, n_categories):
+        """
+        Bin category codes for any number of categorical columns at once
+        NaN and codes outside [0, n_categories) go to bin n_categories
+        """
+        codes = np.trunc(codes)
+        bins = np.where((codes >= 0) & (codes < n_categories), codes, n_categories)
+        return bins.astype(np.intp)
+
+    def left_mask(self, node):
+        mask = 0
+        for category in str(node['threshold']).split('||'):
+            mask |= 1 << int(category)
+        return mask
+
+    def to_dict(self):
+        return {'kind': 'categorical', 'n_categories': self.n_categories}
+
+
+def _bins_from_dict(data):
+    if data['kind'] == 'categorical':
+        return _CategoricalBins(data['n_categories'])
+    return _NumericBins(data['thresholds'])
+
+
+def check_parity(ensemble, predictor, X_rows, tolerance=1e-9):
+    """
+    Compare the compiled ensemble against the predictor's serving path
+    (_predict_proba_rows) on encoded rows, before the ensemble replaces it
+    Returns the largest absolute probability difference
+    Raises ValueError if it exceeds the tolerance
+    """
+    if predictor.engine is not None:
+        raise ValueError("Predictor already serves a compiled engine; parity needs its LightGBM path")
+    expected = np.asarray(predictor._predict_proba_rows(X_rows))
+    actual = ensemble.predict(X_rows)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if max_diff > tolerance:
+        raise ValueError(f"Compiled model differs from LightGBM by {max_diff:.3g}")
+    return max_diff
+
+
+def file_fingerprint(path):
+    """Content fingerprint of a model file, as recorded in engines and score tables"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def engine_path_for(bundle_path):
+    """Where the compiled engine of a bundle is kept: beside it, as .npz"""
+    return Path(bundle_path).with_suffix('.npz')
+
+
+def compile_bundle(bundle_path, output_path=None):
+    """
+    Compile a model bundle to an .npz usable without lightgbm
+    output_path defaults to engine_path_for(bundle_path). Returns
+    (ensemble, output_path).
+    """
+    import joblib
+
+    bundle = joblib.load(str(bundle_path))
+    ensemble = CompiledEnsemble.from_booster(bundle['model'].booster_)
+    metadata = {key: bundle.get(key) for key in ('feature_columns', 'cat_cols', 'num_cols', 'category_levels')}
+    metadata['bundle_fingerprint'] = file_fingerprint(bundle_path)
+    output_path = Path(output_path) if output_path else engine_path_for(bundle_path)
+    ensemble.save(output_path, metadata=metadata)
+    return ensemble, output_path
+
+
+if __name__ == '__main__':
+    # Compile a model bundle to an .npz usable without lightgbm, by default
+    # beside it (models/v3.pkl -> models/v3.npz):
+    #   python compiled_model.py models/v3.pkl [output.npz]
+    ensemble, output_path = compile_bundle(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"[OK] Compiled {len(ensemble.roots)} trees to {output_path}")
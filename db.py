@@ -0,0 +1,100 @@
+"""
+Pooled SQLite connections for the app
+Connections are opened once, tuned once (WAL, synchronous=NORMAL, mmap,
+page cache, busy timeout) and then handed out one request at a time.
+They run in autocommit mode; writes go through transaction(), which takes
+the write lock up front so concurrent score saves queue on busy_timeout
+instead of failing with "database is locked".
+
+Tunable from the environment:
+    DB_POOL_SIZE         idle connections kept per process (default 8)
+    SQLITE_MMAP_SIZE     bytes of the file to memory-map (default 64 MiB)
+    SQLITE_CACHE_SIZE    page cache per connection in KiB (default 16 MiB)
+    SQLITE_BUSY_TIMEOUT  ms to wait for a lock before failing (default 5000)
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', str(16 * 1024)))
+SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))
+
+
+def connect(path):
+    """Open a connection with the app's pragmas and sqlite3.Row rows"""
+    # isolation_level=None: no implicit BEGIN, transactions are explicit.
+    # check_same_thread=False: a pooled connection may serve different
+    # threads over its life, though only one at a time.
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                           timeout=SQLITE_BUSY_TIMEOUT / 1000)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE:d}')
+    conn.execute(f'PRAGMA cache_size = {-SQLITE_CACHE_SIZE:d}')
+    conn.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT:d}')
+    return conn
+
+
+@contextmanager
+def transaction(conn, immediate=True):
+    """
+    Run the block in one transaction: commit on success, roll back on error
+    immediate=True takes the write lock at BEGIN, so a writer never has to
+    upgrade a read lock mid-transaction (the usual SQLITE_BUSY deadlock)
+    """
+    conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+
+class ConnectionPool:
+    """
+    LIFO pool of tuned connections to one database file
+    acquire() never blocks: when the pool is empty a new connection is
+    opened, and release() closes connections beyond max_idle.
+    """
+
+    def __init__(self, path, max_idle=DB_POOL_SIZE):
+        self.path = path
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return connect(self.path)
+
+    def release(self, conn):
+        # A request that failed mid-transaction must not leak it to the next one
+        try:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+        except sqlite3.Error:
+            logger.warning("Discarding a broken database connection", exc_info=True)
+            conn.close()
+            return
+        if self._idle.qsize() >= self.max_idle:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    def close(self):
+        """Close every idle connection (e.g. after fork, or at shutdown)"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
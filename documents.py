@@ -0,0 +1,310 @@
+"""
+Streaming, content-addressed document storage
+/upload-document used to let Werkzeug buffer the whole multipart body
+(in memory or a temp file) and then copy it out with file.save(). Here the
+body is parsed as it arrives: each chunk of the file part is hashed and
+written straight to a staging file next to the store, so memory per upload
+is one chunk whatever the file size.
+
+Files are stored once per content under objects/<sha256[:2]>/<sha256>.<ext>,
+so identical uploads share one file. Every change to the object tree
+(placing a new object, deleting one nobody references any more) happens
+inside the documents transaction, under SQLite's write lock, so a file
+cannot be reclaimed while another upload is about to reference it.
+
+Downloads carry the content hash as a strong ETag, so a browser that
+already has the file gets a 304 without the file being touched, and
+support Range requests for resuming large PDFs. With DOWNLOAD_OFFLOAD a
+front proxy sends the bytes instead of the Python worker:
+
+    x-accel-redirect  nginx; DOWNLOAD_ACCEL_PREFIX is an internal location
+                      aliased to the upload folder
+    x-sendfile        Apache mod_xsendfile, lighttpd (Flask's USE_X_SENDFILE)
+
+Objects and staging files leaked by failed transactions or dead workers
+are swept by maybe_reclaim(), which the upload route calls; a process
+sweeps at most every DOCUMENT_RECLAIM_INTERVAL seconds.
+
+Tunable from the environment:
+    DOCUMENT_STORE             store root (default uploads/store)
+    UPLOAD_CHUNK_SIZE          bytes read from the request per step (default 64 KiB)
+    DOWNLOAD_OFFLOAD           x-accel-redirect, x-sendfile or unset
+    DOWNLOAD_ACCEL_PREFIX      default /protected-uploads/
+    DOCUMENT_RECLAIM_INTERVAL  seconds between sweeps (default 3600)
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+from flask import Response, send_file
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+from db import transaction
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_STORE = os.environ.get('DOCUMENT_STORE', os.path.join('uploads', 'store'))
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(64 * 1024)))
+DOWNLOAD_OFFLOAD = os.environ.get('DOWNLOAD_OFFLOAD', '').lower()
+DOWNLOAD_ACCEL_PREFIX = os.environ.get('DOWNLOAD_ACCEL_PREFIX', '/protected-uploads/')
+DOCUMENT_RECLAIM_INTERVAL = int(os.environ.get('DOCUMENT_RECLAIM_INTERVAL', '3600'))
+# Form fields are buffered; nothing legitimate comes close to this
+MAX_FIELD_SIZE = 4096
+
+
+class UploadError(ValueError):
+    """The request body is not an acceptable upload"""
+
+
+class StagedFile:
+    """An uploaded file written to the staging area, not yet in the store"""
+
+    def __init__(self, path, filename, content_hash, size):
+        self.path = path
+        self.filename = filename
+        self.content_hash = content_hash
+        self.size = size
+
+    @property
+    def extension(self):
+        return self.filename.rsplit('.', 1)[1].lower() if '.' in self.filename else ''
+
+
+class DocumentStore:
+    """Content-addressed files under one root directory"""
+
+    def __init__(self, root=DOCUMENT_STORE, chunk_size=UPLOAD_CHUNK_SIZE,
+                 reclaim_interval=DOCUMENT_RECLAIM_INTERVAL):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.reclaim_interval = reclaim_interval
+        self._next_reclaim = 0
+        self._reclaim_lock = threading.Lock()
+        self.objects = os.path.join(root, 'objects')
+        self.staging = os.path.join(root, 'staging')
+        self.derived = os.path.join(root, 'derived')
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.staging, exist_ok=True)
+
+    def object_path(self, content_hash, extension):
+        name = f'{content_hash}.{extension}' if extension else content_hash
+        return os.path.join(self.objects, content_hash[:2], name)
+
+    def derived_paths(self, path):
+        """Where the preview and thumbnail of the object at path go (see previews.py)"""
+        name = os.path.basename(path)
+        directory = os.path.join(self.derived, name[:2])
+        return os.path.join(directory, name + '.preview.jpg'), os.path.join(directory, name + '.thumb.jpg')
+
+    def stage(self, chunks, filename):
+        """Write chunks to a staging file, hashing them on the way"""
+        digest = hashlib.sha256()
+        size = 0
+        fd, path = tempfile.mkstemp(dir=self.staging)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return StagedFile(path, filename, digest.hexdigest(), size)
+
+    def discard(self, staged):
+        if staged is not None and os.path.exists(staged.path):
+            os.remove(staged.path)
+
+    def place(self, staged):
+        """
+        Move a staged file to its object path and return that path
+        If the object already exists the staged copy is dropped instead.
+        Call inside the transaction that records the document.
+        """
+        path = self.object_path(staged.content_hash, staged.extension)
+        if os.path.exists(path):
+            os.remove(staged.path)
+            logger.debug("Deduplicated upload %s", staged.content_hash)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staged.path, path)
+        return path
+
+    def release(self, conn, paths, legacy_root=None):
+        """
+        Delete whichever of paths no document references any more
+        Only files in the store, or under legacy_root (where uploads were
+        written before the store existed), are touched. Call inside the
+        transaction that dropped the references.
+        """
+        roots = tuple(os.path.realpath(root) + os.sep for root in (self.root, legacy_root) if root)
+        for path in set(paths):
+            if not os.path.realpath(path).startswith(roots):
+                continue
+            if conn.execute('SELECT 1 FROM documents WHERE file_path = ? LIMIT 1', (path,)).fetchone():
+                continue
+            in_store = os.path.realpath(path).startswith(roots[0])
+            for orphan in (path, *self.derived_paths(path)) if in_store else (path,):
+                try:
+                    os.remove(orphan)
+                    logger.info("Reclaimed orphaned document file %s", orphan)
+                except FileNotFoundError:
+                    pass
+
+    def reclaim_orphans(self, conn, min_age=3600):
+        """
+        Sweep objects no document references, their previews, and
+        abandoned staging files
+        Left behind only when a transaction fails after placing an object
+        or a worker dies mid-upload; files younger than min_age seconds are
+        kept, as they may belong to an upload in progress. Returns the
+        number of files removed.
+        """
+        cutoff = time.time() - min_age
+        removed = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                if directory.startswith(self.derived):
+                    # Previews live as long as the object they were made from
+                    source = name.rsplit('.', 2)[0]
+                    if os.path.exists(os.path.join(self.objects, source[:2], source)):
+                        continue
+                elif directory != self.staging and conn.execute(
+                        'SELECT 1 FROM documents WHERE file_path = ? LIMIT 1', (path,)).fetchone():
+                    continue
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def maybe_reclaim(self, conn, min_age=3600, now=None):
+        """
+        reclaim_orphans() in its own write transaction, if reclaim_interval
+        has passed since this process last swept; returns the number of
+        files removed (0 when no sweep was due)
+        """
+        now = time.time() if now is None else now
+        with self._reclaim_lock:
+            if now < self._next_reclaim:
+                return 0
+            self._next_reclaim = now + self.reclaim_interval
+        with transaction(conn):
+            removed = self.reclaim_orphans(conn, min_age)
+        if removed:
+            logger.info("Reclaimed %d orphaned document files", removed)
+        return removed
+
+
+def parse_upload(stream, content_type, store, file_field='document', allowed_extensions=None):
+    """
+    Stream a multipart/form-data body into the store's staging area
+    Returns (fields, staged) where fields holds the small form fields and
+    staged is the StagedFile for file_field (None if it was absent). The
+    file's extension is checked from its part headers before any of its
+    body is read. Raises UploadError for malformed or unacceptable bodies.
+    """
+    mimetype, options = parse_options_header(content_type or '')
+    boundary = options.get('boundary')
+    if mimetype != 'multipart/form-data' or not boundary:
+        raise UploadError('Expected a multipart/form-data upload')
+
+    decoder = MultipartDecoder(boundary.encode('latin-1'))
+    chunk_size = store.chunk_size
+
+    def events():
+        while True:
+            event = decoder.next_event()
+            if isinstance(event, NeedData):
+                decoder.receive_data(stream.read(chunk_size) or None)
+            elif isinstance(event, Epilogue):
+                return
+            else:
+                yield event
+
+    def part_data(iterator):
+        for event in iterator:
+            if not isinstance(event, Data):
+                raise UploadError('Malformed multipart body')
+            if event.data:
+                yield event.data
+            if not event.more_data:
+                return
+
+    fields, staged = {}, None
+    iterator = events()
+    try:
+        for event in iterator:
+            if isinstance(event, Field):
+                value = bytearray()
+                for data in part_data(iterator):
+                    value += data
+                    if len(value) > MAX_FIELD_SIZE:
+                        raise RequestEntityTooLarge()
+                fields[event.name] = value.decode('utf-8', 'replace')
+            elif isinstance(event, File):
+                filename = event.filename or ''
+                if event.name != file_field or staged is not None:
+                    for _ in part_data(iterator):
+                        pass
+                    continue
+                if not filename:
+                    raise UploadError('No file selected')
+                extension = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+                if allowed_extensions is not None and extension not in allowed_extensions:
+                    raise UploadError('Invalid file type. Only JPG, PNG, and PDF allowed')
+                staged = store.stage(part_data(iterator), filename)
+    except ValueError as e:
+        store.discard(staged)
+        if isinstance(e, UploadError):
+            raise
+        raise UploadError('Malformed multipart body') from e
+    except BaseException:
+        store.discard(staged)
+        raise
+    return fields, staged
+
+
+def send_document(request, path, download_name, content_hash=None, upload_root='uploads',
+                  offload=DOWNLOAD_OFFLOAD, as_attachment=True):
+    """
+    Response sending the file at path, as an attachment by default
+    content_hash, when known, is the strong ETag; without one (documents
+    uploaded before hashes were recorded) Werkzeug derives one from the
+    file's mtime and size. Raises FileNotFoundError if the file is gone.
+    """
+    if content_hash and content_hash in request.if_none_match:
+        response = Response(status=304)
+    elif offload == 'x-accel-redirect':
+        relative = os.path.relpath(os.path.realpath(path), os.path.realpath(upload_root))
+        if relative.startswith(os.pardir) or not os.path.exists(path):
+            raise FileNotFoundError(path)
+        response = Response(mimetype=mimetypes.guess_type(download_name)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + quote(
+            relative.replace(os.sep, '/'))
+        response.headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline',
+                             filename=download_name)
+    else:
+        # x-sendfile is handled by send_file itself (USE_X_SENDFILE)
+        return _private(send_file(path, as_attachment=as_attachment, download_name=download_name,
+                                  etag=content_hash or True, conditional=True), content_hash)
+    return _private(response, content_hash)
+
+
+def _private(response, etag):
+    """Per-user files: never cached by shared caches, revalidated by browsers"""
+    if etag:
+        response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -2,6 +2,9 @@
 Language support for Hexecutioners platform
 """
 
+import hashlib
+import json
+
 LANGUAGES = {
     'en': 'English',
     'hi': 'हिंदी',
@@ -32,7 +35,7 @@ TRANSLATIONS = {
         'program_participation': 'Program Participation & Commitment',
         'health_work': 'Health & Work Experience',
         'program_impact': 'Program Impact & Skills',
-        'age_range': 'Age',
+        'age_range': 'Age Range',
         'select_age': 'Select your age',
         'age_18_20': '18-20 years',
         'age_21_23': '21-23 years',
@@ -106,6 +109,8 @@ TRANSLATIONS = {
         'proceed_signup': 'Proceed to Signup',
         'signup_disabled': 'Signup Disabled - High Risk Profile',
         'go_back': 'Go Back',
+        'contact_shortly': 'Thank You for Your Interest',
+        'contact_message': 'We will review your profile and contact you shortly with further information.',
         'required': 'Required',
         'select_option': 'Select an option',
         'rating_1': '1',
@@ -152,8 +157,8 @@ TRANSLATIONS = {
         'program_participation': 'कार्यक्रम भागीदारी और प्रतिबद्धता',
         'health_work': 'स्वास्थ्य और कार्य अनुभव',
         'program_impact': 'कार्यक्रम प्रभाव और कौशल',
-        'age_range': 'आयु',
-        'select_age': 'अपनी आयु चुनें',
+        'age_range': 'आयु सीमा',
+        'select_age': 'अपनी आयु सीमा चुनें',
         'age_18_20': '18-20 साल',
         'age_21_23': '21-23 साल',
         'age_24_25': '24-25 साल',
@@ -226,6 +231,8 @@ TRANSLATIONS = {
         'proceed_signup': 'साइनअप जारी रखें',
         'signup_disabled': 'साइनअप अक्षम - उच्च जोखिम प्रोफ़ाइल',
         'go_back': 'वापस जाएं',
+        'contact_shortly': 'आपकी रुचि के लिए धन्यवाद',
+        'contact_message': 'हम आपकी प्रोफ़ाइल की समीक्षा करेंगे और शीघ्र ही आपको और जानकारी के साथ संपर्क करेंगे।',
         'required': 'आवश्यक',
         'select_option': 'एक विकल्प चुनें',
         'rating_1': '1',
@@ -267,13 +274,13 @@ TRANSLATIONS = {
         'school': 'ಶಾಲೆ / ಕಾಲೇಜು',
         'other_source': 'ಇತರೆ',
         'personal_info': 'ವೈಯಕ್ತಿಕ ಮಾಹಿತಿ',
-        'family_info': 'ಕುಟುಂಬ ಮಾಹಿತಿ',
-        'behavioral_social': 'ವರ್ತನೆ ಮತ್ತು ಸಾಮಾಜಿಕ ಕೌಶಲ್ಯ',
+        'family_info': 'ಕುಟುಂಬದ ಮಾಹಿತಿ',
+        'behavioral_social': 'ವರ್ತನೆ ಮತ್ತು ಸಾಮಾಜಿಕ ಕೌಶಲ್ಯಗಳು',
         'program_participation': 'ಕಾರ್ಯಕ್ರಮ ಭಾಗವಹಿಸುವಿಕೆ ಮತ್ತು ಬದ್ಧತೆ',
         'health_work': 'ಆರೋಗ್ಯ ಮತ್ತು ಕೆಲಸದ ಅನುಭವ',
         'program_impact': 'ಕಾರ್ಯಕ್ರಮದ ಪ್ರಭಾವ ಮತ್ತು ಕೌಶಲ್ಯಗಳು',
-        'age_range': 'ವಯಸ್ಸು',
-        'select_age': 'ನಿಮ್ಮ ವಯಸ್ಸನ್ನು ಆಯ್ಕೆ ಮಾಡಿ',
+        'age_range': 'ವಯಸ್ಸಿನ ವ್ಯಾಪ್ತಿ',
+        'select_age': 'ನಿಮ್ಮ ವಯಸ್ಸಿನ ವ್ಯಾಪ್ತಿಯನ್ನು ಆಯ್ಕೆ ಮಾಡಿ',
         'age_18_20': '18-20 ವರ್ಷಗಳು',
         'age_21_23': '21-23 ವರ್ಷಗಳು',
         'age_24_25': '24-25 ವರ್ಷಗಳು',
@@ -346,6 +353,8 @@ TRANSLATIONS = {
         'proceed_signup': 'ಸೈನ್‌ಅಪ್ ಮುಂದುವರಿಸಿ',
         'signup_disabled': 'ಸೈನ್‌ಅಪ್ ನಿಷ್ಕ್ರಿಯಗೊಳಿಸಲಾಗಿದೆ - ಹೆಚ್ಚಿನ ಅಪಾಯ ಪ್ರೊಫೈಲ್',
         'go_back': 'ಹಿಂತಿರುಗಿ',
+        'contact_shortly': 'ನಿಮ್ಮ ಆಸಕ್ತಿಗೆ ಧನ್ಯವಾದಗಳು',
+        'contact_message': 'ನಾವು ನಿಮ್ಮ ಪ್ರೊಫೈಲ್ ಅನ್ನು ವಿಮರ್ಶಿಸುತ್ತೇವೆ ಮತ್ತು ಶೀಘ್ರದಲ್ಲೇ ಮುಂದಿನ ಮಾಹಿತಿಯೊಂದಿಗೆ ನಿಮ್ಮನ್ನು ಸಂಪರ್ಕಿಸುತ್ತೇವೆ.',
         'required': 'ಅಗತ್ಯ',
         'select_option': 'ಒಂದು ಆಯ್ಕೆಯನ್ನು ಮಾಡಿ',
         'rating_1': '1',
@@ -372,9 +381,41 @@ TRANSLATIONS = {
 }
 
 
+def _compile_catalogs():
+    """
+    Flatten TRANSLATIONS into one complete lookup table per language
+    English fills in any key a language lacks, so lookups never fall back
+    at runtime. Each catalog is also serialized once, as the JSON bundle
+    pages fetch, with a version taken from its content.
+    """
+    catalogs, bundles, versions = {}, {}, {}
+    for lang in LANGUAGES:
+        catalog = {**TRANSLATIONS['en'], **TRANSLATIONS.get(lang, {})}
+        bundle = json.dumps(catalog, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        catalogs[lang] = catalog
+        bundles[lang] = bundle
+        versions[lang] = hashlib.sha256(bundle).hexdigest()[:12]
+    return catalogs, bundles, versions
+
+
+CATALOGS, _BUNDLES, BUNDLE_VERSIONS = _compile_catalogs()
+
+
 def get_text(key, lang='en'):
     """Get translated text for a given key and language"""
-    return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, key)
+    return CATALOGS.get(lang, CATALOGS['en']).get(key, key)
+
+
+def get_catalog(lang):
+    """The complete lookup table for a language (English if unknown)"""
+    return CATALOGS.get(lang, CATALOGS['en'])
+
+
+def get_bundle(lang):
+    """(json_bytes, version) of a language's translation bundle, or None if unknown"""
+    if lang not in _BUNDLES:
+        return None
+    return _BUNDLES[lang], BUNDLE_VERSIONS[lang]
 
 
 def get_language_name(lang_code):
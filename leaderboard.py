@@ -0,0 +1,222 @@
+"""
+Leaderboard queries
+The all-time board reads the materialized user_totals table, which is
+maintained by triggers on game_scores (see migrations.py), so its reads
+are index range scans on (total_score DESC, user_id) instead of
+aggregating every score ever saved. Per-game and time-window boards
+aggregate game_scores through the (game_name, user_id, score) and
+(created_at) indexes.
+
+Ranks are positional in that order (ties broken by user id) and are
+derived when read rather than stored: storing them would mean rewriting
+every row below a user each time they score.
+
+Pages are addressed by an opaque cursor holding the last row's rank,
+score and user id, so the next page starts where the last one ended
+instead of skipping OFFSET rows.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+LEADERBOARD_PAGE_SIZE = 50
+LEADERBOARD_MAX_LIMIT = 100
+WINDOWS = ('all', 'week', 'today')
+
+
+def _row(row, rank):
+    return {
+        'rank': rank,
+        'user_id': row['user_id'],
+        'username': row['username'],
+        'total_score': row['total_score'],
+        'games_played': row['games_played'],
+    }
+
+
+def top_users(conn, limit=LEADERBOARD_PAGE_SIZE, offset=0):
+    """One page of the overall leaderboard, best first"""
+    rows = conn.execute(
+        '''SELECT t.user_id, u.username, t.total_score, t.games_played
+        FROM user_totals t
+        JOIN users u ON u.id = t.user_id
+        ORDER BY t.total_score DESC, t.user_id
+        LIMIT ? OFFSET ?''',
+        (limit, offset)
+    ).fetchall()
+    return [_row(row, offset + i + 1) for i, row in enumerate(rows)]
+
+
+def user_standing(conn, user_id):
+    """
+    A user's totals and rank, or None if they have no totals row
+    The rank is one COUNT over the index entries ahead of the user
+    """
+    row = conn.execute(
+        '''SELECT t.user_id, u.username, t.total_score, t.games_played
+        FROM user_totals t
+        JOIN users u ON u.id = t.user_id
+        WHERE t.user_id = ?''',
+        (user_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    ahead = conn.execute(
+        '''SELECT COUNT(*) FROM user_totals
+        WHERE total_score > ? OR (total_score = ? AND user_id < ?)''',
+        (row['total_score'], row['total_score'], user_id)
+    ).fetchone()[0]
+    return _row(row, ahead + 1)
+
+
+def count_users(conn):
+    return conn.execute('SELECT COUNT(*) FROM user_totals').fetchone()[0]
+
+
+def window_start(window, now=None):
+    """Earliest created_at (UTC, SQLite's format) counted by a board window"""
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown leaderboard window {window!r}")
+    if window == 'all':
+        return None
+    now = now or datetime.now(timezone.utc)
+    if window == 'today':
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        start = now - timedelta(days=7)
+    return start.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def encode_cursor(row):
+    raw = json.dumps([row['rank'], row['total_score'], row['user_id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(rank, total_score, user_id) of the row a page continues after"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        rank, total_score, user_id = (int(v) for v in json.loads(raw))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid leaderboard cursor") from None
+    return rank, total_score, user_id
+
+
+def _aggregate_query(game, since):
+    """
+    Ranked per-user totals over the scores a board counts
+    Returns the SQL (selecting user_id, username, total_score,
+    games_played, rank as "ranked") and its parameters
+    """
+    conditions, params = [], []
+    if game is not None:
+        conditions.append('game_name = ?')
+        params.append(game)
+    if since is not None:
+        conditions.append('created_at >= ?')
+        params.append(since)
+    # Grouping by +user_id stops the planner from walking a user_id index
+    # in full to avoid a sort; a time window should range-scan created_at
+    group_by = 'user_id' if since is None else '+user_id'
+    sql = f'''WITH board AS (
+            SELECT user_id, SUM(CAST(score AS INTEGER)) AS total_score, COUNT(*) AS games_played
+            FROM game_scores
+            WHERE {' AND '.join(conditions)}
+            GROUP BY {group_by}
+        ), ranked AS (
+            SELECT board.user_id, u.username, board.total_score, board.games_played,
+                   ROW_NUMBER() OVER (ORDER BY board.total_score DESC, board.user_id) AS rank
+            FROM board
+            JOIN users u ON u.id = board.user_id
+        )'''
+    return sql, params
+
+
+def board_page(conn, game=None, window='all', limit=LEADERBOARD_PAGE_SIZE, cursor=None):
+    """
+    One page of a board, best first, after the row named by cursor
+    Returns (rows, next_cursor); next_cursor is None on the last page
+    """
+    since = window_start(window)
+    after = decode_cursor(cursor) if cursor else None
+
+    if game is None and since is None:
+        if after is None:
+            rows = top_users(conn, limit + 1)
+        else:
+            rank, total_score, user_id = after
+            rows = conn.execute(
+                '''SELECT t.user_id, u.username, t.total_score, t.games_played
+                FROM user_totals t
+                JOIN users u ON u.id = t.user_id
+                WHERE t.total_score < ? OR (t.total_score = ? AND t.user_id > ?)
+                ORDER BY t.total_score DESC, t.user_id
+                LIMIT ?''',
+                (total_score, total_score, user_id, limit + 1)
+            ).fetchall()
+            rows = [_row(row, rank + i + 1) for i, row in enumerate(rows)]
+    else:
+        sql, params = _aggregate_query(game, since)
+        rows = conn.execute(
+            sql + ' SELECT * FROM ranked WHERE rank > ? ORDER BY rank LIMIT ?',
+            params + [after[0] if after else 0, limit + 1]
+        ).fetchall()
+        rows = [_row(row, row['rank']) for row in rows]
+
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def board_standing(conn, user_id, game=None, window='all'):
+    """A user's totals and rank on a board, or None if they are not on it"""
+    since = window_start(window)
+    if game is None and since is None:
+        return user_standing(conn, user_id)
+
+    sql, params = _aggregate_query(game, since)
+    row = conn.execute(sql + ' SELECT * FROM ranked WHERE user_id = ?', params + [user_id]).fetchone()
+    return _row(row, row['rank']) if row is not None else None
+
+
+def board_around(conn, user_id, game=None, window='all', n=5):
+    """
+    The user's row with up to n rows above and below it, best first
+    Empty if the user is not on the board
+    """
+    since = window_start(window)
+    if game is not None or since is not None:
+        sql, params = _aggregate_query(game, since)
+        rows = conn.execute(
+            sql + ''' SELECT * FROM ranked
+            WHERE rank BETWEEN (SELECT rank FROM ranked WHERE user_id = ?) - ?
+                           AND (SELECT rank FROM ranked WHERE user_id = ?) + ?
+            ORDER BY rank''',
+            params + [user_id, n, user_id, n]
+        ).fetchall()
+        return [_row(row, row['rank']) for row in rows]
+
+    me = user_standing(conn, user_id)
+    if me is None:
+        return []
+    above = conn.execute(
+        '''SELECT t.user_id, u.username, t.total_score, t.games_played
+        FROM user_totals t
+        JOIN users u ON u.id = t.user_id
+        WHERE t.total_score > ? OR (t.total_score = ? AND t.user_id < ?)
+        ORDER BY t.total_score, t.user_id DESC
+        LIMIT ?''',
+        (me['total_score'], me['total_score'], user_id, n)
+    ).fetchall()
+    below = conn.execute(
+        '''SELECT t.user_id, u.username, t.total_score, t.games_played
+        FROM user_totals t
+        JOIN users u ON u.id = t.user_id
+        WHERE t.total_score < ? OR (t.total_score = ? AND t.user_id > ?)
+        ORDER BY t.total_score DESC, t.user_id
+        LIMIT ?''',
+        (me['total_score'], me['total_score'], user_id, n)
+    ).fetchall()
+    return ([_row(row, me['rank'] - i - 1) for i, row in enumerate(above)][::-1]
+            + [me]
+            + [_row(row, me['rank'] + i + 1) for i, row in enumerate(below)])
@@ -0,0 +1,121 @@
+"""
+Logging setup for the app and the prediction path
+Every module logs through logging.getLogger(__name__); this module wires
+those loggers to a handler once, from the environment:
+
+    LOG_LEVEL           root level (default INFO)
+    LOG_LEVELS          per-subsystem levels, e.g. "ml_model=DEBUG,app.payloads=DEBUG"
+    LOG_FORMAT          'text' (default) or 'json' (one object per line)
+    LOG_QUEUE           1 to hand records to a background thread instead of
+                        writing them on the request thread
+    LOG_PAYLOAD_SAMPLE  fraction (0-1) of requests whose full payload is
+                        dumped on the *.payloads loggers; 0 (default) disables it
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+_handler = None
+_listener = None
+_payload_sample_rate = 0.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any extra={...} fields"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def parse_levels(spec):
+    """'ml_model=DEBUG,app=WARNING' -> {'ml_model': 10, 'app': 30}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = (part.strip() for part in item.partition('='))
+        if not name or not level:
+            continue
+        value = logging.getLevelName(level.upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level {level!r} for {name!r}")
+        levels[name] = value
+    return levels
+
+
+def configure_logging(env=None):
+    """
+    Install the root handler and levels described by env (os.environ by
+    default). Safe to call more than once; later calls replace the handler.
+    """
+    global _handler, _listener, _payload_sample_rate
+    env = os.environ if env is None else env
+    root = logging.getLogger()
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        root.removeHandler(_handler)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    if env.get('LOG_FORMAT', 'text') == 'json':
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    # The queue handler only enqueues the record; formatting and the write
+    # happen on the listener's thread
+    if env.get('LOG_QUEUE') == '1':
+        records = queue.SimpleQueue()
+        _handler = logging.handlers.QueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, stream_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        _handler = stream_handler
+    root.addHandler(_handler)
+
+    root.setLevel(env.get('LOG_LEVEL', 'INFO').upper())
+    for name, level in parse_levels(env.get('LOG_LEVELS')).items():
+        logging.getLogger(name).setLevel(level)
+
+    _payload_sample_rate = min(max(float(env.get('LOG_PAYLOAD_SAMPLE', '0')), 0.0), 1.0)
+
+
+def should_log_payload(logger):
+    """
+    Whether this request's payload should be dumped to logger: the logger
+    must be enabled for DEBUG and the request must fall in the sample
+    """
+    if _payload_sample_rate <= 0 or not logger.isEnabledFor(logging.DEBUG):
+        return False
+    return _payload_sample_rate >= 1 or random.random() < _payload_sample_rate
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+# Drain queued records before the interpreter exits
+atexit.register(_stop_listener)
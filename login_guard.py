@@ -0,0 +1,125 @@
+"""
+In-process guard for /login
+Brute-force and credential-stuffing traffic is turned away before it
+reaches the password KDF (see passwords.py), which legitimate users need:
+
+    per IP        a token bucket; every attempt takes a token. Classes often
+                  share one address, so the default burst is generous.
+    per username  a token bucket; only failed attempts take a token, so a
+                  user who types their password right is never slowed.
+
+Buckets live in fixed-size LRU tables. A bucket that has refilled
+completely carries no state and is dropped, so idle keys age out on
+their own and the tables never exceed LOGIN_GUARD_ENTRIES keys each.
+A bucket pushed out of its table while still empty (a locked-out
+username) moves to a second table of the same size, so flooding the
+first with fresh keys does not unlock it: pushing it out of both takes
+emptying LOGIN_GUARD_ENTRIES buckets of one's own.
+
+Behind a reverse proxy, request.remote_addr must be the client's address
+(e.g. via werkzeug's ProxyFix) for the per-IP limit to mean anything.
+
+Tunable from the environment:
+    LOGIN_IP_BURST / LOGIN_IP_RATE        attempts, attempts per second (60, 1)
+    LOGIN_USER_BURST / LOGIN_USER_RATE    failures, failures per second (5, 1/60)
+    LOGIN_GUARD_ENTRIES                   keys per table (default 10000)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+LOGIN_IP_BURST = float(os.environ.get('LOGIN_IP_BURST', '60'))
+LOGIN_IP_RATE = float(os.environ.get('LOGIN_IP_RATE', '1'))
+LOGIN_USER_BURST = float(os.environ.get('LOGIN_USER_BURST', '5'))
+LOGIN_USER_RATE = float(os.environ.get('LOGIN_USER_RATE', str(1 / 60)))
+LOGIN_GUARD_ENTRIES = int(os.environ.get('LOGIN_GUARD_ENTRIES', '10000'))
+
+
+class TokenBuckets:
+    """Token buckets keyed by string, in an LRU table of at most max_entries"""
+
+    def __init__(self, capacity, rate, max_entries=LOGIN_GUARD_ENTRIES):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+        self._empty = OrderedDict()  # evicted from _buckets without a whole token
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets) + len(self._empty)
+
+    def _tokens(self, key, now):
+        bucket = self._buckets.get(key) or self._empty.get(key)
+        if bucket is None:
+            return self.capacity
+        tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+        if tokens >= self.capacity:
+            # Full again: no different from a key never seen
+            self._buckets.pop(key, None)
+            self._empty.pop(key, None)
+        return tokens
+
+    def _evict(self, now):
+        key, bucket = self._buckets.popitem(last=False)
+        if bucket[0] + (now - bucket[1]) * self.rate >= 1:
+            return
+        if len(self._empty) >= self.max_entries:
+            self._empty.popitem(last=False)
+        self._empty[key] = bucket
+
+    def wait_time(self, key, now=None):
+        """Seconds until key has a whole token (0 if it has one now)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens = self._tokens(key, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, key, now=None):
+        """Take a token; returns 0 on success, else seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                return (1 - tokens) / self.rate
+            self._empty.pop(key, None)
+            if key in self._buckets:
+                self._buckets.move_to_end(key)
+            elif len(self._buckets) >= self.max_entries:
+                self._evict(now)
+            self._buckets[key] = [tokens - 1, now]
+        return 0.0
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+            self._empty.pop(key, None)
+
+
+class LoginGuard:
+    """Login rate limits for one process"""
+
+    def __init__(self, ip_burst=LOGIN_IP_BURST, ip_rate=LOGIN_IP_RATE,
+                 user_burst=LOGIN_USER_BURST, user_rate=LOGIN_USER_RATE,
+                 max_entries=LOGIN_GUARD_ENTRIES):
+        self.ips = TokenBuckets(ip_burst, ip_rate, max_entries)
+        self.usernames = TokenBuckets(user_burst, user_rate, max_entries)
+
+    def admit(self, ip, username):
+        """
+        Whether to look at this attempt at all: 0 to go ahead, otherwise
+        the seconds to send back in Retry-After
+        """
+        locked_for = self.usernames.wait_time(username)
+        if locked_for:
+            return math.ceil(locked_for)
+        return math.ceil(self.ips.take(ip))
+
+    def failed(self, username):
+        self.usernames.take(username)
+
+    def succeeded(self, username):
+        self.usernames.reset(username)
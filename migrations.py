@@ -0,0 +1,288 @@
+"""
+Versioned schema migrations for the app database
+Each migration runs once, in order, inside its own transaction. The
+number of the last one applied is kept in SQLite's PRAGMA user_version,
+so starting the app against an up-to-date database costs one PRAGMA read.
+
+To change the schema, append a new (version, description, statements)
+entry to MIGRATIONS; never edit one that has already shipped.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _add_column(table, column, definition):
+    """ALTER TABLE ... ADD COLUMN that is a no-op if the column exists"""
+    def apply(conn):
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+        if column not in columns:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return apply
+
+
+# Plays kept per user and game for skill trends (see skills.py)
+SKILL_RECENT_PLAYS = 10
+
+
+def _skill_stats_rows(where):
+    """SELECT rebuilding skill_stats rows for the game_scores matching where"""
+    return f'''
+        SELECT g.user_id, g.game_name, COUNT(*), MAX(CAST(g.score AS INTEGER)), SUM(CAST(g.score AS INTEGER)),
+               (SELECT json_group_array(score) FROM (
+                    SELECT * FROM (
+                        SELECT r.id, CAST(r.score AS INTEGER) AS score FROM game_scores r
+                        WHERE r.user_id = g.user_id AND r.game_name = g.game_name
+                        ORDER BY r.id DESC LIMIT {SKILL_RECENT_PLAYS:d}
+                    ) ORDER BY id
+               ))
+        FROM game_scores g
+        WHERE {where}
+        GROUP BY g.user_id, g.game_name
+    '''
+
+
+# Version 1 uses IF NOT EXISTS so databases created before migrations
+# existed (user_version 0 but tables present) are adopted as they are
+MIGRATIONS = [
+    (1, 'create base tables', [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS game_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            game_name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            document_type TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS assessments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            age TEXT NOT NULL,
+            passed12th TEXT NOT NULL,
+            gender TEXT NOT NULL,
+            familyMembers TEXT NOT NULL,
+            earningMembers TEXT NOT NULL,
+            highestEducation TEXT NOT NULL,
+            familyHealthCondition TEXT NOT NULL,
+            familySupport TEXT NOT NULL,
+            dailyChores TEXT NOT NULL,
+            groupActivities TEXT NOT NULL,
+            sportsRating INTEGER NOT NULL,
+            communicationRating INTEGER NOT NULL,
+            technologyComfort TEXT NOT NULL,
+            pastProgram TEXT NOT NULL,
+            reasonForJoining TEXT NOT NULL,
+            dailyCommitment TEXT NOT NULL,
+            travelComfort TEXT NOT NULL,
+            workExperience TEXT NOT NULL,
+            healthCondition TEXT NOT NULL,
+            programBenefit TEXT NOT NULL,
+            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+    ]),
+    (2, 'record the model version behind each assessment', [
+        _add_column('assessments', 'model_version', 'TEXT'),
+    ]),
+    (3, 'index per-user lookups', [
+        'CREATE INDEX IF NOT EXISTS idx_game_scores_user ON game_scores (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_documents_user ON documents (user_id, document_type)',
+        'CREATE INDEX IF NOT EXISTS idx_assessments_user ON assessments (user_id)',
+    ]),
+    # Leaderboard totals are kept up to date by triggers, so every writer
+    # of game_scores (and users) maintains them without extra queries
+    (4, 'materialize per-user leaderboard totals', [
+        '''
+        CREATE TABLE IF NOT EXISTS user_totals (
+            user_id INTEGER PRIMARY KEY,
+            total_score INTEGER NOT NULL DEFAULT 0,
+            games_played INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_user_totals_rank ON user_totals (total_score DESC, user_id)',
+        '''
+        INSERT OR REPLACE INTO user_totals (user_id, total_score, games_played)
+        SELECT u.id, COALESCE(SUM(CAST(gs.score AS INTEGER)), 0), COUNT(gs.id)
+        FROM users u
+        LEFT JOIN game_scores gs ON u.id = gs.user_id
+        GROUP BY u.id
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_totals_new_user AFTER INSERT ON users
+        BEGIN
+            INSERT OR IGNORE INTO user_totals (user_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_totals_delete_user AFTER DELETE ON users
+        BEGIN
+            DELETE FROM user_totals WHERE user_id = OLD.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_totals_add_score AFTER INSERT ON game_scores
+        BEGIN
+            INSERT INTO user_totals (user_id, total_score, games_played)
+            VALUES (NEW.user_id, CAST(NEW.score AS INTEGER), 1)
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_score = total_score + excluded.total_score,
+                games_played = games_played + 1;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_totals_remove_score AFTER DELETE ON game_scores
+        BEGIN
+            UPDATE user_totals
+            SET total_score = total_score - CAST(OLD.score AS INTEGER),
+                games_played = games_played - 1
+            WHERE user_id = OLD.user_id;
+        END
+        ''',
+    ]),
+    (5, 'index per-game and time-window leaderboards', [
+        'CREATE INDEX IF NOT EXISTS idx_game_scores_game ON game_scores (game_name, user_id, score)',
+        'CREATE INDEX IF NOT EXISTS idx_game_scores_created ON game_scores (created_at)',
+    ]),
+    # Per-user score reads (dashboard best scores, skill performance) are
+    # answered from this index alone, already grouped and ordered by game
+    (6, 'cover per-user score queries', [
+        'CREATE INDEX IF NOT EXISTS idx_game_scores_user_game ON game_scores (user_id, game_name, score)',
+        'DROP INDEX IF EXISTS idx_game_scores_user',
+    ]),
+    # Rolling per-user, per-game aggregates for the skill profile, kept up
+    # to date by triggers like user_totals. recent holds the last
+    # SKILL_RECENT_PLAYS scores, oldest first, as a JSON array.
+    (7, 'materialize per-game skill aggregates', [
+        '''
+        CREATE TABLE IF NOT EXISTS skill_stats (
+            user_id INTEGER NOT NULL,
+            game_name TEXT NOT NULL,
+            plays INTEGER NOT NULL,
+            best INTEGER NOT NULL,
+            total_score INTEGER NOT NULL,
+            recent TEXT NOT NULL,
+            PRIMARY KEY (user_id, game_name),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_skill_stats_cohort ON skill_stats (game_name, best)',
+        'INSERT OR REPLACE INTO skill_stats (user_id, game_name, plays, best, total_score, recent)'
+        + _skill_stats_rows('1'),
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_skill_stats_add_score AFTER INSERT ON game_scores
+        BEGIN
+            INSERT INTO skill_stats (user_id, game_name, plays, best, total_score, recent)
+            VALUES (NEW.user_id, NEW.game_name, 1, CAST(NEW.score AS INTEGER), CAST(NEW.score AS INTEGER),
+                    json_array(CAST(NEW.score AS INTEGER)))
+            ON CONFLICT (user_id, game_name) DO UPDATE SET
+                plays = plays + 1,
+                best = MAX(best, excluded.best),
+                total_score = total_score + excluded.total_score,
+                recent = CASE
+                    WHEN json_array_length(recent) >= {SKILL_RECENT_PLAYS:d}
+                    THEN json_remove(json_insert(recent, '$[#]', excluded.best), '$[0]')
+                    ELSE json_insert(recent, '$[#]', excluded.best)
+                END;
+        END
+        ''',
+        # Deletes are rare (admin clean-up), so the pair is simply rebuilt
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_skill_stats_remove_score AFTER DELETE ON game_scores
+        BEGIN
+            DELETE FROM skill_stats WHERE user_id = OLD.user_id AND game_name = OLD.game_name;
+            INSERT INTO skill_stats (user_id, game_name, plays, best, total_score, recent)'''
+        + _skill_stats_rows('g.user_id = OLD.user_id AND g.game_name = OLD.game_name') + ''';
+        END
+        ''',
+    ]),
+    # Server-side sessions (see sessions.py); the cookie only holds the id
+    (8, 'store sessions server-side', [
+        '''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at INTEGER NOT NULL
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)',
+    ]),
+    # Uploaded files are content-addressed (see documents.py); the path
+    # index answers "is this file still referenced?" when one is replaced
+    (9, 'record document content hashes and sizes', [
+        _add_column('documents', 'content_hash', 'TEXT'),
+        _add_column('documents', 'size', 'INTEGER'),
+        'CREATE INDEX IF NOT EXISTS idx_documents_file ON documents (file_path)',
+    ]),
+    # Previews made in the background after upload (see previews.py)
+    (10, 'track document previews', [
+        _add_column('documents', 'processing_status', 'TEXT'),
+        _add_column('documents', 'preview_path', 'TEXT'),
+        _add_column('documents', 'thumbnail_path', 'TEXT'),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """
+    Apply every migration newer than the database's user_version
+    Returns the version the database ends up at
+    """
+    if schema_version(conn) >= migrations[-1][0]:
+        return schema_version(conn)
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT, DDL included
+    try:
+        for version, description, statements in migrations:
+            # BEGIN IMMEDIATE takes the write lock, so when several workers
+            # start at once only one applies each migration
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if schema_version(conn) >= version:
+                    conn.execute('COMMIT')
+                    continue
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            logger.info("Applied migration %d: %s", version, description)
+    finally:
+        conn.isolation_level = isolation_level
+
+    return schema_version(conn)
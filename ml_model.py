@@ -3,155 +3,393 @@ Dropout Prediction Model using LightGBM
 Predicts the likelihood of a student dropping out based on their assessment responses
 """
 
-import joblib
-import pandas as pd
+import gc
+import logging
+import numpy as np
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from compiled_model import CompiledEnsemble, check_parity, engine_path_for, file_fingerprint
+from score_table import ScoreTable
+from log_config import should_log_payload
+
+logger = logging.getLogger(__name__)
+payload_logger = logging.getLogger(__name__ + '.payloads')
+
+# Model registry: versioned bundles (<version>.pkl) plus an optional CURRENT file
+# naming the active one. Falls back to the original single bundle when empty.
+DROPOUT_MODEL_DIR = os.environ.get('DROPOUT_MODEL_DIR', 'models')
+LEGACY_BUNDLE_PATH = 'dropout_lgbm_bundle (1).pkl'
+# Inference engine: 'lightgbm' (native booster) or 'compiled' (NumPy node tables)
+DROPOUT_ENGINE = os.environ.get('DROPOUT_ENGINE', 'lightgbm')
+# 'compiled' workers skip lightgbm entirely when compiled_model.py output built
+# from the bundle being loaded is found: <version>.npz beside <version>.pkl,
+# or else this file (for the legacy bundle)
+DROPOUT_ENGINE_PATH = os.environ.get('DROPOUT_ENGINE_PATH')
+# Optional table built by score_table.py; answers found in it skip the model
+DROPOUT_SCORE_TABLE = os.environ.get('DROPOUT_SCORE_TABLE')
+# Max distinct answer combinations kept in the prediction cache (0 disables it)
+DROPOUT_CACHE_SIZE = int(os.environ.get('DROPOUT_CACHE_SIZE', '4096'))
+
+class FeatureEncoder:
+    """
+    Compiled mapping from raw assessment answers to the booster's input row
+    
+    Built once per model bundle from feature_columns, cat_cols, num_cols and
+    category_levels. Each categorical answer is looked up straight to its
+    category code (the same code pandas would assign), unknown answers
+    become NaN, and rows come out as NumPy arrays in feature_columns order.
+    """
+    
+    def __init__(self, feature_columns, cat_cols, num_cols, category_levels):
+        self.feature_columns = list(feature_columns)
+        self.width = len(self.feature_columns)
+        self.numeric_features = []
+        self.categorical_features = []
+        
+        for position, column in enumerate(self.feature_columns):
+            if column in cat_cols:
+                levels = category_levels.get(column, [])
+                int_levels = len(levels) > 0 and isinstance(levels[0], int)
+                codes = {}
+                for code, level in enumerate(levels):
+                    codes[level] = float(code)
+                    # Numeric categories (like 1, 2, 3, 4, 5) also arrive as strings
+                    if int_levels:
+                        codes[str(level)] = float(code)
+                self.categorical_features.append((position, column, codes, int_levels))
+            elif column in num_cols:
+                self.numeric_features.append((position, column))
+    
+    def encode_into(self, row, assessment_data):
+        """
+        Fill a NaN-initialised row with the encoded answers
+        Raises ValueError for numeric answers that can't be parsed
+        """
+        for position, column in self.numeric_features:
+            value = assessment_data.get(column)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = int(value)
+            try:
+                row[position] = float(value)
+            except (TypeError, ValueError):
+                pass
+        
+        for position, column, codes, int_levels in self.categorical_features:
+            value = assessment_data.get(column)
+            if value is None:
+                continue
+            try:
+                code = codes.get(value)
+            except TypeError:
+                continue
+            if code is None:
+                # Slow path: normalise the answer (numeric categories
+                # to int, anything else to a stripped string) and look it up again
+                if int_levels:
+                    code = codes.get(int(value)) if isinstance(value, str) else None
+                else:
+                    code = codes.get(str(value).strip())
+            if code is not None:
+                row[position] = code
+        
+        return row
+    
+    def encode(self, assessment_data):
+        """Encode one assessment as a single-row (1, n_features) array"""
+        X_row = np.full((1, self.width), np.nan)
+        self.encode_into(X_row[0], assessment_data)
+        return X_row
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of dropout percentages, keyed on the encoded answer vector
+    
+    Every feature comes from a small discrete domain, so real traffic keeps
+    repeating the same combinations. The cache is bound to the fingerprint
+    of the loaded model and empties itself whenever that changes.
+    """
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.model_fingerprint = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key_for(X_row):
+        """Canonical key of one encoded row (unknown answers are all the same NaN)"""
+        return X_row.tobytes()
+    
+    def get(self, key):
+        """Cached dropout percentage for key, or None"""
+        with self._lock:
+            dropout_percentage = self._entries.get(key)
+            if dropout_percentage is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dropout_percentage
+    
+    def put(self, key, dropout_percentage):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = dropout_percentage
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def reset(self, model_fingerprint):
+        """Drop every entry if the model changed"""
+        with self._lock:
+            if model_fingerprint != self.model_fingerprint:
+                self._entries.clear()
+                self.model_fingerprint = model_fingerprint
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'model_fingerprint': self.model_fingerprint,
+            }
+
 
 class DropoutPredictor:
     """ML model for predicting student dropout probability using LightGBM"""
     
-    def __init__(self):
+    def __init__(self, bundle_path=LEGACY_BUNDLE_PATH, version=None):
+        self.bundle_path = Path(bundle_path)
+        self.model_version = version
         self.model = None
         self.feature_columns = None
         self.cat_cols = None
         self.num_cols = None
         self.category_levels = None
+        self.booster = None
+        self.encoder = None
+        self.engine = None
+        self.engine_fingerprint = None
+        self.model_fingerprint = None
+        self.cache = PredictionCache(DROPOUT_CACHE_SIZE)
+        self.score_table = None
         self._load_model()
     
     def _load_model(self):
-        """Load the LightGBM model bundle"""
-        bundle_path = Path('dropout_lgbm_bundle (1).pkl')
+        """Load the LightGBM model bundle, or the compiled engine built from it"""
+        bundle_path = self.bundle_path
+        bundle_fingerprint = file_fingerprint(bundle_path) if bundle_path.exists() else None
+        
+        if DROPOUT_ENGINE == 'compiled':
+            for engine_path in self._engine_candidates():
+                if self._load_compiled_engine(engine_path, bundle_fingerprint):
+                    self._bind_cache(self.engine_fingerprint)
+                    return
         
         if bundle_path.exists():
             try:
+                # joblib pulls in lightgbm while unpickling, so import it only here
+                import joblib
                 bundle = joblib.load(str(bundle_path))
                 self.model = bundle.get("model")
                 self.feature_columns = bundle.get("feature_columns")
                 self.cat_cols = bundle.get("cat_cols")
                 self.num_cols = bundle.get("num_cols")
                 self.category_levels = bundle.get("category_levels")
-                print("[OK] LightGBM model loaded successfully")
-            except Exception as e:
-                print(f"Error loading LightGBM model: {e}")
+                self.booster = getattr(self.model, "booster_", None)
+                self.encoder = FeatureEncoder(
+                    self.feature_columns, self.cat_cols, self.num_cols, self.category_levels
+                )
+                logger.info("LightGBM model loaded from %s", bundle_path)
+                if DROPOUT_ENGINE == 'compiled':
+                    self.engine = self._compile_engine()
+                    self.engine_fingerprint = bundle_fingerprint if self.engine is not None else None
+                self._bind_cache(bundle_fingerprint)
+            except Exception:
+                logger.exception("Error loading LightGBM model from %s", bundle_path)
                 self.model = None
+                self.encoder = None
         else:
-            print(f"[WARN] Model bundle not found at {bundle_path}")
+            logger.warning("Model bundle not found at %s", bundle_path)
             self.model = None
     
-    def _prepare_data_for_prediction(self, assessment_data):
-        """
-        Prepare assessment data for model prediction
-        Maps form data to model's expected format
-        
-        Expects data to come with model feature names directly:
-        - Age (int): 18-25
-        - Gender (str): female, male, other
-        - Family_members (str): 10 or more, less than 4, less than 6, less than 9
-        - Daily_chores_completion (str): always, never, sometimes
-        - Group_activities_participation (str): interested, neutral, not interested
-        - Sports_or_team_games (int): 1, 2, 3, 4, 5
-        - Comfort_talking (int): 1, 2, 3, 4, 5
-        - Past_program_participation (str): no, yes
-        - reason_for_joining (str): maybe, no, yes
-        - Family_support (str): fully supportive, not supportive, somewhat supportive
-        - Commit_daily (str): maybe, no, yes
-        - Comfortable_travelling (str): maybe, no, yes
-        - Earning_members_in_family (str): 1, 2, 3 or more
-        - Highest_education_in_family (str): college and higher, high school or equivalent, no formal education
-        - Severe_health_condition_in_family (str): no, yes
-        - Comfortable_using_technology (str): no, somewhat, yes
-        - Work_experience (str): no, yes
-        - Physical_health_condition_affect_participation (str): I have a minor condition..., no, yes
-        - Trust_in_program (str): neutral, strong, weak
-        """
-        # Expected model feature columns
-        model_features = [
-            'Age',
-            'Gender',
-            'Family_members',
-            'Daily_chores_completion',
-            'Group_activities_participation',
-            'Sports_or_team_games',
-            'Comfort_talking',
-            'Past_program_participation',
-            'reason_for_joining',
-            'Family_support',
-            'Commit_daily',
-            'Comfortable_travelling',
-            'Earning_members_in_family',
-            'Highest_education_in_family',
-            'Severe_health_condition_in_family',
-            'Comfortable_using_technology',
-            'Work_experience',
-            'Physical_health_condition_affect_participation',
-            'Trust_in_program'
-        ]
-        
-        # Create row dict with values directly from assessment data
-        # Data is expected to already have model feature names
-        row_dict = {}
-        for feature in model_features:
-            value = assessment_data.get(feature)
-            if value is not None:
-                # Age is numeric, keep as int
-                if feature == 'Age':
-                    row_dict[feature] = int(value) if isinstance(value, str) else value
-                # Sports and Comfort_talking are numeric categories
-                elif feature in ['Sports_or_team_games', 'Comfort_talking']:
-                    row_dict[feature] = int(value) if isinstance(value, str) else value
-                # Earning_members_in_family should be string
-                elif feature == 'Earning_members_in_family':
-                    row_dict[feature] = str(value).strip()
-                # All other categorical fields are strings
-                else:
-                    row_dict[feature] = str(value).strip()
+    def _bind_cache(self, model_fingerprint):
+        """
+        Adopt the loaded bundle's content fingerprint, invalidate cached
+        predictions if it changed and open the score table built for it
+        """
+        self.model_fingerprint = model_fingerprint
+        if self.model_version is None:
+            self.model_version = self.model_fingerprint
+        self.cache.reset(self.model_fingerprint)
+        self.score_table = self._open_score_table()
+    
+    def _open_score_table(self):
+        """Memory-map DROPOUT_SCORE_TABLE if it was built for the loaded model"""
+        if not DROPOUT_SCORE_TABLE or not Path(DROPOUT_SCORE_TABLE).exists():
+            return None
+        
+        try:
+            score_table = ScoreTable.open(DROPOUT_SCORE_TABLE)
+        except Exception as e:
+            logger.warning("Could not open score table %s: %s", DROPOUT_SCORE_TABLE, e)
+            return None
+        
+        if score_table.model_fingerprint != self.model_fingerprint:
+            logger.warning("Score table %s was built for another model, ignoring it", DROPOUT_SCORE_TABLE)
+            return None
         
-        return row_dict
+        logger.info("Score table loaded (%d cells)", score_table.header['size'])
+        return score_table
     
-    def _prepare_single_row(self, row_dict):
+    def _compile_engine(self):
         """
-        Create single-row dataframe in the correct column order
-        with proper data types and categories
+        Compile the booster's trees and verify them against native LightGBM
+        Returns None (keeping the native booster) if compilation or parity fails
         """
+        if self.booster is None:
+            return None
+        
         try:
-            # Create dataframe with all feature columns in correct order
-            X_new = pd.DataFrame([row_dict], columns=self.feature_columns)
-            
-            print(f"\nDEBUG: Initial row_dict keys: {row_dict.keys()}")
-            print(f"DEBUG: Feature columns expected: {self.feature_columns}")
-            print(f"DEBUG: Numeric columns: {self.num_cols}")
-            print(f"DEBUG: Categorical columns: {self.cat_cols}")
-            
-            # Ensure numeric cols are numeric
-            for c in self.num_cols:
-                if c in X_new.columns:
-                    X_new[c] = pd.to_numeric(X_new[c], errors="coerce")
-            
-            # Ensure categorical cols have the SAME categories as training
-            for c in self.cat_cols:
-                if c in X_new.columns:
-                    current_value = X_new[c].iloc[0]
-                    expected_categories = self.category_levels.get(c, [])
-                    
-                    # For numeric categories (like 1, 2, 3, 4, 5), ensure value is an int
-                    if isinstance(expected_categories, list) and len(expected_categories) > 0:
-                        if isinstance(expected_categories[0], int):
-                            X_new[c] = pd.to_numeric(X_new[c], errors="coerce")
-                            current_value = X_new[c].iloc[0]
-                    
-                    print(f"DEBUG: Column '{c}' - Current value: {current_value} (type: {type(current_value).__name__}), Expected categories: {expected_categories}")
-                    
-                    X_new[c] = X_new[c].astype("category")
-                    X_new[c] = X_new[c].cat.set_categories(expected_categories)
-            
-            return X_new
+            engine = CompiledEnsemble.from_booster(self.booster)
+            max_diff = check_parity(engine, self, self._parity_sample())
+            logger.info("Compiled model engine ready (max parity diff %.2g)", max_diff)
+            return engine
         except Exception as e:
-            print(f"Error preparing data: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Compiled model engine disabled: %s", e)
             return None
     
+    def _parity_sample(self, n_rows=2000, seed=0):
+        """
+        Encoded rows covering every category code, plus unknown answers
+        (NaN) and ages around the training range, for parity checks
+        """
+        rng = np.random.default_rng(seed)
+        X_sample = np.full((n_rows, self.encoder.width), np.nan)
+        for position, column in self.encoder.numeric_features:
+            X_sample[:, position] = rng.integers(16, 28, n_rows)
+        for position, column, codes, int_levels in self.encoder.categorical_features:
+            n_codes = len(set(codes.values()))
+            X_sample[:, position] = rng.integers(0, n_codes + 1, n_rows)
+            X_sample[X_sample[:, position] == n_codes, position] = np.nan
+        return X_sample
+    
+    def _engine_candidates(self):
+        """Existing compiled engines that may have been built from this bundle, nearest first"""
+        candidates = [engine_path_for(self.bundle_path)]
+        if DROPOUT_ENGINE_PATH:
+            candidates.append(Path(DROPOUT_ENGINE_PATH))
+        return [path for path in candidates if path.exists()]
+    
+    def _load_compiled_engine(self, engine_path, bundle_fingerprint):
+        """
+        Load a precompiled engine (see compiled_model.py) without lightgbm
+        Returns False, loading nothing, unless the engine was built from the
+        bundle with bundle_fingerprint (any engine will do when the bundle
+        itself isn't deployed)
+        """
+        try:
+            engine, metadata = CompiledEnsemble.load(str(engine_path))
+            built_from = metadata.get("bundle_fingerprint")
+            if bundle_fingerprint is not None and built_from != bundle_fingerprint:
+                logger.warning("Compiled engine %s was not built from %s, ignoring it", engine_path, self.bundle_path)
+                return False
+            self.engine = engine
+            self.engine_fingerprint = built_from or file_fingerprint(engine_path)
+            self.feature_columns = metadata["feature_columns"]
+            self.cat_cols = metadata["cat_cols"]
+            self.num_cols = metadata["num_cols"]
+            self.category_levels = metadata["category_levels"]
+            self.encoder = FeatureEncoder(
+                self.feature_columns, self.cat_cols, self.num_cols, self.category_levels
+            )
+            logger.info("Compiled model engine loaded from %s", engine_path)
+            return True
+        except Exception:
+            logger.exception("Error loading compiled model engine from %s", engine_path)
+            self.engine = None
+            self.engine_fingerprint = None
+            self.encoder = None
+            return False
+    
+    def _predict_proba_rows(self, X_rows):
+        """Dropout probability (class 1) for each encoded row"""
+        if self.engine is not None:
+            return self.engine.predict(X_rows)
+        if self.booster is not None:
+            return self.booster.predict(X_rows)
+        return self.model.predict_proba(X_rows)[:, 1]
+    
+    def predict_dropout_batch(self, assessments):
+        """
+        Predict dropout percentages for many assessments with a single
+        model call
+        Returns: list of dropout_percentage (0-100), in input order
+        """
+        results = [50] * len(assessments)  # Default middle value on error
+        if not assessments or self.encoder is None:
+            return results
+        
+        # Rows that fail to encode keep the default instead of failing the batch;
+        # rows in the score table or prediction cache are answered without the model
+        X_batch = np.full((len(assessments), self.encoder.width), np.nan)
+        positions = []
+        keys = []
+        failed_rows = 0
+        for i, assessment_data in enumerate(assessments):
+            X_row = X_batch[len(positions)]
+            try:
+                self.encoder.encode_into(X_row, assessment_data)
+            except Exception:
+                X_row[:] = np.nan
+                failed_rows += 1
+                continue
+            if self.score_table is not None:
+                tabled = self.score_table.lookup(X_row)
+                if tabled is not None:
+                    results[i] = tabled
+                    X_row[:] = np.nan
+                    continue
+            key = self.cache.key_for(X_row)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                X_row[:] = np.nan
+                continue
+            positions.append(i)
+            keys.append(key)
+        
+        if failed_rows:
+            logger.warning("Batch prediction: %d of %d rows could not be prepared", failed_rows, len(assessments))
+        
+        if not positions:
+            return results
+        
+        try:
+            dropout_probs = self._predict_proba_rows(X_batch[:len(positions)])
+        except Exception:
+            logger.exception("Error in batch prediction")
+            return results
+        
+        for i, key, dropout_prob in zip(positions, keys, dropout_probs):
+            results[i] = int(dropout_prob * 100)
+            self.cache.put(key, results[i])
+        return results
+    
     def predict_dropout_percentage(self, assessment_data):
         """
         Predict dropout percentage based on assessment responses
@@ -159,53 +397,43 @@ class DropoutPredictor:
         """
         
         try:
-            # Log raw input data
-            print("\n" + "="*100)
-            print("ML MODEL - RAW ASSESSMENT DATA RECEIVED FROM FRONTEND:")
-            print("="*100)
-            for key, value in assessment_data.items():
-                print(f"  {key}: {value} (type: {type(value).__name__})")
-            print("="*100 + "\n")
+            # Raw input dumps are sampled (LOG_PAYLOAD_SAMPLE) and off by default
+            if should_log_payload(payload_logger):
+                payload_logger.debug("Assessment data received: %s", ", ".join(
+                    f"{key}={value!r} ({type(value).__name__})" for key, value in assessment_data.items()
+                ))
             
-            # Prepare data
-            row_dict = self._prepare_data_for_prediction(assessment_data)
+            # Encode straight to the booster's row layout (no pandas on this path)
+            X_new = self.encoder.encode(assessment_data)
             
-            print("\n" + "="*100)
-            print("ML MODEL - DATA AFTER MAPPING TO MODEL FEATURES:")
-            print("="*100)
-            for key, value in row_dict.items():
-                print(f"  {key}: {value} (type: {type(value).__name__})")
-            print("="*100 + "\n")
+            # Precomputed and repeated answer combinations skip model evaluation entirely
+            if self.score_table is not None:
+                dropout_percentage = self.score_table.lookup(X_new[0])
+                if dropout_percentage is not None:
+                    return dropout_percentage
             
-            X_new = self._prepare_single_row(row_dict)
-            
-            print("\n" + "="*100)
-            print("DATAFRAME SENT TO MODEL:")
-            print("="*100)
-            pd.set_option("display.max_columns", None)
-            pd.set_option("display.width", None)
-            print(X_new)
-            print("\nDataFrame Shape:", X_new.shape)
-            print("DataTypes:")
-            print(X_new.dtypes)
-            print("="*100 + "\n")
+            cache_key = self.cache.key_for(X_new)
+            dropout_percentage = self.cache.get(cache_key)
+            if dropout_percentage is not None:
+                logger.debug("Prediction (cached): %d%% dropout risk", dropout_percentage)
+                return dropout_percentage
             
             # Get probability of dropout (class 1)
-            dropout_prob = self.model.predict_proba(X_new)[:, 1][0]
+            dropout_prob = self._predict_proba_rows(X_new)[0]
             dropout_percentage = int(dropout_prob * 100)
+            self.cache.put(cache_key, dropout_percentage)
             
-            print(f"ML Model Prediction: {dropout_percentage}% dropout risk")
+            logger.debug("Prediction: %d%% dropout risk", dropout_percentage)
             return dropout_percentage
             
-        except Exception as e:
-            print(f"Error in prediction: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in prediction")
             return 50  # Default middle value on error
            
     
    
-    def can_signup(self, dropout_percentage, threshold=100):
+    @staticmethod
+    def can_signup(dropout_percentage, threshold=100):
         """
         Determine if user can signup based on dropout percentage
         Returns False if dropout_percentage > threshold (default 70%)
@@ -213,15 +441,269 @@ class DropoutPredictor:
         return dropout_percentage <= threshold
 
 
-# Initialize global predictor instance
-predictor = DropoutPredictor()
+class ModelRegistry:
+    """
+    Directory of versioned model bundles
+    
+    Each bundle is stored as <version>.pkl. The active version is the one
+    named in the CURRENT file, or the most recently modified bundle if there
+    is no CURRENT file. An empty or missing directory falls back to the
+    original single bundle, versioned by its content fingerprint.
+    """
+    
+    def __init__(self, directory=DROPOUT_MODEL_DIR, legacy_path=LEGACY_BUNDLE_PATH):
+        self.directory = Path(directory)
+        self.legacy_path = Path(legacy_path)
+    
+    def versions(self):
+        """Available versions, oldest first"""
+        if not self.directory.is_dir():
+            return []
+        bundles = sorted(self.directory.glob('*.pkl'), key=lambda p: p.stat().st_mtime)
+        return [p.stem for p in bundles]
+    
+    def resolve(self, version=None):
+        """
+        (version, bundle_path) of the requested or active bundle
+        version is None for the legacy bundle
+        """
+        if version is None:
+            current_file = self.directory / 'CURRENT'
+            if current_file.exists():
+                version = current_file.read_text(encoding='utf-8').strip()
+            else:
+                versions = self.versions()
+                if not versions:
+                    return None, self.legacy_path
+                version = versions[-1]
+        
+        bundle_path = self.directory / f"{version}.pkl"
+        if not bundle_path.exists():
+            raise FileNotFoundError(f"Model version '{version}' not found in {self.directory}")
+        return version, bundle_path
+    
+    def set_current(self, version):
+        """Point CURRENT at a version (atomic rename, safe for concurrent readers)"""
+        self.resolve(version)
+        tmp_path = self.directory / 'CURRENT.tmp'
+        tmp_path.write_text(version + '\n', encoding='utf-8')
+        os.replace(tmp_path, self.directory / 'CURRENT')
+
+
+def validate_predictor(candidate, reference=None):
+    """
+    Check a freshly loaded predictor before it serves traffic
+    Raises ValueError if the bundle failed to load, was replaced while
+    loading, runs a compiled engine built from another bundle, doesn't accept the answers the current model
+    accepts, or can't produce a prediction
+    """
+    if candidate.encoder is None:
+        raise ValueError(f"Bundle {candidate.bundle_path} failed to load")
+    if candidate.bundle_path.exists():
+        # Recomputed rather than taken from the loader: the bundle may have
+        # been replaced while the candidate was loading
+        on_disk = file_fingerprint(candidate.bundle_path)
+        if candidate.model_fingerprint != on_disk:
+            raise ValueError(f"Bundle {candidate.bundle_path} changed while it was loading")
+        if candidate.engine is not None and candidate.engine_fingerprint != on_disk:
+            raise ValueError(f"Compiled engine was not built from {candidate.bundle_path}")
+    
+    if reference is not None and reference.encoder is not None:
+        if list(candidate.feature_columns) != list(reference.feature_columns):
+            raise ValueError("feature_columns differ from the active model")
+        if set(candidate.num_cols) != set(reference.num_cols):
+            raise ValueError("num_cols differ from the active model")
+        for column in reference.cat_cols:
+            missing = set(reference.category_levels.get(column, [])) - set(candidate.category_levels.get(column, []))
+            if column not in candidate.cat_cols or missing:
+                raise ValueError(f"category_levels for {column} no longer accept {sorted(missing, key=str)}")
+    
+    # Smoke prediction: every category level appears in at least one row
+    rows = []
+    longest = max((len(levels) for levels in candidate.category_levels.values()), default=1)
+    for i in range(longest):
+        row = {column: 21 for column in candidate.num_cols}
+        for column in candidate.cat_cols:
+            levels = candidate.category_levels.get(column, [])
+            if levels:
+                row[column] = levels[i % len(levels)]
+        rows.append(row)
+    X_rows = np.concatenate([candidate.encoder.encode(row) for row in rows])
+    probabilities = np.asarray(candidate._predict_proba_rows(X_rows))
+    if probabilities.shape != (len(rows),) or not np.all((probabilities >= 0) & (probabilities <= 1)):
+        raise ValueError("Smoke prediction returned invalid probabilities")
+
+
+registry = ModelRegistry()
+
+# Global predictor instance, created on first use (see get_predictor) and
+# replaced as a whole on reload, so in-flight requests finish on the old one
+_predictor = None
+_predictor_lock = threading.Lock()
+_reload_lock = threading.Lock()
+# Written by reloads and read by the watcher and the status route; guarded by _predictor_lock
+_reload_status = {'state': 'idle', 'last_reload_at': None, 'last_error': None}
+
+
+def _set_reload_status(**fields):
+    with _predictor_lock:
+        _reload_status.update(fields)
+
+
+def _get_reload_status():
+    with _predictor_lock:
+        return dict(_reload_status)
+
+
+def get_predictor():
+    """
+    Get the global predictor, loading the model bundle on first call
+    Importing this module stays cheap: joblib, lightgbm and pandas are only
+    imported here, so processes and routes that never predict don't pay for them
+    """
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                version, bundle_path = registry.resolve()
+                _predictor = DropoutPredictor(bundle_path, version)
+    return _predictor
+
+
+def reload_model(version=None, wait=False):
+    """
+    Load a bundle from the registry in the background, validate it and
+    swap it in atomically. version defaults to the registry's active one;
+    an explicit version also becomes CURRENT once it is live.
+    Returns the reload thread; wait=True joins it first.
+    """
+    thread = threading.Thread(target=_reload, args=(version,), name='model-reload', daemon=True)
+    thread.start()
+    if wait:
+        thread.join()
+    return thread
+
+
+def _reload(version=None):
+    global _predictor
+    if not _reload_lock.acquire(blocking=False):
+        logger.warning("Model reload already in progress")
+        return
+    
+    try:
+        _set_reload_status(state='loading')
+        requested = version
+        version, bundle_path = registry.resolve(version)
+        current = _predictor
+        if current is not None and version is not None and version == current.model_version:
+            _set_reload_status(state='idle', last_error=None)
+            return
+        
+        candidate = DropoutPredictor(bundle_path, version)
+        validate_predictor(candidate, current)
+        
+        with _predictor_lock:
+            _predictor = candidate
+        if requested is not None:
+            registry.set_current(requested)
+        _set_reload_status(state='idle', last_reload_at=time.time(), last_error=None)
+        logger.info("Model version %s is now active", candidate.model_version)
+    except Exception as e:
+        _set_reload_status(state='failed', last_error=str(e))
+        logger.warning("Model reload failed, keeping the active model: %s", e)
+    finally:
+        _reload_lock.release()
+
+
+def start_model_watcher(interval):
+    """
+    Poll the registry every interval seconds and reload when the active
+    version changes (new CURRENT or a newer bundle). Runs in a daemon thread
+    of the calling process, so pre-fork servers should start it per worker.
+    """
+    def watch():
+        rejected = None
+        while True:
+            time.sleep(interval)
+            try:
+                version, bundle_path = registry.resolve()
+                attempt = (version, bundle_path.stat().st_mtime_ns)
+            except Exception:
+                continue
+            active = _predictor
+            if active is None or attempt == rejected:
+                continue
+            if version is not None and version != active.model_version:
+                _reload(version)
+                rejected = attempt if _get_reload_status()['state'] == 'failed' else None
+    
+    thread = threading.Thread(target=watch, name='model-watcher', daemon=True)
+    thread.start()
+    return thread
+
+
+def get_model_status():
+    """Active model version, available versions and the last reload outcome"""
+    active = _predictor
+    return {
+        'active_version': active.model_version if active is not None else None,
+        'available_versions': registry.versions(),
+        **_get_reload_status(),
+    }
+
+
+def warm_up():
+    """
+    Load the model now instead of on the first prediction
+    
+    Call this in a pre-fork server's master process (e.g. from a gunicorn
+    app loaded with --preload, or set DROPOUT_PRELOAD=1 for app.py) so every
+    forked worker shares the loaded model pages copy-on-write. Freezing the
+    GC afterwards keeps the workers' collections from touching (and so
+    copying) those pages.
+    """
+    predictor = get_predictor()
+    gc.collect()
+    gc.freeze()
+    return predictor
+
+
+def __getattr__(name):
+    # Keep `from ml_model import predictor` working without loading at import time
+    if name == 'predictor':
+        return get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_dropout_percentage(assessment_data, return_version=False):
+    """
+    Public function to get dropout percentage
+    With return_version=True returns (dropout_percentage, model_version)
+    """
+    predictor = get_predictor()
+    dropout_percentage = predictor.predict_dropout_percentage(assessment_data)
+    if return_version:
+        return dropout_percentage, predictor.model_version
+    return dropout_percentage
+
+
+def get_dropout_batch(assessments, return_version=False):
+    """
+    Public function to get dropout percentages for many assessments
+    With return_version=True returns (dropout_percentages, model_version)
+    """
+    predictor = get_predictor()
+    dropout_percentages = predictor.predict_dropout_batch(assessments)
+    if return_version:
+        return dropout_percentages, predictor.model_version
+    return dropout_percentages
 
 
-def get_dropout_percentage(assessment_data):
-    """Public function to get dropout percentage"""
-    return predictor.predict_dropout_percentage(assessment_data)
+def get_prediction_cache_stats():
+    """Public function to get prediction cache hit/miss/eviction counters"""
+    return get_predictor().cache.stats()
 
 
 def can_user_signup(dropout_percentage, threshold=70):
     """Public function to check if user can signup (>70% = not eligible)"""
-    return predictor.can_signup(dropout_percentage, threshold)
+    return DropoutPredictor.can_signup(dropout_percentage, threshold)
@@ -0,0 +1,125 @@
+"""
+Rendered-page cache for pages that depend only on their template context
+The game and learning-module pages are 8-20 KB templates whose output is
+fixed by the language (and, for /games, the username), yet Jinja rendered
+them from scratch on every hit. PageCache.render() keeps the rendered
+bytes per (endpoint, template, context), together with gzip and, when the
+brotli package is installed, brotli variants compressed once at maximum
+level, and an ETag for each.
+
+A repeat view is a dictionary lookup and a stat of the template file; a
+browser revalidating its copy gets a 304. An entry is rebuilt as soon as
+its template's modification time changes, or the version callable given
+to PageCache returns something else: the app passes Assets.version, so a
+new asset build is never linked from pages rendered for the old one.
+
+Responses are private, revalidated every time (the pages sit behind a
+login), and vary on Accept-Encoding.
+
+Tunable from the environment:
+    PAGE_CACHE_ENTRIES   rendered pages kept (default 256)
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from flask import Response, render_template, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_CACHE_ENTRIES = int(os.environ.get('PAGE_CACHE_ENTRIES', '256'))
+# Below this, compressing saves less than the headers cost
+MIN_COMPRESS_SIZE = 512
+
+
+class CachedPage:
+    """One rendered page and its encoded variants, keyed by encoding"""
+
+    def __init__(self, body, mimetype, stamp):
+        self.stamp = stamp
+        self.mimetype = mimetype
+        etag = hashlib.sha256(body).hexdigest()[:20]
+        self.variants = {'identity': (body, etag)}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            self.variants['gzip'] = (gzip.compress(body, compresslevel=9, mtime=0), etag + '-gz')
+            if brotli is not None:
+                self.variants['br'] = (brotli.compress(body, quality=11), etag + '-br')
+
+    def etags(self):
+        return [etag for _, etag in self.variants.values()]
+
+
+class PageCache:
+    """LRU cache of rendered templates for one Flask app"""
+
+    def __init__(self, app, max_entries=PAGE_CACHE_ENTRIES, version=None):
+        self.app = app
+        self.max_entries = max_entries
+        self.version = version
+        self._pages = OrderedDict()
+        self._paths = {}
+        self._compiled = {}  # template name -> mtime Jinja's cache was last cleared for
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _template_mtime(self, template_name):
+        path = self._paths.get(template_name)
+        if path is None:
+            _, path, _ = self.app.jinja_loader.get_source(self.app.jinja_env, template_name)
+            self._paths[template_name] = path
+        return os.stat(path).st_mtime_ns
+
+    def _page(self, template_name, context):
+        key = (request.endpoint, template_name, tuple(sorted(context.items())))
+        mtime = self._template_mtime(template_name)
+        # What the rendered bytes depend on besides the key
+        stamp = (mtime, self.version() if self.version is not None else None)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None and page.stamp == stamp:
+                self._pages.move_to_end(key)
+                self.hits += 1
+                return page
+            # Jinja keeps compiled templates and, outside debug mode, never
+            # checks their files again; drop them so the edit is picked up,
+            # also by keys rendered for the first time after it
+            if self._compiled.get(template_name) != mtime:
+                if self.app.jinja_env.cache is not None:
+                    self.app.jinja_env.cache.clear()
+                self._compiled[template_name] = mtime
+        page = CachedPage(render_template(template_name, **context).encode('utf-8'), 'text/html', stamp)
+        with self._lock:
+            self.misses += 1
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return page
+
+    def render(self, template_name, **context):
+        """Response for template_name rendered with context, from the cache if possible"""
+        page = self._page(template_name, context)
+
+        offered = [encoding for encoding in ('br', 'gzip') if encoding in page.variants]
+        encoding = request.accept_encodings.best_match(offered, default='identity') if offered else 'identity'
+        body, etag = page.variants[encoding]
+
+        # Weakly: response_compression.py weakens the ETag of what it compresses
+        if any(request.if_none_match.contains_weak(tag) for tag in page.etags()):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype=page.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
@@ -0,0 +1,107 @@
+"""
+Password hashing off the request threads
+Hashing and checking passwords is deliberately slow. Done inline, a burst
+of logins at the start of a class occupied every worker thread, and even
+static game pages stalled behind them. Here the KDF runs in a fixed pool
+of PASSWORD_HASH_WORKERS threads; hashlib's scrypt and pbkdf2 release the
+GIL, so they run in parallel while other requests keep being served.
+
+Admission is bounded: at most PASSWORD_HASH_QUEUE requests wait for a
+worker, and a request that cannot get a place within PASSWORD_HASH_WAIT
+seconds gets PasswordHasherBusy (the app answers 503 with Retry-After)
+instead of queueing without limit.
+
+The KDF and its cost come from PASSWORD_METHOD, in Werkzeug's notation
+(e.g. scrypt:32768:8:1 or pbkdf2:sha256:600000). A login whose stored
+hash used other parameters is rehashed with the current ones, so the cost
+can be tuned against measured latency without a migration. Shorthands
+such as scrypt or pbkdf2:sha256 are compared by the full parameters
+Werkzeug expands them to, so they don't make every hash look stale.
+"""
+
+import logging
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_METHOD = os.environ.get('PASSWORD_METHOD', 'scrypt:32768:8:1')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(os.cpu_count() or 1, 4))))
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', str(PASSWORD_HASH_WORKERS * 8)))
+PASSWORD_HASH_WAIT = float(os.environ.get('PASSWORD_HASH_WAIT', '2.0'))
+
+
+class PasswordHasherBusy(Exception):
+    """Every worker is busy and the wait queue is full"""
+
+
+class PasswordHasher:
+    """
+    Bounded pool hashing and verifying passwords with one KDF setting
+    Like the other pools in the app, threads start on first use, once per
+    process.
+    """
+
+    def __init__(self, method=PASSWORD_METHOD, workers=PASSWORD_HASH_WORKERS,
+                 queue_size=PASSWORD_HASH_QUEUE, wait=PASSWORD_HASH_WAIT):
+        self.method = method
+        self.workers = workers
+        self.wait = wait
+        # One slot per running or queued job
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # Made up front, so the first unknown username costs one KDF run
+        # like every other; its prefix is the method with every parameter
+        # spelled out, as Werkzeug writes it into real hashes
+        self._dummy_hash = generate_password_hash(secrets.token_urlsafe(16), method=method)
+        self._prefix = self._dummy_hash.split('$', 1)[0]
+
+    def hash(self, password):
+        """A new hash of password with the current method"""
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def verify(self, stored_hash, password):
+        """(matches, needs_rehash) for a password against its stored hash"""
+        matches = self._run(check_password_hash, stored_hash, password)
+        return matches, matches and self.needs_rehash(stored_hash)
+
+    def verify_dummy(self, password):
+        """
+        Spend what verify() would for a user that does not exist
+        So a failed login takes as long whether or not the username is
+        real, and response times don't reveal which usernames exist.
+        """
+        self._run(check_password_hash, self._dummy_hash, password)
+        return False
+
+    def needs_rehash(self, stored_hash):
+        """Whether stored_hash was made with a method other than the current one"""
+        return stored_hash.split('$', 1)[0] != self._prefix
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=True)
+
+    def _run(self, function, *args, **kwargs):
+        if not self._slots.acquire(timeout=self.wait):
+            logger.warning("Password hashing saturated, refusing request")
+            raise PasswordHasherBusy()
+        try:
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+                    self._pid = os.getpid()
+                future = self._executor.submit(function, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
@@ -0,0 +1,178 @@
+"""
+Background previews for uploaded documents
+Phone-camera scans are often several MB; pages that show a document use a
+preview bounded to PREVIEW_MAX_SIZE pixels (the original itself when it is
+already small enough) and a THUMBNAIL_SIZE thumbnail instead. PDFs get the
+same from their first page.
+
+Processing runs in a pool of DOC_PROCESS_WORKERS threads after the upload
+has been recorded, so the request returns as soon as the file is stored.
+The outcome goes in documents.processing_status:
+
+    pending      queued, or running
+    done         preview_path and thumbnail_path are set
+    skipped      nothing to do: no imaging library for this file type
+    failed       the file could not be decoded
+
+Pillow and pypdfium2 are in requirements.txt; PyMuPDF renders PDFs
+instead when it is installed. An install without them still works, but
+documents are marked skipped and pages show an icon.
+
+Derived files are named after the object they come from (see
+documents.py), so a file uploaded twice is only processed once.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from db import connect
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+logger = logging.getLogger(__name__)
+
+DOC_PROCESS_WORKERS = int(os.environ.get('DOC_PROCESS_WORKERS', '2'))
+PREVIEW_MAX_SIZE = int(os.environ.get('PREVIEW_MAX_SIZE', '1600'))
+THUMBNAIL_SIZE = int(os.environ.get('THUMBNAIL_SIZE', '320'))
+PREVIEW_QUALITY = 85
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png'}
+
+
+def can_preview(extension):
+    """Whether the installed libraries can make previews for this file type"""
+    if Image is None:
+        return False
+    if extension == 'pdf':
+        return fitz is not None or pypdfium2 is not None
+    return extension in IMAGE_EXTENSIONS
+
+
+def _first_pdf_page(path):
+    """The first page of a PDF as a PIL image, rendered near PREVIEW_MAX_SIZE"""
+    if fitz is not None:
+        with fitz.open(path) as pdf:
+            page = pdf[0]
+            zoom = PREVIEW_MAX_SIZE / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        page = pdf[0]
+        width, height = page.get_size()
+        return page.render(scale=PREVIEW_MAX_SIZE / max(width, height)).to_pil()
+    finally:
+        pdf.close()
+
+
+def _save_jpeg(image, path):
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    tmp = path + '.tmp'
+    image.save(tmp, 'JPEG', quality=PREVIEW_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp, path)
+
+
+def render_previews(path, preview_path, thumbnail_path):
+    """
+    Write the preview and thumbnail for the file at path
+    Returns the preview's path: preview_path, or path itself for an image
+    already within PREVIEW_MAX_SIZE
+    """
+    extension = path.rsplit('.', 1)[-1].lower()
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    if extension == 'pdf':
+        image = _first_pdf_page(path)
+    else:
+        with Image.open(path) as source:
+            # JPEG can decode straight to a reduced size, far cheaper than full size
+            source.draft('RGB', (PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+            image = ImageOps.exif_transpose(source)
+            image.load()
+
+    with image:
+        if extension != 'pdf' and max(image.size) <= PREVIEW_MAX_SIZE:
+            preview = path
+        else:
+            image.thumbnail((PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE))
+            _save_jpeg(image, preview_path)
+            preview = preview_path
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        _save_jpeg(image, thumbnail_path)
+    return preview
+
+
+class PreviewWorker:
+    """
+    Pool of threads making document previews for one database file
+    Like ScoreWriter, the pool starts on first use, once per process.
+    """
+
+    def __init__(self, path, store, workers=DOC_PROCESS_WORKERS):
+        self.path = path
+        self.store = store
+        self.workers = workers
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def submit(self, doc_id, file_path):
+        """
+        Queue previews for a document recorded as pending; returns the Future
+        Callers check can_preview() first and record skipped documents
+        themselves.
+        """
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='doc-preview')
+                self._pid = os.getpid()
+            return self._executor.submit(self._process, doc_id, file_path)
+
+    def close(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=wait)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def _record(self, doc_id, status, preview_path=None, thumbnail_path=None):
+        self._connection().execute(
+            'UPDATE documents SET processing_status = ?, preview_path = ?, thumbnail_path = ? WHERE id = ?',
+            (status, preview_path, thumbnail_path, doc_id)
+        )
+
+    def _process(self, doc_id, file_path):
+        preview_path, thumbnail_path = self.store.derived_paths(file_path)
+        try:
+            if os.path.exists(thumbnail_path):
+                preview = preview_path if os.path.exists(preview_path) else file_path
+            else:
+                preview = render_previews(file_path, preview_path, thumbnail_path)
+        except Exception:
+            logger.exception("Could not make previews for document %s (%s)", doc_id, file_path)
+            self._record(doc_id, 'failed')
+            return False
+        self._record(doc_id, 'done', preview, thumbnail_path)
+        logger.debug("Previews ready for document %s", doc_id)
+        return True
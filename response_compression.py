@@ -0,0 +1,221 @@
+"""
+Compression for responses the app doesn't compress itself
+Dashboards, the leaderboard, the pre-assessment page and the JSON APIs
+were sent uncompressed, which hurts most on the 2G/3G connections many
+applicants use. CompressionMiddleware wraps the WSGI app and compresses
+a response in the best encoding the client accepts: brotli, then zstd,
+then gzip, the first two only when the brotli or zstandard package is
+installed.
+
+A response is left alone when it
+    - already has a Content-Encoding (pages from page_cache.py, bundles
+      from assets.py)
+    - is not text, JSON, JavaScript, XML or SVG (uploaded JPG/PNG/PDF)
+    - is smaller than COMPRESS_MIN_SIZE, or has no body (HEAD, 204, 304,
+      206, X-Sendfile and X-Accel-Redirect responses)
+    - says Cache-Control: no-transform
+
+Bodies of known length up to COMPRESS_BUFFER_SIZE are compressed in one
+piece and keep a Content-Length; anything larger, or streamed, is
+compressed chunk by chunk as the app produces it, in constant memory.
+Levels are set for dynamic content, where the CPU is spent on every
+request: a little better than each format's default ratio at a fraction
+of its maximum level's cost.
+
+A compressed response's ETag is made weak, as the bytes differ from the
+identity representation; Werkzeug's conditional handling compares
+If-None-Match weakly, so revalidation still ends in a 304.
+
+stats() reports responses and bytes before and after, per encoding, for
+this process.
+
+Tunable from the environment:
+    COMPRESS_MIN_SIZE      bytes (default 512)
+    COMPRESS_BUFFER_SIZE   bytes (default 256 KiB)
+    COMPRESS_GZIP_LEVEL    1-9 (default 6)
+    COMPRESS_BROTLI_LEVEL  0-11 (default 5)
+    COMPRESS_ZSTD_LEVEL    1-22 (default 6)
+"""
+
+import os
+import threading
+import zlib
+from itertools import chain
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header, parse_options_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '512'))
+COMPRESS_BUFFER_SIZE = int(os.environ.get('COMPRESS_BUFFER_SIZE', str(256 * 1024)))
+COMPRESS_LEVELS = {
+    'br': int(os.environ.get('COMPRESS_BROTLI_LEVEL', '5')),
+    'zstd': int(os.environ.get('COMPRESS_ZSTD_LEVEL', '6')),
+    'gzip': int(os.environ.get('COMPRESS_GZIP_LEVEL', '6')),
+}
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'}
+# Statuses whose body is empty or a byte range of the identity representation
+UNCOMPRESSIBLE_STATUSES = {204, 206, 304}
+
+
+def _gzip(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def _brotli(level):
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process, compressor.finish
+
+
+def _zstd(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return compressor.compress, compressor.flush
+
+
+# Encoders available here, in order of preference: (compress, finish) factories
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS['br'] = _brotli
+if zstandard is not None:
+    ENCODERS['zstd'] = _zstd
+ENCODERS['gzip'] = _gzip
+
+
+def is_compressible(mimetype):
+    return (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+            or mimetype.endswith('+json') or mimetype.endswith('+xml'))
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing eligible responses in a negotiated encoding"""
+
+    def __init__(self, app, min_size=COMPRESS_MIN_SIZE, buffer_size=COMPRESS_BUFFER_SIZE, levels=None):
+        self.app = app
+        self.min_size = min_size
+        self.buffer_size = buffer_size
+        self.levels = {**COMPRESS_LEVELS, **(levels or {})}
+        self._lock = threading.Lock()
+        self._totals = {}  # encoding -> [responses, bytes_in, bytes_out]
+
+    def __call__(self, environ, start_response):
+        captured = []
+        written = []
+        late = []
+
+        def capture(status, headers, exc_info=None):
+            if late:
+                # Called only once the body was iterated: too late to decide
+                return start_response(status, headers, exc_info)
+            captured[:] = [status, headers, exc_info]
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        if not captured:
+            late.append(True)
+            return app_iter
+
+        status, headers, exc_info = captured
+        headers = Headers(headers)
+        close = getattr(app_iter, 'close', None)
+        body = chain(written, app_iter) if written else app_iter
+        if not self._eligible(environ, status, headers):
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body if body is app_iter else ClosingIterator(body, close)
+
+        # Caches must keep one copy per encoding, whichever this client gets
+        vary = headers.get('Vary', '')
+        if 'accept-encoding' not in vary.lower():
+            headers['Vary'] = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+        encoding = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING')).best_match(list(ENCODERS))
+        if encoding is None:
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return body if body is app_iter else ClosingIterator(body, close)
+
+        length = headers.get('Content-Length', type=int)
+        if length is not None and length <= self.buffer_size:
+            try:
+                data = b''.join(body)
+            finally:
+                if close is not None:
+                    close()
+            compress, finish = ENCODERS[encoding](self.levels[encoding])
+            compressed = compress(data) + finish()
+            if len(compressed) >= len(data):
+                start_response(status, headers.to_wsgi_list(), exc_info)
+                return [data]
+            self._encode_headers(headers, encoding)
+            headers['Content-Length'] = str(len(compressed))
+            self._record(encoding, len(data), len(compressed))
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return [compressed]
+
+        self._encode_headers(headers, encoding)
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return ClosingIterator(self._stream(body, encoding), close)
+
+    def _eligible(self, environ, status, headers):
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return False
+        code = int(status.split(None, 1)[0])
+        if code < 200 or code in UNCOMPRESSIBLE_STATUSES:
+            return False
+        if any(name in headers for name in ('Content-Encoding', 'Content-Range', 'X-Sendfile', 'X-Accel-Redirect')):
+            return False
+        if 'no-transform' in headers.get('Cache-Control', ''):
+            return False
+        length = headers.get('Content-Length', type=int)
+        if length is not None and length < self.min_size:
+            return False
+        mimetype = parse_options_header(headers.get('Content-Type', ''))[0]
+        return is_compressible(mimetype)
+
+    @staticmethod
+    def _encode_headers(headers, encoding):
+        headers['Content-Encoding'] = encoding
+        headers.remove('Content-Length')
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = 'W/' + etag
+
+    def _stream(self, chunks, encoding):
+        compress, finish = ENCODERS[encoding](self.levels[encoding])
+        size_in = size_out = 0
+        for chunk in chunks:
+            size_in += len(chunk)
+            data = compress(chunk)
+            if data:
+                size_out += len(data)
+                yield data
+        data = finish()
+        size_out += len(data)
+        yield data
+        self._record(encoding, size_in, size_out)
+
+    def _record(self, encoding, size_in, size_out):
+        with self._lock:
+            totals = self._totals.setdefault(encoding, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += size_in
+            totals[2] += size_out
+
+    def stats(self):
+        """Compressed responses and bytes in, out and saved, in total and per encoding"""
+        with self._lock:
+            encodings = {encoding: {'responses': responses, 'bytes_in': size_in, 'bytes_out': size_out,
+                                    'bytes_saved': size_in - size_out}
+                         for encoding, (responses, size_in, size_out) in self._totals.items()}
+        totals = {key: sum(values[key] for values in encodings.values())
+                  for key in ('responses', 'bytes_in', 'bytes_out', 'bytes_saved')}
+        return {**totals, 'encodings': encodings, 'available': list(ENCODERS)}
@@ -0,0 +1,322 @@
+"""
+Precomputed dropout score table for the finite pre-assessment input space
+Every answer comes from a fixed set of levels, so the whole space of
+answer combinations can be scored offline and stored as one uint8 array
+indexed by a mixed-radix encoding of the answers. The array is opened
+memory-mapped, so worker processes share it through the page cache.
+
+Build it with:
+    python score_table.py build --output dropout_scores.npy
+then start the app with DROPOUT_SCORE_TABLE=dropout_scores.npy
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from compiled_model import CompiledEnsemble, _CategoricalBins
+from log_config import configure_logging
+
+# Cell value for combinations that were not scored (e.g. pinned out by --fix)
+NOT_SCORED = 255
+
+# Ages offered by the pre-assessment form
+DEFAULT_AGE_RANGE = (18, 25)
+
+
+class ScoreTable:
+    """
+    Read-only view of a built score table
+
+    Answers that scoring can't tell apart (the same bin for every split on
+    that feature) share one digit, so each feature's radix is the number
+    of distinct outcomes it can produce rather than its number of levels.
+    """
+
+    def __init__(self, scores, header):
+        self.scores = scores
+        self.header = header
+        self.model_fingerprint = header.get('model_fingerprint')
+        self._features = [
+            (f['position'], f['stride'], f['digits'], f['offset'], f['unknown_digit'])
+            for f in header['features']
+        ]
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a table written by build_score_table()"""
+        with open(_header_path(path), encoding='utf-8') as f:
+            header = json.load(f)
+        scores = np.load(path, mmap_mode='r')
+        if scores.shape != (header['size'],):
+            raise ValueError(f"Score table {path} does not match its header")
+        return cls(scores, header)
+
+    def index_of(self, X_row):
+        """Mixed-radix index of one encoded row, or None if it is outside the table"""
+        values = X_row.tolist()
+        index = 0
+        for position, stride, digits, offset, unknown_digit in self._features:
+            value = values[position]
+            if value != value:
+                digit = unknown_digit
+            else:
+                slot = int(value) - offset
+                if slot != value - offset or slot < 0 or slot >= len(digits):
+                    return None
+                digit = digits[slot]
+            if digit < 0:
+                return None
+            index += digit * stride
+        return index
+
+    def lookup(self, X_row):
+        """Precomputed dropout percentage for one encoded row, or None"""
+        index = self.index_of(X_row)
+        if index is None:
+            return None
+        score = int(self.scores[index])
+        return None if score == NOT_SCORED else score
+
+
+def _header_path(path):
+    return f"{path}.json"
+
+
+def _feature_nodes(ensemble, position):
+    """Internal nodes of the ensemble that split on a feature"""
+    n_nodes = len(ensemble.split_feature)
+    is_internal = ensemble.children[1::2] != np.arange(n_nodes)
+    return np.where(is_internal & (ensemble.split_feature == position))[0]
+
+
+def _signatures(ensemble, position, values):
+    """
+    Which way every split on the feature sends each value
+    Values with equal signatures always get the same score
+    """
+    values = np.asarray(values, dtype=np.float64)
+    feature_bins = ensemble.feature_bins[position]
+    if isinstance(feature_bins, _CategoricalBins):
+        bins = _CategoricalBins.bin_codes(values, feature_bins.n_categories)
+    elif feature_bins.used:
+        bins = feature_bins.bin_values(values)
+    else:
+        bins = np.zeros(len(values), dtype=np.intp)
+
+    left_bins = ensemble.left_bins[_feature_nodes(ensemble, position)].astype(object)
+    return [tuple((left_bins >> int(b)) & 1) for b in bins]
+
+
+def plan_domain(encoder, ensemble, age_range=DEFAULT_AGE_RANGE, include_unknown=False, fixed=None):
+    """
+    Lay out the mixed-radix index: for every feature, the answers covered,
+    the digit each one maps to and a representative encoded value per digit
+
+    fixed pins features to a single answer ({column: value}); other answers
+    of a pinned feature fall outside the table and are scored by the model.
+    include_unknown gives unknown/missing answers (NaN) their own digit
+    where they score differently from every known answer.
+    """
+    fixed = fixed or {}
+    features = []
+
+    slots = {}
+    for position, column in encoder.numeric_features:
+        slots[position] = (column, age_range[0], [float(v) for v in range(age_range[0], age_range[1] + 1)])
+    for position, column, codes, int_levels in encoder.categorical_features:
+        slots[position] = (column, 0, [float(c) for c in range(len(set(codes.values())))])
+
+    for position in sorted(slots):
+        column, offset, values = slots[position]
+        allowed = list(values)
+        if column in fixed:
+            pinned = np.full((1, encoder.width), np.nan)
+            encoder.encode_into(pinned[0], {column: fixed[column]})
+            if np.isnan(pinned[0, position]) or pinned[0, position] not in values:
+                raise ValueError(f"Cannot pin {column} to {fixed[column]!r}: not a known answer")
+            allowed = [pinned[0, position]]
+
+        signatures = _signatures(ensemble, position, values + [np.nan])
+        digit_of_signature = {}
+        representatives = []
+        digits = []
+        for value, signature in zip(values, signatures):
+            if value not in allowed:
+                digits.append(-1)
+                continue
+            if signature not in digit_of_signature:
+                digit_of_signature[signature] = len(representatives)
+                representatives.append(value)
+            digits.append(digit_of_signature[signature])
+
+        # NaN shares a digit when it scores like a known answer; otherwise it
+        # only gets its own digit on request
+        unknown_digit = digit_of_signature.get(signatures[-1], -1)
+        if unknown_digit < 0 and include_unknown and column not in fixed:
+            unknown_digit = len(representatives)
+            representatives.append(None)
+
+        features.append({
+            'position': position,
+            'column': column,
+            'offset': offset,
+            'digits': digits,
+            'unknown_digit': unknown_digit,
+            'representatives': representatives,
+            'radix': len(representatives),
+        })
+
+    # Last feature varies fastest
+    stride = 1
+    for feature in reversed(features):
+        feature['stride'] = stride
+        stride *= feature['radix']
+
+    return {'features': features, 'size': stride, 'width': encoder.width}
+
+
+def _decode_rows(header, start, stop):
+    """Encoded representative rows for table indexes start..stop-1"""
+    indexes = np.arange(start, stop, dtype=np.int64)
+    X_rows = np.full((len(indexes), header['width']), np.nan)
+    for feature in header['features']:
+        representatives = np.array(
+            [np.nan if v is None else v for v in feature['representatives']], dtype=np.float64
+        )
+        digits = (indexes // feature['stride']) % feature['radix']
+        X_rows[:, feature['position']] = representatives[digits]
+    return X_rows
+
+
+def _score_range(ensemble, header, output_path, start, stop, batch_size):
+    """Score one contiguous index range straight into the memory-mapped table"""
+    scores = np.load(output_path, mmap_mode='r+')
+    for batch_start in range(start, stop, batch_size):
+        batch_stop = min(batch_start + batch_size, stop)
+        probabilities = ensemble.predict(_decode_rows(header, batch_start, batch_stop))
+        scores[batch_start:batch_stop] = (probabilities * 100).astype(np.uint8)
+    scores.flush()
+    return stop - start
+
+
+def build_score_table(predictor, output_path, age_range=DEFAULT_AGE_RANGE, include_unknown=False,
+                      fixed=None, batch_size=65536, workers=1, dry_run=False):
+    """
+    Score the whole (or pinned) answer space and write it as a .npy table
+    plus a JSON header; returns the header
+    The header, which is what makes the table usable, is written only once
+    a spot check against the predictor passes. On a mismatch both files are
+    removed and ValueError is raised.
+    """
+    ensemble = predictor.engine or CompiledEnsemble.from_booster(predictor.booster)
+    header = plan_domain(predictor.encoder, ensemble, age_range, include_unknown, fixed)
+    header['model_fingerprint'] = predictor.model_fingerprint
+
+    radixes = ' x '.join(f"{f['column']}={f['radix']}" for f in header['features'] if f['radix'] > 1)
+    print(f"Score table: {header['size']:,} cells ({radixes})")
+    if dry_run:
+        return header
+
+    # A header left from an earlier build must not vouch for this table
+    _remove(_header_path(output_path))
+    scores = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.uint8, shape=(header['size'],))
+    scores[:] = NOT_SCORED
+    scores.flush()
+    del scores
+
+    started = time.time()
+    chunk = max(batch_size, -(-header['size'] // (workers * 16)))
+    ranges = [(s, min(s + chunk, header['size'])) for s in range(0, header['size'], chunk)]
+    args = [(ensemble, header, output_path, s, e, batch_size) for s, e in ranges]
+
+    done = 0
+    if workers > 1:
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            for scored in pool.starmap(_score_range, args):
+                done += scored
+    else:
+        for a in args:
+            done += _score_range(*a)
+            print(f"  {done:,}/{header['size']:,} cells ({time.time() - started:.0f}s)")
+
+    # Spot-check the table against the predictor's own model path
+    scores = np.load(output_path, mmap_mode='r')
+    rng = np.random.default_rng(0)
+    sample = rng.integers(0, header['size'], min(1000, header['size']))
+    X_sample = np.concatenate([_decode_rows(header, i, i + 1) for i in sample])
+    expected = (predictor._predict_proba_rows(X_sample) * 100).astype(np.uint8)
+    mismatches = int(np.sum(scores[sample] != expected))
+    del scores
+    if mismatches:
+        _remove(output_path)
+        raise ValueError(f"{mismatches} of {len(sample)} spot checks differ from the model; "
+                         f"removed {output_path}")
+
+    with open(_header_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(header, f)
+    print(f"[OK] Wrote {output_path} in {time.time() - started:.0f}s "
+          f"(all {len(sample)} spot checks match the model)")
+    return header
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='score the answer space into a memory-mapped table')
+    build.add_argument('--output', default='dropout_scores.npy')
+    build.add_argument('--age-min', type=int, default=DEFAULT_AGE_RANGE[0])
+    build.add_argument('--age-max', type=int, default=DEFAULT_AGE_RANGE[1])
+    build.add_argument('--include-unknown', action='store_true',
+                       help='also cover unknown/missing answers')
+    build.add_argument('--fix', action='append', default=[], metavar='COLUMN=VALUE',
+                       help='pin a feature to one answer (repeatable)')
+    build.add_argument('--batch-size', type=int, default=65536)
+    build.add_argument('--workers', type=int, default=1)
+    build.add_argument('--dry-run', action='store_true', help='only print the table size')
+
+    args = parser.parse_args(argv)
+
+    fixed = {}
+    for item in args.fix:
+        column, _, value = item.partition('=')
+        fixed[column] = value
+
+    configure_logging()
+    from ml_model import predictor
+    if predictor.encoder is None:
+        print("Model is not loaded, cannot build a score table")
+        return 1
+
+    try:
+        build_score_table(
+            predictor,
+            args.output,
+            age_range=(args.age_min, args.age_max),
+            include_unknown=args.include_unknown,
+            fixed=fixed,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            dry_run=args.dry_run,
+        )
+    except ValueError as e:
+        print(f"[FAILED] {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Write-behind ingestion for game scores
+/api/save-score hands score events to a ScoreWriter, which buffers them
+in memory and writes them from one background thread in batched
+executemany transactions: one commit (and one fsync) per batch instead of
+per game, and a single writer instead of every request queueing on
+SQLite's write lock.
+
+A batch is written when it reaches SCORE_BATCH_SIZE events or when its
+oldest event is SCORE_FLUSH_INTERVAL seconds old, whichever comes first.
+close() (registered with atexit by the app) writes everything still
+buffered, waiting at most its timeout and logging what it had to abandon.
+Events the writer cannot write, or that are still queued when it stops
+on an unexpected error, are logged one by one and counted as dropped.
+SCORE_WRITE_WAIT=1 makes submit() wait until the event's batch
+has committed, for deployments that prefer durability to latency.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from db import connect, transaction
+
+logger = logging.getLogger(__name__)
+
+SCORE_BATCH_SIZE = int(os.environ.get('SCORE_BATCH_SIZE', '500'))
+SCORE_FLUSH_INTERVAL = float(os.environ.get('SCORE_FLUSH_INTERVAL', '0.2'))
+# Buffered events beyond this are refused rather than growing memory without bound
+SCORE_MAX_PENDING = int(os.environ.get('SCORE_MAX_PENDING', '100000'))
+SCORE_WRITE_WAIT = os.environ.get('SCORE_WRITE_WAIT') == '1'
+
+INSERT_SCORE = 'INSERT INTO game_scores (user_id, game_name, score, created_at) VALUES (?, ?, ?, ?)'
+
+_STOP = object()
+
+
+class _ScoreEvent:
+    __slots__ = ('row', 'done', 'ok')
+
+    def __init__(self, row, done):
+        self.row = row
+        self.done = done
+        self.ok = False
+
+
+class ScoreWriter:
+    """
+    Buffered, batched writer of game_scores rows for one database file
+    The writer thread starts on the first submit(), so a pre-fork server
+    gets one per worker process rather than one in the master.
+    """
+
+    def __init__(self, path, batch_size=SCORE_BATCH_SIZE, interval=SCORE_FLUSH_INTERVAL,
+                 max_pending=SCORE_MAX_PENDING):
+        self.path = path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'written': 0, 'dropped': 0, 'batches': 0}
+
+    def submit(self, user_id, game_name, score, wait=SCORE_WRITE_WAIT, timeout=5.0):
+        """
+        Buffer one score event, stamped with the current time
+        Returns False if it was refused (buffer full, writer closed) or,
+        with wait=True, if it was not committed within timeout
+        """
+        created_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        event = _ScoreEvent((user_id, game_name, score, created_at), threading.Event() if wait else None)
+        if not self._put(event, timeout):
+            logger.warning("Score buffer full or closed, refusing score for user %s", user_id)
+            return False
+        with self._lock:
+            self._stats['submitted'] += 1
+        if event.done is None:
+            return True
+        return event.done.wait(timeout) and event.ok
+
+    def flush(self, timeout=10.0):
+        """Wait until every event submitted so far has been written"""
+        if self._thread is None:
+            return True
+        marker = threading.Event()
+        return self._put(marker, timeout) and marker.wait(timeout)
+
+    def close(self, timeout=10.0):
+        """Write everything still buffered and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Score writer still busy at close, abandoning %d buffered events", self._queue.qsize())
+            return
+        thread.join(max(deadline - time.monotonic(), 0))
+        if thread.is_alive():
+            logger.error("Score writer did not finish in %.1fs, abandoning about %d buffered events",
+                         timeout, self._queue.qsize())
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize() if self._queue is not None else 0
+        return stats
+
+    def _put(self, item, timeout):
+        with self._lock:
+            if self._closed:
+                return False
+            # Threads don't survive fork; a worker starts its own writer
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._queue = queue.Queue(maxsize=self.max_pending)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,),
+                                                name='score-writer', daemon=True)
+                self._thread.start()
+            buffer = self._queue
+        try:
+            buffer.put(item, timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self, buffer):
+        try:
+            conn = connect(self.path)
+        except Exception:
+            logger.exception("Score writer could not open %s", self.path)
+            self._abandon(buffer)
+            return
+        try:
+            stopping = False
+            while not stopping:
+                batch, markers = [], []
+                item = buffer.get()
+                deadline = time.monotonic() + self.interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        markers.append(item)
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = buffer.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                if batch:
+                    try:
+                        self._write(conn, batch)
+                    except Exception:
+                        logger.exception("Score write failed unexpectedly")
+                        self._drop(batch, 'write failed')
+                for marker in markers:
+                    marker.set()
+        finally:
+            conn.close()
+            # Whatever is still queued when the writer stops would be lost
+            # silently: the next submit() starts a new writer with a new queue
+            self._abandon(buffer)
+
+    def _abandon(self, buffer):
+        events = []
+        while True:
+            try:
+                item = buffer.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _ScoreEvent):
+                events.append(item)
+            elif isinstance(item, threading.Event):
+                item.set()
+        if events:
+            self._drop(events, 'writer stopped')
+
+    def _drop(self, events, reason):
+        for event in events:
+            logger.error("Dropping score event %r: %s", event.row, reason)
+            if event.done is not None:
+                event.done.set()
+        with self._lock:
+            self._stats['dropped'] += len(events)
+
+    def _write(self, conn, batch):
+        try:
+            with transaction(conn):
+                conn.executemany(INSERT_SCORE, [event.row for event in batch])
+            for event in batch:
+                event.ok = True
+        except sqlite3.Error:
+            # Retry one by one so a single bad event doesn't lose the batch
+            logger.exception("Batched score write failed, retrying %d events one by one", len(batch))
+            for event in batch:
+                try:
+                    with transaction(conn):
+                        conn.execute(INSERT_SCORE, event.row)
+                    event.ok = True
+                except sqlite3.Error as e:
+                    logger.error("Dropping score event %r: %s", event.row, e)
+
+        written = sum(event.ok for event in batch)
+        with self._lock:
+            self._stats['written'] += written
+            self._stats['dropped'] += len(batch) - written
+            self._stats['batches'] += 1
+        for event in batch:
+            if event.done is not None:
+                event.done.set()
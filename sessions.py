@@ -0,0 +1,232 @@
+"""
+Server-side sessions
+Flask's default session is a signed cookie holding every value, so the
+pre-assessment answers saved by /submit-pre-assessment travelled back,
+and had their signature checked, on every later request. Here the cookie
+holds only a random session id; the values live in a SessionStore:
+
+    SqliteStore   the sessions table in the app database (default)
+    MemoryStore   a dict in this process, for tests and single-process runs
+
+Sessions expire after SESSION_LIFETIME seconds without a visit, or after
+SESSION_ANON_LIFETIME if nobody ever logged in with them (abandoned
+pre-assessments). A session is only rewritten when it changes or when a
+tenth of its lifetime has passed since it was last written, so ordinary
+page views cost one primary-key read. Expired sessions are purged at most
+every SESSION_PURGE_INTERVAL seconds.
+
+Tunable from the environment:
+    SESSION_BACKEND         sqlite or memory (default sqlite)
+    SESSION_LIFETIME        seconds (default 14 days)
+    SESSION_ANON_LIFETIME   seconds (default 1 day)
+    SESSION_PURGE_INTERVAL  seconds (default 600)
+"""
+
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sqlite')
+SESSION_LIFETIME = int(os.environ.get('SESSION_LIFETIME', str(14 * 24 * 3600)))
+SESSION_ANON_LIFETIME = int(os.environ.get('SESSION_ANON_LIFETIME', str(24 * 3600)))
+SESSION_PURGE_INTERVAL = int(os.environ.get('SESSION_PURGE_INTERVAL', '600'))
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session values loaded from a store, tracking whether they changed"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = sid is None
+        self.modified = False
+        self.replaced_sid = None
+
+    def regenerate(self):
+        """
+        Move the values to a new id and drop the old one
+        Called on login, so an id planted before login is useless after it
+        """
+        if self.sid is not None and self.replaced_sid is None:
+            self.replaced_sid = self.sid
+        self.sid = None
+        self.modified = True
+
+
+class SessionStore(ABC):
+    """Where session data lives; expires_at and now are Unix timestamps"""
+
+    @abstractmethod
+    def load(self, sid, now):
+        """(data, expires_at) for a live session, else None"""
+
+    @abstractmethod
+    def save(self, sid, data, expires_at):
+        pass
+
+    @abstractmethod
+    def delete(self, sid):
+        pass
+
+    @abstractmethod
+    def purge(self, now):
+        """Delete expired sessions, returning how many there were"""
+
+
+class MemoryStore(SessionStore):
+    """Sessions in a dict, private to this process"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def load(self, sid, now):
+        record = self._sessions.get(sid)
+        if record is None or record[1] <= now:
+            return None
+        return record
+
+    def save(self, sid, data, expires_at):
+        with self._lock:
+            self._sessions[sid] = (data, expires_at)
+
+    def delete(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def purge(self, now):
+        with self._lock:
+            expired = [sid for sid, (_, expires_at) in self._sessions.items() if expires_at <= now]
+            for sid in expired:
+                del self._sessions[sid]
+        return len(expired)
+
+
+class SqliteStore(SessionStore):
+    """Sessions in the sessions table, on connections from a ConnectionPool"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def _execute(self, sql, params):
+        conn = self.pool.acquire()
+        try:
+            return conn.execute(sql, params)
+        finally:
+            self.pool.release(conn)
+
+    def load(self, sid, now):
+        conn = self.pool.acquire()
+        try:
+            row = conn.execute('SELECT data, expires_at FROM sessions WHERE id = ? AND expires_at > ?',
+                               (sid, now)).fetchone()
+        finally:
+            self.pool.release(conn)
+        return (row['data'], row['expires_at']) if row else None
+
+    def save(self, sid, data, expires_at):
+        self._execute(
+            '''INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at''',
+            (sid, data, expires_at)
+        )
+
+    def delete(self, sid):
+        self._execute('DELETE FROM sessions WHERE id = ?', (sid,))
+
+    def purge(self, now):
+        return self._execute('DELETE FROM sessions WHERE expires_at <= ?', (now,)).rowcount
+
+
+def create_store(backend=SESSION_BACKEND, pool=None):
+    """The SessionStore named by SESSION_BACKEND"""
+    if backend == 'memory':
+        return MemoryStore()
+    if backend == 'sqlite':
+        return SqliteStore(pool)
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}")
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface keeping values in a SessionStore
+    Sessions holding anon_key (the logged-in user's id) get lifetime,
+    the rest anon_lifetime
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, lifetime=SESSION_LIFETIME, anon_lifetime=SESSION_ANON_LIFETIME,
+                 purge_interval=SESSION_PURGE_INTERVAL, anon_key='user_id'):
+        self.store = store
+        self.lifetime = lifetime
+        self.anon_lifetime = anon_lifetime
+        self.purge_interval = purge_interval
+        self.anon_key = anon_key
+        self._next_purge = 0
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            record = self.store.load(sid, int(time.time()))
+            if record is not None:
+                data, expires_at = record
+                return ServerSession(self.serializer.loads(data), sid, expires_at)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        now = int(time.time())
+
+        if session.replaced_sid is not None:
+            self.store.delete(session.replaced_sid)
+
+        if not session:
+            # Emptied (logout): forget it on both sides
+            if not session.new or session.replaced_sid is not None:
+                if session.sid is not None:
+                    self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        lifetime = self.lifetime if self.anon_key in session else self.anon_lifetime
+        expires_at = now + lifetime
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+        elif not session.modified and expires_at - session.expires_at < lifetime // 10:
+            return
+
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), expires_at)
+        session.expires_at = expires_at
+        response.set_cookie(
+            name, session.sid,
+            expires=datetime.fromtimestamp(expires_at, timezone.utc),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add('Cookie')
+
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            purged = self.store.purge(now)
+            if purged:
+                logger.info("Purged %d expired sessions", purged)
@@ -0,0 +1,114 @@
+"""
+Skill profile for /skill-performance
+Each game exercises a few skill areas. A user's standing in a game is
+read from skill_stats, the per-user, per-game aggregates maintained by
+triggers on game_scores (see migrations.py), so building a profile costs
+one indexed query however many games the user has played, and the page
+receives a few numbers per game instead of the raw score history.
+
+A skill's score is the mean cohort percentile of the games behind it that
+the user has played.
+"""
+
+import json
+
+from migrations import SKILL_RECENT_PLAYS
+
+SKILL_AREAS = [
+    {
+        'name': 'Problem-Solving',
+        'emoji': '🧩',
+        'description': 'Navigate complex challenges',
+        'games': ['Grid Escape+', 'Chart Detective', 'Number Guess'],
+    },
+    {
+        'name': 'Analytical Reasoning',
+        'emoji': '🧠',
+        'description': 'Infer patterns and relationships',
+        'games': ['Pattern Lock 2.0', 'Chart Detective', 'Number Guess'],
+    },
+    {
+        'name': 'Abstract Thinking',
+        'emoji': '💡',
+        'description': 'Think conceptually',
+        'games': ['Pattern Lock 2.0', 'Grid Escape+'],
+    },
+    {
+        'name': 'Data Interpretation',
+        'emoji': '📈',
+        'description': 'Read and analyze data',
+        'games': ['Chart Detective'],
+    },
+    {
+        'name': 'Verbal Reasoning',
+        'emoji': '🗣️',
+        'description': 'Logic and communication',
+        'games': ['Pattern Lock 2.0', 'Chart Detective', 'Quick Trivia'],
+    },
+    {
+        'name': 'Spatial Reasoning',
+        'emoji': '🗺️',
+        'description': 'Navigate and visualize space',
+        'games': ['Grid Escape+', 'Memory Match'],
+    },
+]
+
+GAMES = ['Number Guess', 'Memory Match', 'Quick Trivia', 'Grid Escape+', 'Pattern Lock 2.0', 'Chart Detective']
+
+
+def trend(scores):
+    """Least-squares slope of scores against play number, in points per play"""
+    n = len(scores)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(scores) / n
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(scores))
+    variance = sum((x - mean_x) ** 2 for x in range(n))
+    return covariance / variance
+
+
+def game_stats(conn, user_id):
+    """
+    Per-game aggregates for one user, keyed by game name
+    The percentile ranks the user's best score among everyone who has
+    played the game, counting ties as half below
+    """
+    rows = conn.execute(
+        '''SELECT s.game_name, s.plays, s.best, s.total_score, s.recent,
+            (SELECT COUNT(*) FROM skill_stats o WHERE o.game_name = s.game_name AND o.best < s.best) AS below,
+            (SELECT COUNT(*) FROM skill_stats o WHERE o.game_name = s.game_name AND o.best = s.best) AS tied,
+            (SELECT COUNT(*) FROM skill_stats o WHERE o.game_name = s.game_name) AS cohort
+        FROM skill_stats s
+        WHERE s.user_id = ?''',
+        (user_id,)
+    ).fetchall()
+
+    stats = {}
+    for row in rows:
+        recent = json.loads(row['recent'])
+        stats[row['game_name']] = {
+            'plays': row['plays'],
+            'best': row['best'],
+            'mean': round(row['total_score'] / row['plays'], 1),
+            'percentile': round((row['below'] + row['tied'] / 2) / row['cohort'] * 100),
+            'trend': round(trend(recent), 2),
+            'recent': recent,
+        }
+    return stats
+
+
+def skill_profile(conn, user_id):
+    """
+    Skill scores (0-100) and per-game stats for the skill performance page
+    Games are listed in GAMES order, followed by any the map doesn't know
+    """
+    stats = game_stats(conn, user_id)
+    skills = []
+    for area in SKILL_AREAS:
+        played = [stats[game]['percentile'] for game in area['games'] if game in stats]
+        skills.append(dict(area, score=round(sum(played) / len(played)) if played else 0))
+
+    order = sorted(stats, key=lambda game: GAMES.index(game) if game in GAMES else len(GAMES))
+    games = [dict(stats[game], name=game) for game in order]
+    return {'skills': skills, 'games': games, 'recent_plays': SKILL_RECENT_PLAYS}
@@ -0,0 +1,71 @@
+// Rating scale functionality
+document.querySelectorAll('.rating-scale').forEach(scale => {
+    scale.querySelectorAll('.rating-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            e.preventDefault();
+            scale.querySelectorAll('.rating-btn').forEach(b => b.classList.remove('selected'));
+            btn.classList.add('selected');
+
+            const scaleId = scale.id;
+            const inputId = scaleId.replace('Rating', 'RatingValue');
+            document.getElementById(inputId).value = btn.dataset.value;
+        });
+    });
+});
+
+// Form submission
+document.getElementById('assessmentForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const formData = new FormData(document.getElementById('assessmentForm'));
+    const data = Object.fromEntries(formData);
+
+    // Validate required fields
+    if (!data.sportsRating || !data.communicationRating) {
+        alert('Please complete all required fields');
+        return;
+    }
+
+    document.getElementById('loading').style.display = 'block';
+
+    try {
+        const response = await fetch('/submit-assessment', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            document.getElementById('successMessage').style.display = 'block';
+            setTimeout(() => {
+                window.location.href = '/dashboard';
+            }, 2000);
+        } else {
+            alert('Error: ' + result.error);
+        }
+    } catch (error) {
+        alert('Error submitting assessment: ' + error);
+    } finally {
+        document.getElementById('loading').style.display = 'none';
+    }
+});
+
+// Skip assessment
+function skipAssessment() {
+    if (confirm('Are you sure you want to skip this assessment?')) {
+        fetch('/skip-assessment', {method: 'POST'}).then(() => {
+            window.location.href = '/dashboard';
+        });
+    }
+}
+
+// Update progress bar as user scrolls through form
+window.addEventListener('scroll', () => {
+    const form = document.getElementById('assessmentForm');
+    const scrollTop = window.scrollY;
+    const docHeight = document.documentElement.scrollHeight - window.innerHeight;
+    const scrollPercent = scrollTop / docHeight;
+    document.getElementById('progressFill').style.width = (scrollPercent * 100) + '%';
+});
@@ -0,0 +1,256 @@
+let gameState = {
+    score: 0,
+    currentCase: 0,
+    correctAnswers: 0,
+    totalCases: 5,
+    selectedAnswer: null,
+    cases: []
+};
+
+const casesBank = [
+    {
+        title: 'Sales Performance Analysis',
+        brief: 'Our Q1-Q4 sales data shows seasonal patterns. Q1 had 50 units, Q2 had 75 units, Q3 had 60 units, and Q4 had 90 units. Which quarter had the median sales?',
+        charts: {
+            type: 'bar',
+            data: [
+                { label: 'Q1', value: 50 },
+                { label: 'Q2', value: 75 },
+                { label: 'Q3', value: 60 },
+                { label: 'Q4', value: 90 }
+            ]
+        },
+        question: 'What is the median quarterly sales?',
+        answers: ['65 units', '70 units', '60 units', '75 units'],
+        correct: 0
+    },
+    {
+        title: 'Student Performance Tracking',
+        brief: 'A teacher recorded test scores: Math 85, Science 92, English 78, History 88. Calculate the average score.',
+        charts: {
+            type: 'table',
+            data: [
+                { subject: 'Math', score: 85 },
+                { subject: 'Science', score: 92 },
+                { subject: 'English', score: 78 },
+                { subject: 'History', score: 88 }
+            ]
+        },
+        question: 'What is the average score across all subjects?',
+        answers: ['85.75', '88', '86.75', '87'],
+        correct: 0
+    },
+    {
+        title: 'Product Revenue Growth',
+        brief: 'Product A revenue: Jan $1000, Feb $1500, Mar $2000, Apr $2500. Which period shows the highest growth percentage?',
+        charts: {
+            type: 'bar',
+            data: [
+                { label: 'Jan', value: 1000 },
+                { label: 'Feb', value: 1500 },
+                { label: 'Mar', value: 2000 },
+                { label: 'Apr', value: 2500 }
+            ]
+        },
+        question: 'What is the growth rate from Jan to Apr?',
+        answers: ['150%', '250%', '200%', '120%'],
+        correct: 0
+    },
+    {
+        title: 'Employee Attendance Report',
+        brief: 'Monday: 95 employees, Tuesday: 93, Wednesday: 94, Thursday: 92, Friday: 91. Which statement best fits?',
+        charts: {
+            type: 'table',
+            data: [
+                { day: 'Monday', count: 95 },
+                { day: 'Tuesday', count: 93 },
+                { day: 'Wednesday', count: 94 },
+                { day: 'Thursday', count: 92 },
+                { day: 'Friday', count: 91 }
+            ]
+        },
+        question: 'What trend is shown in the attendance data?',
+        answers: ['Declining trend throughout week', 'Stable attendance', 'Increasing trend', 'No pattern'],
+        correct: 0
+    },
+    {
+        title: 'Budget Allocation Analysis',
+        brief: 'Monthly expenses: Marketing $5000, Operations $8000, R&D $6000, Admin $3000. What percentage is R&D?',
+        charts: {
+            type: 'table',
+            data: [
+                { department: 'Marketing', expense: 5000 },
+                { department: 'Operations', expense: 8000 },
+                { department: 'R&D', expense: 6000 },
+                { department: 'Admin', expense: 3000 }
+            ]
+        },
+        question: 'R&D is what percentage of total budget?',
+        answers: ['25%', '30%', '35%', '20%'],
+        correct: 0
+    }
+];
+
+function initGame() {
+    gameState.cases = casesBank;
+    loadCase();
+}
+
+function loadCase() {
+    if (gameState.currentCase >= gameState.cases.length) {
+        endGame();
+        return;
+    }
+
+    gameState.selectedAnswer = null;
+    const caseData = gameState.cases[gameState.currentCase];
+
+    let chartHTML = '';
+    if (caseData.charts.type === 'bar') {
+        chartHTML = `
+            <div class="chart-box">
+                <h4>Quarterly Data</h4>
+                <div class="bar-chart">
+                    ${caseData.charts.data.map(item => {
+                        const maxValue = Math.max(...caseData.charts.data.map(d => d.value));
+                        const height = (item.value / maxValue) * 120;
+                        return `
+                            <div class="bar">
+                                <div class="bar-fill" style="height: ${height}px;"></div>
+                                <div class="bar-label">${item.label}: ${item.value}</div>
+                            </div>
+                        `;
+                    }).join('')}
+                </div>
+            </div>
+        `;
+    } else {
+        chartHTML = `
+            <div class="chart-box">
+                <h4>Data Table</h4>
+                <table class="table-chart">
+                    <thead>
+                        <tr>
+                            ${Object.keys(caseData.charts.data[0]).map(key => `<th>${key}</th>`).join('')}
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${caseData.charts.data.map(row => `
+                            <tr>
+                                ${Object.values(row).map(val => `<td>${val}</td>`).join('')}
+                            </tr>
+                        `).join('')}
+                    </tbody>
+                </table>
+            </div>
+        `;
+    }
+
+    const caseHTML = `
+        <div class="case-brief">
+            <h3>📁 Case ${gameState.currentCase + 1}: ${caseData.title}</h3>
+            <p>${caseData.brief}</p>
+        </div>
+
+        <div class="chart-container">
+            ${chartHTML}
+        </div>
+
+        <div class="question-container">
+            <div class="question-type">DATA REASONING</div>
+            <div class="question-text">${caseData.question}</div>
+            <div class="options">
+                ${caseData.answers.map((answer, idx) => `
+                    <div class="option" onclick="selectAnswer(${idx})">${answer}</div>
+                `).join('')}
+            </div>
+        </div>
+    `;
+
+    document.getElementById('caseContent').innerHTML = caseHTML;
+    document.getElementById('submitBtn').disabled = true;
+}
+
+function selectAnswer(index) {
+    document.querySelectorAll('.option').forEach(opt => opt.classList.remove('selected'));
+    document.querySelectorAll('.option')[index].classList.add('selected');
+    gameState.selectedAnswer = index;
+    document.getElementById('submitBtn').disabled = false;
+}
+
+function submitAnswer() {
+    if (gameState.selectedAnswer === null) return;
+
+    const caseData = gameState.cases[gameState.currentCase];
+    const options = document.querySelectorAll('.option');
+
+    if (gameState.selectedAnswer === caseData.correct) {
+        gameState.score += 200;
+        gameState.correctAnswers++;
+        options[gameState.selectedAnswer].classList.add('correct');
+    } else {
+        options[gameState.selectedAnswer].classList.add('incorrect');
+        options[caseData.correct].classList.add('correct');
+    }
+
+    document.getElementById('submitBtn').disabled = true;
+
+    setTimeout(() => {
+        gameState.currentCase++;
+        document.getElementById('caseCount').textContent = gameState.currentCase;
+        document.getElementById('scoreDisplay').textContent = gameState.score;
+        loadCase();
+    }, 1500);
+}
+
+function skipCase() {
+    gameState.currentCase++;
+    document.getElementById('caseCount').textContent = gameState.currentCase;
+    loadCase();
+}
+
+function endGame() {
+    const modal = document.getElementById('endModal');
+    document.getElementById('finalStats').textContent = `${gameState.correctAnswers}/${gameState.totalCases} Cases Solved`;
+    document.getElementById('finalScore').textContent = gameState.score;
+    modal.classList.add('show');
+
+    saveScore(gameState.score);
+}
+
+function restartGame() {
+    gameState = {
+        score: 0,
+        currentCase: 0,
+        correctAnswers: 0,
+        totalCases: 5,
+        selectedAnswer: null,
+        cases: casesBank
+    };
+    document.getElementById('endModal').classList.remove('show');
+    initGame();
+}
+
+function goToGames() {
+    window.location.href = '/games';
+}
+
+async function saveScore(score) {
+    try {
+        const response = await fetch('/api/save-score', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                game_name: 'Chart Detective',
+                score: score,
+                skills: ['Data Interpretation', 'Verbal Reasoning', 'Analytical Reasoning']
+            })
+        });
+        const data = await response.json();
+        console.log('Score saved:', data);
+    } catch (error) {
+        console.error('Error saving score:', error);
+    }
+}
+
+window.addEventListener('load', initGame);
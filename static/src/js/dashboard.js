@@ -0,0 +1,84 @@
+function toggleDropdown() {
+    document.getElementById('dropdownMenu').classList.toggle('show');
+}
+
+// Close dropdown when clicking outside
+window.onclick = function(event) {
+    if (!event.target.matches('.profile-btn')) {
+        const dropdowns = document.getElementsByClassName('dropdown-content');
+        for (let i = 0; i < dropdowns.length; i++) {
+            if (dropdowns[i].classList.contains('show')) {
+                dropdowns[i].classList.remove('show');
+            }
+        }
+    }
+}
+
+// Language translations; username and pageLang are set by the page
+const translations = {
+    'en': {
+        'welcome_user': 'Welcome, {username}!',
+        'profile': '👤 Profile',
+        'user_details': '👤 User Details',
+        'upload_documents': '📄 Upload Documents',
+        'logout': '🚪 Logout',
+        'dashboard_title': 'Dashboard',
+        'dashboard_welcome': 'Welcome to Hexecutioners! You have successfully logged in. While you wait for your class to start, enjoy some quick games to keep yourself engaged and have fun.',
+        'play_games': '🎮 Play Games',
+        'learn_modules': '📚 Learn Modules',
+        'leaderboard': '🏆 Leaderboard',
+        'skill_performance': '📊 Skill Performance'
+    },
+    'hi': {
+        'welcome_user': 'स्वागत है, {username}!',
+        'profile': '👤 प्रोफ़ाइल',
+        'user_details': '👤 उपयोगकर्ता विवरण',
+        'upload_documents': '📄 दस्तावेज़ अपलोड करें',
+        'logout': '🚪 लॉगआउट',
+        'dashboard_title': 'डैशबोर्ड',
+        'dashboard_welcome': 'Hexecutioners में आपका स्वागत है! आपने सफलतापूर्वक लॉग इन किया है। अपनी कक्षा शुरू होने तक इंतजार करते समय, खुद को व्यस्त और मज़ेदार रखने के लिए कुछ त्वरित गेम खेलें।',
+        'play_games': '🎮 गेम खेलें',
+        'learn_modules': '📚 सीखने के मॉड्यूल',
+        'leaderboard': '🏆 लीडरबोर्ड',
+        'skill_performance': '📊 कौशल प्रदर्शन'
+    },
+    'kn': {
+        'welcome_user': 'ಸ್ವಾಗತ, {username}!',
+        'profile': '👤 ಪ್ರೊಫೈಲ್',
+        'user_details': '👤 ಬಳಕೆದಾರ ವಿವರಗಳು',
+        'upload_documents': '📄 ದಾಖಲೆಗಳನ್ನು ಅಪ್‌ಲೋಡ್ ಮಾಡಿ',
+        'logout': '🚪 ಲಾಗ್‌ಔಟ್',
+        'dashboard_title': 'ಡ್ಯಾಶ್‌ಬೋರ್ಡ್',
+        'dashboard_welcome': 'Hexecutioners ಗೆ ಸ್ವಾಗತ! ನೀವು ಯಶಸ್ವಿಯಾಗಿ ಲಾಗ್ ಇನ್ ಮಾಡಿದ್ದೀರಿ. ನಿಮ್ಮ ತರಗತಿ ಪ್ರಾರಂಭವಾಗುವವರೆಗೆ ಕಾಯುತ್ತಿರುವಾಗ, ನಿಮ್ಮನ್ನು ತೊಡಗಿಸಿಕೊಳ್ಳಲು ಮತ್ತು ಮೋಜು ಮಾಡಲು ಕೆಲವು ತ್ವರಿತ ಆಟಗಳನ್ನು ಆಡಿ.',
+        'play_games': '🎮 ಆಟಗಳನ್ನು ಆಡಿ',
+        'learn_modules': '📚 ಕಲಿಕೆ ಮಾಡ್ಯೂಲ್‌ಗಳು',
+        'leaderboard': '🏆 ಲೀಡರ್‌ಬೋರ್ಡ್',
+        'skill_performance': '📊 ಕೌಶಲ್ಯ ಕಾರ್ಯಕ್ಷಮತೆ'
+    }
+};
+
+function changeLanguage(lang) {
+    localStorage.setItem('selectedLanguage', lang);
+    document.querySelectorAll('[data-translate]').forEach(element => {
+        const key = element.getAttribute('data-translate');
+        if (translations[lang] && translations[lang][key]) {
+            element.textContent = translations[lang][key].replace('{username}', username);
+        }
+    });
+
+    // Update language in session via AJAX
+    fetch('/change-language', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ language: lang })
+    });
+}
+
+// Initialize language on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedLang = localStorage.getItem('selectedLanguage') || pageLang;
+    document.getElementById('languageSelector').value = savedLang;
+    changeLanguage(savedLang);
+});
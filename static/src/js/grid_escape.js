@@ -0,0 +1,238 @@
+const GRID_SIZES = { 1: 5, 2: 6, 3: 7 };
+const SKILL_AREAS = ['Problem-Solving', 'Analytical Reasoning', 'Abstract Thinking', 'Data Interpretation'];
+
+let gameState = {
+    difficulty: 1,
+    level: 1,
+    gridSize: 5,
+    moves: 0,
+    score: 0,
+    currentPos: { x: 0, y: 0 },
+    visited: new Set(['0,0']),
+    grid: [],
+    gameOver: false,
+    startPos: { x: 0, y: 0 },
+    exitPos: null
+};
+
+let gameLogic = {
+    redTileRule: "Red tiles and their neighbors cannot be consecutive moves",
+    chartTileRule: "Chart tiles only open if value meets condition",
+    transformRule: "Transform tiles change board orientation"
+};
+
+function initGame() {
+    generateGrid();
+    renderGrid();
+    updateUI();
+    loadClues();
+}
+
+function setDifficulty(level) {
+    document.querySelectorAll('.difficulty-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+    gameState.difficulty = level;
+    gameState.gridSize = GRID_SIZES[level];
+    resetGame();
+}
+
+function generateGrid() {
+    const size = gameState.gridSize;
+    gameState.grid = [];
+
+    // Initialize grid
+    for (let y = 0; y < size; y++) {
+        gameState.grid[y] = [];
+        for (let x = 0; x < size; x++) {
+            gameState.grid[y][x] = {
+                type: 'walkable',
+                locked: false,
+                visited: false
+            };
+        }
+    }
+
+    // Set start and exit
+    gameState.startPos = { x: 0, y: 0 };
+    gameState.exitPos = { x: size - 1, y: size - 1 };
+    gameState.grid[0][0].type = 'start';
+    gameState.grid[size - 1][size - 1].type = 'exit';
+
+    // Add logic constraints randomly
+    for (let i = 0; i < Math.floor(size / 2); i++) {
+        let x = Math.floor(Math.random() * size);
+        let y = Math.floor(Math.random() * size);
+        if (!(x === 0 && y === 0) && !(x === size - 1 && y === size - 1)) {
+            gameState.grid[y][x].type = 'locked';
+        }
+    }
+
+    // Add chart tiles
+    for (let i = 0; i < Math.floor(size / 3); i++) {
+        let x = Math.floor(Math.random() * size);
+        let y = Math.floor(Math.random() * size);
+        if (gameState.grid[y][x].type === 'walkable') {
+            gameState.grid[y][x] = {
+                type: 'chart-tile',
+                condition: Math.floor(Math.random() * 100),
+                locked: false
+            };
+        }
+    }
+}
+
+function renderGrid() {
+    const gridEl = document.getElementById('gameGrid');
+    gridEl.className = `grid size-${gameState.gridSize}`;
+    gridEl.innerHTML = '';
+
+    for (let y = 0; y < gameState.gridSize; y++) {
+        for (let x = 0; x < gameState.gridSize; x++) {
+            const tile = gameState.grid[y][x];
+            const tileEl = document.createElement('div');
+            tileEl.className = `tile ${tile.type}`;
+
+            if (x === gameState.currentPos.x && y === gameState.currentPos.y) {
+                tileEl.classList.add('current');
+            }
+            if (tile.type === 'chart-tile') {
+                tileEl.textContent = tile.condition;
+            }
+            if (tile.type === 'exit') {
+                tileEl.textContent = '🚪';
+            }
+            if (tile.type === 'start') {
+                tileEl.textContent = '▶';
+            }
+
+            if (!tile.locked && tile.type !== 'exit') {
+                tileEl.onclick = () => moveTo(x, y);
+            }
+
+            gridEl.appendChild(tileEl);
+        }
+    }
+}
+
+function moveTo(x, y) {
+    const tile = gameState.grid[y][x];
+
+    if (tile.locked) return;
+
+    // Check if adjacent to current position
+    const dist = Math.abs(x - gameState.currentPos.x) + Math.abs(y - gameState.currentPos.y);
+    if (dist !== 1) {
+        alert('Can only move to adjacent tiles!');
+        return;
+    }
+
+    gameState.currentPos = { x, y };
+    gameState.moves++;
+    gameState.visited.add(`${x},${y}`);
+
+    // Check if reached exit
+    if (x === gameState.exitPos.x && y === gameState.exitPos.y) {
+        endLevel();
+        return;
+    }
+
+    renderGrid();
+    updateUI();
+}
+
+function loadClues() {
+    const cluesContainer = document.getElementById('cluesContainer');
+    cluesContainer.innerHTML = '';
+
+    const clues = [
+        'Locked tiles cannot be crossed',
+        'Chart tiles reveal their value when stepped on',
+        'Find the shortest path to the exit'
+    ];
+
+    clues.forEach(clue => {
+        const clueEl = document.createElement('div');
+        clueEl.className = 'clue';
+        clueEl.textContent = clue;
+        cluesContainer.appendChild(clueEl);
+    });
+}
+
+function updateUI() {
+    document.getElementById('levelDisplay').textContent = gameState.level;
+    document.getElementById('movesDisplay').textContent = gameState.moves;
+    document.getElementById('scoreDisplay').textContent = gameState.score;
+}
+
+function endLevel() {
+    gameState.gameOver = true;
+
+    // Calculate score based on moves and difficulty
+    const baseScore = 1000;
+    const movesPenalty = gameState.moves * 10;
+    const difficultyBonus = gameState.difficulty * 100;
+    gameState.score = Math.max(100, baseScore - movesPenalty + difficultyBonus);
+
+    // Show modal
+    const modal = document.getElementById('endModal');
+    document.getElementById('endTitle').textContent = `Level ${gameState.level} Complete!`;
+    document.getElementById('endMessage').textContent = `You completed the level in ${gameState.moves} moves!`;
+    document.getElementById('scoreDisplay2').textContent = gameState.score;
+    modal.classList.add('show');
+
+    // Save score
+    saveScore(gameState.score);
+}
+
+function nextLevel() {
+    gameState.level++;
+    gameState.moves = 0;
+    gameState.visited.clear();
+    gameState.gameOver = false;
+    gameState.currentPos = { x: 0, y: 0 };
+    document.getElementById('endModal').classList.remove('show');
+    generateGrid();
+    renderGrid();
+    updateUI();
+}
+
+function resetGame() {
+    gameState.moves = 0;
+    gameState.visited.clear();
+    gameState.gameOver = false;
+    gameState.currentPos = { x: 0, y: 0 };
+    gameState.score = 0;
+    document.getElementById('endModal').classList.remove('show');
+    generateGrid();
+    renderGrid();
+    updateUI();
+}
+
+function showHint() {
+    alert('Try to find a path from top-left to bottom-right, avoiding locked tiles!');
+}
+
+function goToGames() {
+    window.location.href = '/games';
+}
+
+async function saveScore(score) {
+    try {
+        const response = await fetch('/api/save-score', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                game_name: 'Grid Escape+',
+                score: score,
+                skills: SKILL_AREAS.slice(0, 3)
+            })
+        });
+        const data = await response.json();
+        console.log('Score saved:', data);
+    } catch (error) {
+        console.error('Error saving score:', error);
+    }
+}
+
+// Initialize on load
+window.addEventListener('load', initGame);
@@ -0,0 +1,127 @@
+// Rows come from /api/leaderboard one slice at a time; "around" fills
+// in the user's neighbourhood when they are not in the loaded slice.
+// currentUserId and pageSize are set by the page.
+
+let currentWindow = 'all';
+let currentGame = '';
+let nextCursor = null;
+let loadedRows = [];
+let aroundRows = [];
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function renderRow(user) {
+    const row = document.createElement('tr');
+    if (user.user_id === currentUserId) {
+        row.className = 'current-user';
+    }
+
+    let rankMedal = '';
+    if (user.rank === 1) rankMedal = '🥇';
+    else if (user.rank === 2) rankMedal = '🥈';
+    else if (user.rank === 3) rankMedal = '🥉';
+
+    const rankHTML = `<div class="rank-number ${user.rank <= 3 ? 'top-3' : ''}">${rankMedal || user.rank}</div>`;
+
+    row.innerHTML = `
+        <td>${rankHTML}</td>
+        <td>
+            <div class="user-info">
+                <div class="user-avatar">${escapeHtml(user.username.charAt(0))}</div>
+                <div class="user-details">
+                    <div class="user-name">${escapeHtml(user.username)}</div>
+                    <div class="user-level">Level ${Math.floor(user.total_score / 1000) + 1}</div>
+                </div>
+            </div>
+        </td>
+        <td style="text-align: right;"><div class="score">${user.total_score}</div></td>
+        <td style="text-align: center;">
+            <span class="badge game">🎮 ${user.games_played}</span>
+        </td>
+        <td style="text-align: center;">
+            <span class="badge video">📺 0</span>
+        </td>
+    `;
+    return row;
+}
+
+function renderLeaderboard() {
+    const tbody = document.getElementById('leaderboardBody');
+    tbody.innerHTML = '';
+
+    if (loadedRows.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="5"><div class="empty-state"><h3>No scores yet</h3></div></td></tr>';
+        return;
+    }
+
+    loadedRows.forEach(user => tbody.appendChild(renderRow(user)));
+
+    // Show the user's neighbourhood below the slice if they are further down
+    const lastRank = loadedRows[loadedRows.length - 1].rank;
+    const below = aroundRows.filter(user => user.rank > lastRank);
+    if (below.length > 0) {
+        const gap = document.createElement('tr');
+        gap.innerHTML = '<td colspan="5" style="text-align: center;">⋯</td>';
+        tbody.appendChild(gap);
+        below.forEach(user => tbody.appendChild(renderRow(user)));
+    }
+}
+
+function renderStanding(me) {
+    document.getElementById('yourPosition').textContent = me ? '#' + me.rank : '-';
+    document.getElementById('yourScore').textContent = me ? me.total_score : 0;
+    document.getElementById('yourGames').textContent = me ? me.games_played : 0;
+}
+
+async function loadBoard(reset) {
+    const params = new URLSearchParams({window: currentWindow, limit: pageSize});
+    if (currentGame) params.set('game', currentGame);
+    if (reset) {
+        params.set('around', 2);
+    } else if (nextCursor) {
+        params.set('cursor', nextCursor);
+    }
+
+    try {
+        const response = await fetch('/api/leaderboard?' + params.toString());
+        const data = await response.json();
+        if (!data.success) throw new Error(data.error);
+
+        if (reset) {
+            loadedRows = [];
+            aroundRows = data.around || [];
+            renderStanding(data.me);
+        }
+        loadedRows = loadedRows.concat(data.rows);
+        nextCursor = data.next_cursor;
+        document.getElementById('loadMore').style.display = nextCursor ? 'flex' : 'none';
+        renderLeaderboard();
+    } catch (error) {
+        console.error('Error loading leaderboard:', error);
+    }
+}
+
+function setWindow(window_, button) {
+    currentWindow = window_;
+    document.querySelectorAll('.window-btn').forEach(btn => btn.classList.remove('active'));
+    button.classList.add('active');
+    loadBoard(true);
+}
+
+function setGame(game) {
+    currentGame = game;
+    loadBoard(true);
+}
+
+function goToDashboard() {
+    window.location.href = '/dashboard';
+}
+
+// Initialize
+window.addEventListener('load', () => {
+    loadBoard(true);
+});
@@ -0,0 +1,205 @@
+const videos = {
+    'life-skills': [
+        {
+            id: 'leadership',
+            title: 'Leadership Fundamentals',
+            description: 'Learn the core principles of effective leadership and team management.',
+            duration: '12:45',
+            thumbnail: '👨‍💼',
+            videoUrl: 'https://www.youtube.com/embed/FJhssMAUQVk'
+        },
+        {
+            id: 'communication',
+            title: 'Effective Communication Skills',
+            description: 'Master the art of clear and persuasive communication in any setting.',
+            duration: '15:30',
+            thumbnail: '🗣️',
+            videoUrl: 'https://www.youtube.com/embed/aJB-0uoWRAI'
+        },
+        {
+            id: 'time-management',
+            title: 'Time Management 101',
+            description: 'Organize your day and maximize productivity with proven techniques.',
+            duration: '18:20',
+            thumbnail: '⏰',
+            videoUrl: 'https://www.youtube.com/embed/HZnZMjx8VYo'
+        },
+        {
+            id: 'emotional-intelligence',
+            title: 'Emotional Intelligence at Work',
+            description: 'Develop emotional awareness for better relationships and decision-making.',
+            duration: '14:15',
+            thumbnail: '❤️',
+            videoUrl: 'https://www.youtube.com/embed/3AQe-OWfZ5I'
+        },
+        {
+            id: 'conflict-resolution',
+            title: 'Conflict Resolution Strategies',
+            description: 'Navigate disagreements and find win-win solutions professionally.',
+            duration: '16:40',
+            thumbnail: '⚖️',
+            videoUrl: 'https://www.youtube.com/embed/mPrECWo4r8w'
+        },
+        {
+            id: 'problem-solving',
+            title: 'Creative Problem-Solving',
+            description: 'Develop innovative approaches to tackle complex challenges.',
+            duration: '19:50',
+            thumbnail: '🧩',
+            videoUrl: 'https://www.youtube.com/embed/dRBnJOGE8pE'
+        }
+    ],
+    'technical-skills': [
+        {
+            id: 'html-css',
+            title: 'HTML & CSS Basics',
+            description: 'Start your web development journey with HTML and CSS fundamentals.',
+            duration: '22:15',
+            thumbnail: '🌐',
+            videoUrl: 'https://www.youtube.com/embed/qz0aGYrrlhU'
+        },
+        {
+            id: 'javascript',
+            title: 'JavaScript Fundamentals',
+            description: 'Learn JavaScript from scratch - variables, functions, and DOM manipulation.',
+            duration: '45:30',
+            thumbnail: '⚙️',
+            videoUrl: 'https://www.youtube.com/embed/W6NZfCO5tTE'
+        },
+        {
+            id: 'python-intro',
+            title: 'Python Programming Basics',
+            description: 'Get started with Python - syntax, data types, and control flow.',
+            duration: '38:20',
+            thumbnail: '🐍',
+            videoUrl: 'https://www.youtube.com/embed/kqtZkhylP-k'
+        },
+        {
+            id: 'git-github',
+            title: 'Git and GitHub Essentials',
+            description: 'Master version control with Git and collaborate on GitHub.',
+            duration: '28:45',
+            thumbnail: '🔀',
+            videoUrl: 'https://www.youtube.com/embed/RGOj5yH7evk'
+        },
+        {
+            id: 'web-design',
+            title: 'Responsive Web Design',
+            description: 'Create beautiful websites that work on all devices using flexbox and grid.',
+            duration: '32:10',
+            thumbnail: '📱',
+            videoUrl: 'https://www.youtube.com/embed/srvUrASNj0s'
+        },
+        {
+            id: 'database',
+            title: 'SQL & Database Design',
+            description: 'Learn SQL queries and database design principles for data management.',
+            duration: '41:25',
+            thumbnail: '🗄️',
+            videoUrl: 'https://www.youtube.com/embed/zbMHLJ0dY4w'
+        }
+    ]
+};
+
+let currentTab = 'life-skills';
+let watchedVideos = new Set();
+
+function switchTab(tab) {
+    currentTab = tab;
+    document.querySelectorAll('.tab-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+    renderVideos();
+}
+
+function renderVideos() {
+    const grid = document.getElementById('videoGrid');
+    grid.innerHTML = '';
+
+    let videosToShow = [];
+    if (currentTab === 'all') {
+        videosToShow = [...videos['life-skills'], ...videos['technical-skills']];
+    } else {
+        videosToShow = videos[currentTab] || [];
+    }
+
+    if (videosToShow.length === 0) {
+        grid.parentElement.appendChild(document.createElement('div')).className = 'empty-state';
+        grid.innerHTML = '<div class="empty-state"><h3>No videos available</h3></div>';
+        return;
+    }
+
+    videosToShow.forEach(video => {
+        const card = document.createElement('div');
+        card.className = 'video-card';
+
+        const isWatched = watchedVideos.has(video.id);
+
+        card.innerHTML = `
+            <div class="video-thumbnail" onclick="playVideo('${video.id}')">
+                <span style="font-size: 64px;">${video.thumbnail}</span>
+                <div class="play-button">▶</div>
+            </div>
+            <div class="video-info">
+                <div class="video-duration">${video.duration}</div>
+                <div class="video-title">${video.title}</div>
+                <div class="video-description">${video.description}</div>
+                <div class="video-category">
+                    ${currentTab === 'technical-skills' || ['html-css', 'javascript', 'python-intro', 'git-github', 'web-design', 'database'].includes(video.id)
+                        ? '💻 Technical'
+                        : '💡 Life Skill'}
+                </div>
+                ${isWatched ? '<div class="completion-badge">✓ Watched</div>' : ''}
+                <button class="watch-btn" onclick="playVideo('${video.id}')">${isWatched ? '▶ Watch Again' : '▶ Watch Now'}</button>
+            </div>
+        `;
+
+        grid.appendChild(card);
+    });
+}
+
+function playVideo(videoId) {
+    let videoUrl = '';
+    let videoTitle = '';
+
+    // Search in both categories
+    for (const category in videos) {
+        const video = videos[category].find(v => v.id === videoId);
+        if (video) {
+            videoUrl = video.videoUrl;
+            videoTitle = video.title;
+            break;
+        }
+    }
+
+    document.getElementById('videoPlayer').src = videoUrl;
+    document.getElementById('videoTitle').textContent = videoTitle;
+    document.getElementById('videoModal').classList.add('show');
+
+    // Mark as watched
+    watchedVideos.add(videoId);
+    updateStats();
+
+    // Re-render to show watched badge
+    setTimeout(renderVideos, 500);
+}
+
+function closeVideo() {
+    document.getElementById('videoModal').classList.remove('show');
+    document.getElementById('videoPlayer').src = '';
+}
+
+function updateStats() {
+    document.getElementById('watchedCount').textContent = watchedVideos.size;
+    // Rough calculation: assume average 20 minutes per video
+    const hours = Math.round((watchedVideos.size * 20) / 60 * 10) / 10;
+    document.getElementById('hoursCount').textContent = hours;
+}
+
+function goToDashboard() {
+    window.location.href = '/dashboard';
+}
+
+// Initialize
+window.addEventListener('load', () => {
+    renderVideos();
+});
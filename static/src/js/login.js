@@ -0,0 +1,51 @@
+// Language translations
+const translations = {
+    'en': {
+        'login_title': 'Login',
+        'username': 'Username',
+        'password': 'Password',
+        'login_button': 'Login',
+        'no_account': 'Don\'t have an account?',
+        'signup_link': 'Sign up here'
+    },
+    'hi': {
+        'login_title': 'लॉगिन',
+        'username': 'उपयोगकर्ता नाम',
+        'password': 'पासवर्ड',
+        'login_button': 'लॉगिन',
+        'no_account': 'खाता नहीं है?',
+        'signup_link': 'यहाँ साइन अप करें'
+    },
+    'kn': {
+        'login_title': 'ಲಾಗಿನ್',
+        'username': 'ಬಳಕೆದಾರ ಹೆಸರು',
+        'password': 'ಪಾಸ್‌ವರ್ಡ್',
+        'login_button': 'ಲಾಗಿನ್',
+        'no_account': 'ಖಾತೆ ಇಲ್ಲವೇ?',
+        'signup_link': 'ಇಲ್ಲಿ ಸೈನ್ ಅಪ್ ಮಾಡಿ'
+    }
+};
+
+// Language switching functionality
+function changeLanguage(lang) {
+    localStorage.setItem('selectedLanguage', lang);
+
+    document.querySelectorAll('[data-translate]').forEach(element => {
+        const key = element.getAttribute('data-translate');
+        if (translations[lang] && translations[lang][key]) {
+            element.textContent = translations[lang][key];
+        }
+    });
+}
+
+// Initialize language on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedLang = localStorage.getItem('selectedLanguage') || 'en';
+    document.getElementById('languageSelect').value = savedLang;
+    changeLanguage(savedLang);
+});
+
+// Language selector event
+document.getElementById('languageSelect').addEventListener('change', function(e) {
+    changeLanguage(e.target.value);
+});
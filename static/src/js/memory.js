@@ -0,0 +1,108 @@
+const emojis = ['🍎', '🍎', '🍊', '🍊', '🍋', '🍋', '🍌', '🍌',
+                '🍇', '🍇', '🍓', '🍓', '🍒', '🍒', '🍑', '🍑'];
+
+let cards = [];
+let flipped = [];
+let matched = 0;
+let moves = 0;
+let gameActive = true;
+let startTime = 0;
+let timerInterval = null;
+
+function initializeGame() {
+    cards = [...emojis].sort(() => Math.random() - 0.5);
+    flipped = new Array(16).fill(false);
+    matched = 0;
+    moves = 0;
+    gameActive = true;
+    startTime = Date.now();
+
+    clearInterval(timerInterval);
+    timerInterval = setInterval(updateTime, 1000);
+
+    renderBoard();
+    updateStats();
+}
+
+function renderBoard() {
+    const board = document.getElementById('gameBoard');
+    board.innerHTML = '';
+
+    cards.forEach((card, index) => {
+        const cardEl = document.createElement('button');
+        cardEl.className = 'card';
+        cardEl.textContent = flipped[index] ? card : '?';
+        cardEl.classList.toggle('flipped', flipped[index]);
+        cardEl.addEventListener('click', () => flipCard(index));
+        board.appendChild(cardEl);
+    });
+}
+
+function flipCard(index) {
+    if (!gameActive || flipped[index] || flipped.filter(f => f).length >= 2) return;
+
+    flipped[index] = true;
+    renderBoard();
+
+    const flippedIndices = flipped.map((f, i) => f ? i : -1).filter(i => i !== -1);
+
+    if (flippedIndices.length === 2) {
+        moves++;
+        updateStats();
+
+        const [i1, i2] = flippedIndices;
+        if (cards[i1] === cards[i2]) {
+            matched++;
+            if (matched === 8) {
+                endGame();
+                return;
+            }
+        } else {
+            setTimeout(() => {
+                flipped[i1] = false;
+                flipped[i2] = false;
+                renderBoard();
+            }, 600);
+        }
+    }
+}
+
+function updateStats() {
+    document.getElementById('matches').textContent = matched;
+    document.getElementById('moves').textContent = moves;
+}
+
+function updateTime() {
+    const elapsed = Math.floor((Date.now() - startTime) / 1000);
+    document.getElementById('time').textContent = elapsed;
+}
+
+function endGame() {
+    gameActive = false;
+    clearInterval(timerInterval);
+
+    const elapsed = Math.floor((Date.now() - startTime) / 1000);
+    const score = Math.max(0, 500 - (moves * 10) - (elapsed * 2));
+
+    document.getElementById('finalScore').textContent = score;
+    document.getElementById('scoreDisplay').style.display = 'block';
+
+    // Save score
+    fetch('/api/save-score', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({game_name: 'Memory Match', score: score})
+    });
+}
+
+function startNewGame() {
+    document.getElementById('scoreDisplay').style.display = 'none';
+    initializeGame();
+}
+
+function goBack() {
+    clearInterval(timerInterval);
+    window.location.href = '/games';
+}
+
+window.onload = initializeGame;
@@ -0,0 +1,91 @@
+let secretNumber = 0;
+let attempts = 0;
+const maxAttempts = 10;
+let gameOver = false;
+
+function startGame() {
+    secretNumber = Math.floor(Math.random() * 100) + 1;
+    attempts = 0;
+    gameOver = false;
+    document.getElementById('guessInput').value = '';
+    document.getElementById('guessInput').disabled = false;
+    document.getElementById('guessBtn').classList.remove('hidden');
+    document.getElementById('newGameBtn').classList.add('hidden');
+    document.getElementById('scoreDisplay').classList.add('hidden');
+    document.getElementById('feedback').textContent = '';
+    updateAttempts();
+}
+
+function makeGuess() {
+    if (gameOver) return;
+
+    const guess = parseInt(document.getElementById('guessInput').value);
+    const feedbackEl = document.getElementById('feedback');
+
+    if (isNaN(guess) || guess < 1 || guess > 100) {
+        feedbackEl.textContent = 'Please enter a number between 1 and 100';
+        feedbackEl.className = 'feedback';
+        return;
+    }
+
+    attempts++;
+    updateAttempts();
+
+    if (guess === secretNumber) {
+        feedbackEl.textContent = '🎉 Correct! You got it!';
+        feedbackEl.className = 'feedback correct';
+        endGame(true);
+    } else if (guess < secretNumber) {
+        feedbackEl.textContent = '⬆️ Too Low! Try Higher';
+        feedbackEl.className = 'feedback too-low';
+    } else {
+        feedbackEl.textContent = '⬇️ Too High! Try Lower';
+        feedbackEl.className = 'feedback too-high';
+    }
+
+    if (attempts >= maxAttempts && guess !== secretNumber) {
+        feedbackEl.textContent = `Game Over! The number was ${secretNumber}`;
+        feedbackEl.className = 'feedback';
+        endGame(false);
+    }
+
+    document.getElementById('guessInput').value = '';
+}
+
+function endGame(won) {
+    gameOver = true;
+    document.getElementById('guessInput').disabled = true;
+    document.getElementById('guessBtn').classList.add('hidden');
+    document.getElementById('newGameBtn').classList.remove('hidden');
+
+    const score = won ? Math.max(0, 100 - (attempts * 5)) : 0;
+    document.getElementById('finalScore').textContent = score;
+    document.getElementById('scoreDisplay').classList.remove('hidden');
+
+    // Save score to server
+    fetch('/api/save-score', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({game_name: 'Number Guess', score: score})
+    });
+}
+
+function startNewGame() {
+    startGame();
+}
+
+function updateAttempts() {
+    document.getElementById('attempts').textContent = attempts;
+}
+
+function goBack() {
+    window.location.href = '/games';
+}
+
+// Start game on load
+window.onload = startGame;
+
+// Allow Enter key to submit guess
+document.getElementById('guessInput').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') makeGuess();
+});
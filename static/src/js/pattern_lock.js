@@ -0,0 +1,220 @@
+const QUESTION_TYPES = ['numeric', 'shape', 'word', 'chart'];
+
+let gameState = {
+    score: 0,
+    timeLeft: 60,
+    currentQuestion: 0,
+    correctAnswers: 0,
+    answeredQuestions: 0,
+    selectedAnswer: null,
+    gameOver: false,
+    questions: []
+};
+
+// Question bank
+const questionBank = {
+    numeric: [
+        { pattern: '2, 4, 8, 16, ?', answers: ['32', '24', '18', '30'], correct: 0 },
+        { pattern: '1, 1, 2, 3, 5, 8, ?', answers: ['13', '11', '10', '12'], correct: 0 },
+        { pattern: '5, 10, 20, 40, ?', answers: ['80', '50', '60', '70'], correct: 0 },
+        { pattern: '1, 4, 9, 16, 25, ?', answers: ['36', '30', '35', '40'], correct: 0 },
+        { pattern: '3, 6, 12, 24, ?', answers: ['48', '36', '42', '50'], correct: 0 }
+    ],
+    shape: [
+        { pattern: '▲ ■ ● ▲ ■ ?', answers: ['●', '■', '▲', '◆'], correct: 2 },
+        { pattern: '□ ◇ □ ◇ □ ?', answers: ['◇', '□', '◆', '△'], correct: 0 },
+        { pattern: '● ○ ● ○ ● ?', answers: ['○', '●', '◆', '■'], correct: 0 },
+        { pattern: '▲ ▼ ▲ ▼ ▲ ?', answers: ['▼', '▲', '◆', '◯'], correct: 0 },
+        { pattern: '◆ ● ■ ◆ ● ?', answers: ['■', '◆', '●', '▲'], correct: 0 }
+    ],
+    word: [
+        { pattern: 'Cat is to Kitten as Dog is to ?', answers: ['Puppy', 'Kitty', 'Calf', 'Foal'], correct: 0 },
+        { pattern: 'Fast is to Slow as Big is to ?', answers: ['Small', 'Tiny', 'Large', 'Huge'], correct: 0 },
+        { pattern: 'Hot is to Cold as Wet is to ?', answers: ['Dry', 'Damp', 'Moist', 'Fluid'], correct: 0 },
+        { pattern: 'Happy is to Sad as Light is to ?', answers: ['Dark', 'Dim', 'Bright', 'Shadow'], correct: 0 },
+        { pattern: 'King is to Queen as Prince is to ?', answers: ['Princess', 'Lady', 'Duchess', 'Maiden'], correct: 0 }
+    ],
+    chart: [
+        { pattern: 'Q1:10, Q2:20, Q3:15, Q4:25. What is the median?', answers: ['17.5', '20', '15', '18'], correct: 0 },
+        { pattern: 'Data: 5, 10, 15, 20. Average is ?', answers: ['12.5', '15', '10', '13'], correct: 0 },
+        { pattern: 'Values: 2, 4, 6, 8. Sum is ?', answers: ['20', '16', '24', '18'], correct: 0 },
+        { pattern: 'Range of 3, 7, 12, 5 is ?', answers: ['9', '6', '8', '10'], correct: 0 },
+        { pattern: 'Mode of 1, 2, 2, 3, 3, 3, 4 is ?', answers: ['3', '2', '2.5', '4'], correct: 0 }
+    ]
+};
+
+function initGame() {
+    generateQuestionsSet();
+    loadQuestion();
+    startTimer();
+}
+
+function generateQuestionsSet() {
+    gameState.questions = [];
+    QUESTION_TYPES.forEach(type => {
+        const qType = questionBank[type];
+        const q = qType[Math.floor(Math.random() * qType.length)];
+        gameState.questions.push({ type, ...q });
+    });
+    // Shuffle for variety
+    gameState.questions = gameState.questions.sort(() => Math.random() - 0.5);
+}
+
+function loadQuestion() {
+    if (gameState.gameOver || gameState.currentQuestion >= gameState.questions.length) {
+        endGame();
+        return;
+    }
+
+    gameState.selectedAnswer = null;
+    const q = gameState.questions[gameState.currentQuestion];
+
+    document.getElementById('questionType').textContent = q.type.toUpperCase();
+    document.getElementById('questionText').textContent = q.pattern;
+    document.getElementById('submitBtn').disabled = true;
+
+    // Special displays for certain types
+    const specialDisplay = document.getElementById('specialDisplay');
+    if (q.type === 'shape') {
+        specialDisplay.innerHTML = `<div class="shape-display">${q.pattern}</div>`;
+    } else if (q.type === 'chart') {
+        specialDisplay.innerHTML = `<div class="chart-display">Analyze the data carefully and find the answer</div>`;
+    } else {
+        specialDisplay.innerHTML = '';
+    }
+
+    renderOptions(q);
+}
+
+function renderOptions(q) {
+    const optionsGrid = document.getElementById('optionsGrid');
+    optionsGrid.innerHTML = '';
+
+    q.answers.forEach((answer, index) => {
+        const option = document.createElement('div');
+        option.className = 'option';
+        option.textContent = answer;
+        option.onclick = () => selectAnswer(index);
+        optionsGrid.appendChild(option);
+    });
+}
+
+function selectAnswer(index) {
+    document.querySelectorAll('.option').forEach(opt => opt.classList.remove('selected'));
+    document.querySelectorAll('.option')[index].classList.add('selected');
+    gameState.selectedAnswer = index;
+    document.getElementById('submitBtn').disabled = false;
+}
+
+function submitAnswer() {
+    if (gameState.selectedAnswer === null) return;
+
+    const q = gameState.questions[gameState.currentQuestion];
+    const options = document.querySelectorAll('.option');
+
+    if (gameState.selectedAnswer === q.correct) {
+        gameState.score += 100;
+        gameState.correctAnswers++;
+        options[gameState.selectedAnswer].classList.add('correct');
+    } else {
+        options[gameState.selectedAnswer].classList.add('incorrect');
+        options[q.correct].classList.add('correct');
+    }
+
+    gameState.answeredQuestions++;
+    updateStats();
+
+    document.getElementById('submitBtn').disabled = true;
+
+    setTimeout(() => {
+        gameState.currentQuestion++;
+        loadQuestion();
+    }, 1500);
+}
+
+function skipQuestion() {
+    gameState.currentQuestion++;
+    loadQuestion();
+}
+
+function startTimer() {
+    const timerInterval = setInterval(() => {
+        gameState.timeLeft--;
+        updateTimer();
+
+        if (gameState.timeLeft <= 0) {
+            clearInterval(timerInterval);
+            endGame();
+        }
+    }, 1000);
+}
+
+function updateTimer() {
+    const timerEl = document.getElementById('timerDisplay');
+    timerEl.textContent = gameState.timeLeft + 's';
+
+    if (gameState.timeLeft <= 10) {
+        timerEl.classList.add('warning');
+    }
+}
+
+function updateStats() {
+    document.getElementById('scoreDisplay').textContent = gameState.score;
+    document.getElementById('correctCount').textContent = gameState.correctAnswers;
+    document.getElementById('answeredCount').textContent = gameState.answeredQuestions;
+
+    const accuracy = gameState.answeredQuestions > 0
+        ? Math.round((gameState.correctAnswers / gameState.answeredQuestions) * 100)
+        : 0;
+    document.getElementById('accuracyCount').textContent = accuracy + '%';
+}
+
+function endGame() {
+    gameState.gameOver = true;
+
+    const modal = document.getElementById('endModal');
+    document.getElementById('finalStats').textContent = `${gameState.correctAnswers}/${gameState.answeredQuestions} Correct`;
+    document.getElementById('finalScore').textContent = gameState.score;
+    modal.classList.add('show');
+
+    saveScore(gameState.score);
+}
+
+function restartGame() {
+    gameState = {
+        score: 0,
+        timeLeft: 60,
+        currentQuestion: 0,
+        correctAnswers: 0,
+        answeredQuestions: 0,
+        selectedAnswer: null,
+        gameOver: false,
+        questions: []
+    };
+    document.getElementById('endModal').classList.remove('show');
+    initGame();
+}
+
+function goToGames() {
+    window.location.href = '/games';
+}
+
+async function saveScore(score) {
+    try {
+        const response = await fetch('/api/save-score', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                game_name: 'Pattern Lock 2.0',
+                score: score,
+                skills: ['Analytical Reasoning', 'Abstract Thinking', 'Problem-Solving']
+            })
+        });
+        const data = await response.json();
+        console.log('Score saved:', data);
+    } catch (error) {
+        console.error('Error saving score:', error);
+    }
+}
+
+window.addEventListener('load', initGame);
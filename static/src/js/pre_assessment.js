@@ -0,0 +1,188 @@
+// Translations come from one versioned bundle per language, fetched
+// only when that language is chosen and cached by the browser after.
+// translationBundles (language -> bundle URL) is set by the page.
+const translations = {};
+
+function loadTranslations(lang) {
+    if (translations[lang]) {
+        return Promise.resolve(translations[lang]);
+    }
+    return fetch(translationBundles[lang] || translationBundles['en'])
+        .then(response => response.json())
+        .then(catalog => {
+            translations[lang] = catalog;
+            return catalog;
+        });
+}
+
+function t(lang, key, fallback) {
+    return (translations[lang] && translations[lang][key]) || fallback;
+}
+
+// Language switching functionality
+function changeLanguage(lang) {
+    // Store language preference
+    localStorage.setItem('selectedLanguage', lang);
+
+    loadTranslations(lang).then(catalog => {
+        // Update every element with a data-translate attribute
+        // (labels, select options and buttons alike)
+        document.querySelectorAll('[data-translate]').forEach(element => {
+            const key = element.getAttribute('data-translate');
+            if (catalog[key]) {
+                element.textContent = catalog[key];
+            }
+        });
+    }).catch(error => console.error('Could not load translations:', error));
+}
+
+// Initialize language on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedLang = localStorage.getItem('selectedLanguage') || 'en';
+    document.getElementById('languageSelect').value = savedLang;
+    changeLanguage(savedLang);
+});
+
+// Language selector event
+document.getElementById('languageSelect').addEventListener('change', function(e) {
+    changeLanguage(e.target.value);
+});
+// Rating scale functionality
+document.querySelectorAll('.rating-scale').forEach(scale => {
+    scale.querySelectorAll('.rating-btn').forEach(btn => {
+        btn.addEventListener('click', (e) => {
+            e.preventDefault();
+            scale.querySelectorAll('.rating-btn').forEach(b => b.classList.remove('selected'));
+            btn.classList.add('selected');
+
+            const scaleId = scale.id;
+            let inputId;
+
+            // Map scale IDs to their corresponding input IDs
+            if (scaleId === 'Sports_or_team_games_scale') {
+                inputId = 'Sports_or_team_games_value';
+            } else if (scaleId === 'communicationRating') {
+                inputId = 'communicationRatingValue';
+            } else {
+                // Fallback: try replacing 'Rating' with 'RatingValue'
+                inputId = scaleId.replace('Rating', 'RatingValue');
+            }
+
+            const inputElement = document.getElementById(inputId);
+            if (inputElement) {
+                inputElement.value = btn.dataset.value;
+            }
+        });
+    });
+});
+
+// Form submission
+document.getElementById('assessmentForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const formData = new FormData(document.getElementById('assessmentForm'));
+    const rawData = Object.fromEntries(formData);
+
+    // Map form field names to model feature names
+    const data = {
+        // Contact Info (not used by model, but kept for record)
+        name: rawData.name,
+        contact: rawData.contact,
+        email: rawData.email,
+        address: rawData.address,
+        referral: rawData.referral,
+
+        // Personal Info
+        Age: parseInt(rawData.age),
+        Gender: rawData.gender,
+        passed12th: rawData.passed12th,
+
+        // Family Info
+        Family_members: rawData.Family_members,
+        Earning_members_in_family: rawData.Earning_members,
+        Highest_education_in_family: rawData.Highest_education_in_family,
+        Severe_health_condition_in_family: rawData.Severe_health_condition_in_family,
+        Family_support: rawData.Family_support,
+
+        // Behavioral & Social
+        Daily_chores_completion: rawData.Daily_chores_completion,
+        Group_activities_participation: rawData.Group_activities_participation,
+        Sports_or_team_games: parseInt(rawData.Sports_or_team_games),
+        Comfort_talking: parseInt(rawData.Comfort_talking),
+        Comfortable_using_technology: rawData.Comfortable_using_technology,
+
+        // Program Participation
+        Past_program_participation: rawData.Past_program_participation,
+        reason_for_joining: rawData.reason_for_joining,
+        Commit_daily: rawData.Commit_daily,
+        Comfortable_travelling: rawData.Comfortable_travelling,
+
+        // Health & Work
+        Work_experience: rawData.Work_experience,
+        Physical_health_condition_affect_participation: rawData.Physical_health_condition_affect_participation,
+        Trust_in_program: rawData.Trust_in_program,
+
+        language: document.getElementById('languageSelect').value
+    };
+
+    // Validate required fields
+    if (!data.Sports_or_team_games || !data.Comfort_talking) {
+        const lang = data.language;
+        const alertMessage = t(lang, 'complete_required', 'Please complete all required fields');
+        alert(alertMessage);
+        return;
+    }
+
+    document.getElementById('loading').style.display = 'block';
+
+    console.log('Data being sent to model:', data);
+
+    try {
+        const response = await fetch('/submit-pre-assessment', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        document.getElementById('loading').style.display = 'none';
+
+        if (result.success) {
+            showResults(result.dropout_percentage, result.can_signup);
+        } else {
+            alert('Error: ' + result.error);
+        }
+    } catch (error) {
+        document.getElementById('loading').style.display = 'none';
+        alert('Error submitting assessment: ' + error);
+    }
+});
+
+function showResults(dropoutPercentage, canSignup) {
+    const lang = document.getElementById('languageSelect').value;
+
+    // If eligible (dropout <= 70), redirect to signup directly
+    if (canSignup) {
+        // Redirect to signup page directly without showing results
+        window.location.href = '/signup';
+        return;
+    }
+
+    // If not eligible (dropout > 70), show "we will contact you" message
+    document.getElementById('formContent').style.display = 'none';
+    document.getElementById('resultContent').style.display = 'block';
+
+    const scoreDiv = document.getElementById('dropoutScore');
+    // Hide the dropout percentage - don't show it to user
+    scoreDiv.style.display = 'none';
+
+    const messageDiv = document.getElementById('resultMessage');
+    const contactTitle = t(lang, 'contact_shortly', 'Thank You for Your Interest');
+    const contactMessage = t(lang, 'contact_message', 'We will review your profile and contact you shortly with further information.');
+    messageDiv.innerHTML = `<strong>${contactTitle}</strong><br>${contactMessage}`;
+
+    const buttonsDiv = document.getElementById('actionButtons');
+    const goBackText = t(lang, 'go_back', 'Go Back');
+    buttonsDiv.innerHTML = `<a href="/" class="action-btn secondary">${goBackText}</a>`;
+}
@@ -0,0 +1,33 @@
+function uploadDocument(docType, inputId) {
+    const fileInput = document.getElementById(inputId);
+    const file = fileInput.files[0];
+
+    if (!file) return;
+
+    const loadingId = docType.replace(/\s+/g, '') + 'Loading';
+    const loadingEl = document.getElementById(loadingId);
+
+    loadingEl.style.display = 'block';
+
+    const formData = new FormData();
+    formData.append('document', file);
+    formData.append('document_type', docType);
+
+    fetch('/upload-document', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        loadingEl.style.display = 'none';
+        if (data.success) {
+            location.reload();
+        } else {
+            alert('Error: ' + data.error);
+        }
+    })
+    .catch(error => {
+        loadingEl.style.display = 'none';
+        alert('Upload failed: ' + error);
+    });
+}
@@ -0,0 +1,57 @@
+// Language translations
+const translations = {
+    'en': {
+        'signup_title': 'Sign Up',
+        'username': 'Username',
+        'email': 'Email',
+        'password': 'Password',
+        'confirm_password': 'Confirm Password',
+        'signup_button': 'Sign Up',
+        'want_start_over': 'Want to start over?',
+        'back_assessment': 'Back to Assessment'
+    },
+    'hi': {
+        'signup_title': 'साइन अप',
+        'username': 'उपयोगकर्ता नाम',
+        'email': 'ईमेल',
+        'password': 'पासवर्ड',
+        'confirm_password': 'पासवर्ड की पुष्टि करें',
+        'signup_button': 'साइन अप',
+        'want_start_over': 'दोबारा शुरू करना चाहते हैं?',
+        'back_assessment': 'मूल्यांकन पर वापस जाएं'
+    },
+    'kn': {
+        'signup_title': 'ಸೈನ್ ಅಪ್',
+        'username': 'ಬಳಕೆದಾರ ಹೆಸರು',
+        'email': 'ಇಮೇಲ್',
+        'password': 'ಪಾಸ್‌ವರ್ಡ್',
+        'confirm_password': 'ಪಾಸ್‌ವರ್ಡ್ ದೃಢೀಕರಿಸಿ',
+        'signup_button': 'ಸೈನ್ ಅಪ್',
+        'want_start_over': 'ಮತ್ತೆ ಪ್ರಾರಂಭಿಸಲು ಬಯಸುತ್ತೀರಾ?',
+        'back_assessment': 'ಮೌಲ್ಯಮಾಪನಕ್ಕೆ ಹಿಂತಿರುಗಿ'
+    }
+};
+
+// Language switching functionality
+function changeLanguage(lang) {
+    localStorage.setItem('selectedLanguage', lang);
+
+    document.querySelectorAll('[data-translate]').forEach(element => {
+        const key = element.getAttribute('data-translate');
+        if (translations[lang] && translations[lang][key]) {
+            element.textContent = translations[lang][key];
+        }
+    });
+}
+
+// Initialize language on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedLang = localStorage.getItem('selectedLanguage') || 'en';
+    document.getElementById('languageSelect').value = savedLang;
+    changeLanguage(savedLang);
+});
+
+// Language selector event
+document.getElementById('languageSelect').addEventListener('change', function(e) {
+    changeLanguage(e.target.value);
+});
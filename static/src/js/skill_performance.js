@@ -0,0 +1,124 @@
+// profile is precomputed on the server from per-game aggregates (see
+// skills.py) and set by the page
+const skillAreas = profile.skills;
+const games = profile.games;
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+function formatTrend(trend) {
+    if (trend > 0) return `▲ ${trend}`;
+    if (trend < 0) return `▼ ${Math.abs(trend)}`;
+    return '–';
+}
+
+function renderSkillCards() {
+    const grid = document.getElementById('skillsGrid');
+    grid.innerHTML = '';
+
+    // Sort by score descending
+    const sortedSkills = [...skillAreas].sort((a, b) => b.score - a.score);
+
+    sortedSkills.forEach(skill => {
+        const percentage = skill.score;
+        const played = skill.games.filter(name => games.some(game => game.name === name)).length;
+
+        const card = document.createElement('div');
+        card.className = 'skill-card';
+        card.innerHTML = `
+            <div class="skill-header">
+                <div style="font-size: 24px; margin-right: 10px;">${skill.emoji}</div>
+                <div>
+                    <div class="skill-name">${skill.name}</div>
+                    <div style="font-size: 13px; color: #999;">${skill.description}</div>
+                </div>
+                <div class="skill-percentage">${percentage}%</div>
+            </div>
+            <div class="progress-bar">
+                <div class="progress-fill" style="width: ${percentage}%"></div>
+            </div>
+            <div class="skill-stats">
+                <div class="stat-item">
+                    <div class="stat-label">Percentile</div>
+                    <div class="stat-value">${skill.score}</div>
+                </div>
+                <div class="stat-item">
+                    <div class="stat-label">Games</div>
+                    <div class="stat-value">${played}/${skill.games.length}</div>
+                </div>
+            </div>
+        `;
+        grid.appendChild(card);
+    });
+}
+
+function renderDetailedChart() {
+    const chartDiv = document.getElementById('detailedChart');
+    chartDiv.innerHTML = '';
+
+    const sortedSkills = [...skillAreas].sort((a, b) => b.score - a.score);
+
+    sortedSkills.forEach(skill => {
+        const percentage = skill.score;
+
+        const container = document.createElement('div');
+        container.className = 'chart-bar-container';
+        container.innerHTML = `
+            <div class="chart-bar-label">
+                <span class="chart-bar-name">${skill.emoji} ${skill.name}</span>
+                <span class="chart-bar-value">${percentage}%</span>
+            </div>
+            <div class="chart-bar">
+                <div class="chart-bar-fill" style="width: ${percentage}%"></div>
+            </div>
+        `;
+        chartDiv.appendChild(container);
+    });
+}
+
+function renderGameBreakdown() {
+    const breakdown = document.getElementById('gameBreakdown');
+    breakdown.innerHTML = '';
+
+    if (games.length === 0) {
+        breakdown.innerHTML = '<div class="game-contribution"><div class="game-name">Play a game to see your skills here</div></div>';
+        return;
+    }
+
+    games.forEach(game => {
+        const gameEl = document.createElement('div');
+        gameEl.innerHTML = `
+            <div class="game-contribution">
+                <div>
+                    <div class="game-name">🎮 ${escapeHtml(game.name)}</div>
+                    <div class="game-skills">
+                        ${skillAreas
+                            .filter(s => s.games.includes(game.name))
+                            .map(s => `<span class="skill-badge">${s.emoji} ${s.name}</span>`)
+                            .join('')}
+                    </div>
+                    <div style="font-size: 13px; color: #999; margin-top: 6px;">
+                        Best ${game.best} · Avg ${game.mean} · ${game.plays} plays ·
+                        Trend ${formatTrend(game.trend)} (last ${profile.recent_plays})
+                    </div>
+                </div>
+                <div class="contribution-score">${game.percentile}%</div>
+            </div>
+        `;
+        breakdown.appendChild(gameEl);
+    });
+}
+
+function goToDashboard() {
+    window.location.href = '/dashboard';
+}
+
+// Initialize
+window.addEventListener('load', () => {
+    renderSkillCards();
+    renderDetailedChart();
+    renderGameBreakdown();
+});
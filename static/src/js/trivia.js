@@ -0,0 +1,119 @@
+const questions = [
+    {
+        question: "What is the capital of France?",
+        options: ["London", "Berlin", "Paris", "Madrid"],
+        correct: 2
+    },
+    {
+        question: "Which planet is known as the Red Planet?",
+        options: ["Venus", "Mars", "Jupiter", "Saturn"],
+        correct: 1
+    },
+    {
+        question: "What is the largest ocean on Earth?",
+        options: ["Atlantic Ocean", "Indian Ocean", "Arctic Ocean", "Pacific Ocean"],
+        correct: 3
+    },
+    {
+        question: "Who wrote Romeo and Juliet?",
+        options: ["Jane Austen", "William Shakespeare", "Mark Twain", "Charles Dickens"],
+        correct: 1
+    },
+    {
+        question: "What is the smallest country in the world?",
+        options: ["Monaco", "Liechtenstein", "Vatican City", "San Marino"],
+        correct: 2
+    }
+];
+
+let currentQuestionIndex = 0;
+let score = 0;
+let answered = 0;
+let selectedAnswer = -1;
+
+function loadQuestion() {
+    const question = questions[currentQuestionIndex];
+    document.getElementById('question').textContent = question.question;
+    document.getElementById('currentQuestion').textContent = currentQuestionIndex + 1;
+
+    const optionsContainer = document.getElementById('options');
+    optionsContainer.innerHTML = '';
+
+    question.options.forEach((option, index) => {
+        const optionEl = document.createElement('div');
+        optionEl.className = 'option';
+        optionEl.textContent = option;
+        optionEl.onclick = () => selectAnswer(index);
+        optionsContainer.appendChild(optionEl);
+    });
+
+    selectedAnswer = -1;
+    document.getElementById('nextBtn').disabled = true;
+}
+
+function selectAnswer(index) {
+    selectedAnswer = index;
+    const options = document.querySelectorAll('.option');
+    options.forEach(opt => opt.classList.remove('selected'));
+    options[index].classList.add('selected');
+    document.getElementById('nextBtn').disabled = false;
+}
+
+function nextQuestion() {
+    if (selectedAnswer === -1) return;
+
+    answered++;
+    const question = questions[currentQuestionIndex];
+    const options = document.querySelectorAll('.option');
+
+    if (selectedAnswer === question.correct) {
+        score += 20;
+        options[selectedAnswer].classList.add('correct');
+    } else {
+        options[selectedAnswer].classList.add('incorrect');
+        options[question.correct].classList.add('correct');
+    }
+
+    document.getElementById('score').textContent = score;
+    document.getElementById('nextBtn').disabled = true;
+
+    setTimeout(() => {
+        currentQuestionIndex++;
+        if (currentQuestionIndex < questions.length) {
+            loadQuestion();
+        } else {
+            endQuiz();
+        }
+    }, 1500);
+}
+
+function endQuiz() {
+    document.getElementById('gameContent').style.display = 'none';
+    document.getElementById('scoreDisplay').style.display = 'block';
+    document.getElementById('finalScoreDisplay').textContent = score;
+    document.getElementById('answered').textContent = answered;
+    document.getElementById('correct').textContent = score / 20;
+    document.getElementById('accuracy').textContent = Math.round((score / 100) * 100);
+
+    // Save score
+    fetch('/api/save-score', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({game_name: 'Quick Trivia', score: score})
+    });
+}
+
+function startNewQuiz() {
+    currentQuestionIndex = 0;
+    score = 0;
+    answered = 0;
+    document.getElementById('gameContent').style.display = 'block';
+    document.getElementById('scoreDisplay').style.display = 'none';
+    loadQuestion();
+}
+
+function goBack() {
+    window.location.href = '/games';
+}
+
+window.onload = loadQuestion;
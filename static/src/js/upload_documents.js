@@ -0,0 +1,63 @@
+function uploadDocument(docType, inputId) {
+    const fileInput = document.getElementById(inputId);
+    const file = fileInput.files[0];
+
+    if (!file) {
+        console.log('No file selected');
+        return;
+    }
+
+    console.log('Uploading file:', file.name, 'Type:', docType);
+
+    const loadingId = docType.replace(/\s+/g, '') + 'Loading';
+    const loadingEl = document.getElementById(loadingId);
+
+    if (loadingEl) {
+        loadingEl.style.display = 'block';
+    }
+
+    const formData = new FormData();
+    formData.append('document', file);
+    formData.append('document_type', docType);
+
+    console.log('FormData created, starting fetch...');
+
+    fetch('/upload-document', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => {
+        console.log('Response status:', response.status);
+        return response.json();
+    })
+    .then(data => {
+        console.log('Response data:', data);
+        if (loadingEl) {
+            loadingEl.style.display = 'none';
+        }
+        if (data.success) {
+            console.log('Upload successful, reloading...');
+            location.reload();
+        } else {
+            console.error('Upload failed:', data.error);
+            showError('Error: ' + data.error);
+        }
+    })
+    .catch(error => {
+        console.error('Upload error:', error);
+        if (loadingEl) {
+            loadingEl.style.display = 'none';
+        }
+        showError('Upload failed: ' + error.toString());
+    });
+}
+
+function showError(message) {
+    const errorEl = document.getElementById('errorMessage');
+    errorEl.textContent = message;
+    errorEl.style.display = 'block';
+    console.log('Error shown:', message);
+    setTimeout(() => {
+        errorEl.style.display = 'none';
+    }, 5000);
+}
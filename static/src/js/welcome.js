@@ -0,0 +1,52 @@
+// Translation strings
+const translations = {
+    'en': {
+        'welcome_to_hexecutioners': 'Welcome to Hexecutioners',
+        'welcome_subtitle_home': 'Empower your future through our skill development program',
+        'new_user': 'I\'m a New User',
+        'returning_user': 'I Already Have an Account',
+        'welcome_description': 'Join thousands of students building their future with Hexecutioners'
+    },
+    'hi': {
+        'welcome_to_hexecutioners': 'हैक्सेक्यूशनर्स में स्वागत है',
+        'welcome_subtitle_home': 'हमारे कौशल विकास कार्यक्रम के माध्यम से अपना भविष्य सशक्त करें',
+        'new_user': 'मैं एक नया उपयोगकर्ता हूँ',
+        'returning_user': 'मेरे पास पहले से एक खाता है',
+        'welcome_description': 'हैक्सेक्यूशनर्स के साथ अपना भविष्य बनाने वाले हजारों छात्रों से जुड़ें'
+    },
+    'kn': {
+        'welcome_to_hexecutioners': 'ಹೆಕ್ಸೆಕ್ಯೂಶನರ್ಸ್‌ಗೆ ಸ್ವಾಗತ',
+        'welcome_subtitle_home': 'ನಮ್ಮ ಕೌಶಲ್ಯ ಅಭಿವೃದ್ಧಿ ಕಾರ್ಯಕ್ರಮದ ಮೂಲಕ ನಿಮ್ಮ ಭವಿಷ್ಯತ್ತನ್ನು ಸಶಕ್ತ ಮಾಡಿ',
+        'new_user': 'ನಾನು ಹೊಸ ಬಳಕೆದಾರ',
+        'returning_user': 'ನನಗೆ ಈಗಾಗಲೇ ಖಾತೆ ಇದೆ',
+        'welcome_description': 'ಹೆಕ್ಸೆಕ್ಯೂಶನರ್ಸ್‌ನೊಂದಿಗೆ ತಮ್ಮ ಭವಿಷ್ಯತ್ತನ್ನು ನಿರ್ಮಿಸುತ್ತಿರುವ ಹಾಗೂ ವಿದ್ಯಾರ್ಥಿಗಳಿಗೆ ಸೇರಿ'
+    }
+};
+
+// Language functionality
+function changeLanguage(lang) {
+    localStorage.setItem('selectedLanguage', lang);
+    document.querySelectorAll('[data-translate]').forEach(element => {
+        const key = element.getAttribute('data-translate');
+        if (translations[lang] && translations[lang][key]) {
+            element.textContent = translations[lang][key];
+        }
+    });
+}
+
+// Initialize on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedLang = localStorage.getItem('selectedLanguage') || 'en';
+    const langSelect = document.getElementById('languageSelect');
+    if (langSelect) {
+        langSelect.value = savedLang;
+    }
+    changeLanguage(savedLang);
+
+    // Language selector change handler
+    if (langSelect) {
+        langSelect.addEventListener('change', function(e) {
+            changeLanguage(e.target.value);
+        });
+    }
+});
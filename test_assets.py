@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""Test script to verify page assets are minified, fingerprinted and served precompressed"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import tempfile
+
+from flask import Flask, render_template_string
+
+from assets import ASSET_SOURCE, Assets, build, is_stale, minify_css, minify_js
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_minify_js_keeps_literals():
+    source = (
+        "// Greeting\n"
+        "function greet(name) {\n"
+        "    /* not in a string */\n"
+        "    const url = 'http://example.com/*x*/';\n"
+        "    const pattern = /\\/\\/[^/]*\"/g;\n"
+        "    const half = total / 2 / count;\n"
+        "\n"
+        "    return `Hi ${name} // ${ { a: `x` }.a }\n"
+        "        indented`;\n"
+        "}\n"
+    )
+    assert minify_js(source) == (
+        "function greet(name) {\n"
+        "const url = 'http://example.com/*x*/';\n"
+        "const pattern = /\\/\\/[^/]*\"/g;\n"
+        "const half = total / 2 / count;\n"
+        "return `Hi ${name} // ${ { a: `x` }.a }\n"
+        "        indented`;\n"
+        "}"
+    )
+
+    # A regular expression after return, and a line break kept for ASI
+    assert minify_js("if (x) {\n  return /a b/.test(y)\n}\nlet z = 1") == \
+        "if (x) {\nreturn /a b/.test(y)\n}\nlet z = 1"
+
+
+def test_minify_css_keeps_strings_and_descendants():
+    source = "/* header */\n.a :hover ,\n.b > .c {\n    content: \"a  /* b */\";\n    margin: 0 auto;\n}\n"
+    assert minify_css(source) == '.a :hover,.b>.c{content:"a  /* b */";margin:0 auto}'
+
+
+def test_build_fingerprints_and_compresses():
+    with tempfile.TemporaryDirectory() as folder:
+        source, dist = os.path.join(folder, 'src'), os.path.join(folder, 'dist')
+        write(os.path.join(source, 'js', 'page.js'), "// comment\nfunction go() {\n    return 1;\n}\n" * 50)
+        assert is_stale(source, dist)
+
+        manifest = build(source, dist)
+        built = manifest['js/page.js']
+        assert re.fullmatch(r'js/page\.[0-9a-f]{12}\.js', built)
+        with open(os.path.join(dist, built), 'rb') as f:
+            data = f.read()
+        assert b'comment' not in data and b'    ' not in data
+        with open(os.path.join(dist, built + '.gz'), 'rb') as f:
+            assert gzip.decompress(f.read()) == data
+        with open(os.path.join(dist, 'manifest.json')) as f:
+            assert json.load(f) == manifest
+        assert not is_stale(source, dist)
+
+        # New content, new name; the old build stays for pages already out
+        write(os.path.join(source, 'js', 'page.js'), "function go() {\n    return 2;\n}\n")
+        os.utime(os.path.join(dist, 'manifest.json'), ns=(0, 0))
+        assert is_stale(source, dist)
+        rebuilt = build(source, dist)['js/page.js']
+        assert rebuilt != built
+        assert os.path.exists(os.path.join(dist, built))
+
+
+def test_assets_are_served_precompressed_and_immutable():
+    with tempfile.TemporaryDirectory() as folder:
+        source, dist = os.path.join(folder, 'src'), os.path.join(folder, 'dist')
+        write(os.path.join(source, 'css', 'page.css'), ".box {\n    color: red;\n}\n" * 100)
+        app = Flask(__name__)
+        assets = Assets(app, source=source, dist=dist)
+        client = app.test_client()
+
+        with app.test_request_context():
+            url = render_template_string("{{ asset_url('css/page.css') }}")
+        assert url == '/assets/' + assets.manifest['css/page.css']
+
+        plain = client.get(url)
+        assert plain.status_code == 200 and plain.mimetype == 'text/css'
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.cache_control.max_age == 365 * 24 * 3600
+        assert 'immutable' in plain.headers['Cache-Control']
+
+        compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in compressed.headers['Vary']
+        assert gzip.decompress(compressed.data) == plain.data
+        plain.close()
+        compressed.close()
+
+        revalidated = client.get(url, headers={'If-None-Match': compressed.headers['ETag'],
+                                               'Accept-Encoding': 'gzip'})
+        assert revalidated.status_code == 304
+        revalidated.close()
+
+        # Only built files are served: not the manifest, not guessed names
+        assert client.get('/assets/manifest.json').status_code == 404
+        assert client.get('/assets/css/page.css').status_code == 404
+
+
+def test_templates_link_existing_sources():
+    linked = set()
+    for path in glob.glob(os.path.join('templates', '*.html')):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        assert '<style>' not in text
+        linked.update(re.findall(r"asset_url\('([^']+)'\)", text))
+    assert linked
+    for name in linked:
+        assert os.path.exists(os.path.join(ASSET_SOURCE, name)), name
+
+
+if __name__ == '__main__':
+    test_minify_js_keeps_literals()
+    test_minify_css_keeps_strings_and_descendants()
+    test_build_fingerprints_and_compresses()
+    test_assets_are_served_precompressed_and_immutable()
+    test_templates_link_existing_sources()
+    print("✓ Page assets are minified, fingerprinted and served precompressed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Test script to verify encoded and batch predictions match the pandas path"""
+
+import random
+
+import pandas as pd
+
+from ml_model import predictor
+
+NUMERIC_ANSWERS = {'Age', 'Sports_or_team_games', 'Comfort_talking'}
+
+
+def reference_row(assessment_data):
+    """
+    The model's input for one assessment, built the way it was before
+    FeatureEncoder: a pandas row with the training categories. Only used
+    here, as the oracle the encoder is checked against.
+    """
+    row = {}
+    for column in predictor.feature_columns:
+        value = assessment_data.get(column)
+        if value is None:
+            continue
+        if column in NUMERIC_ANSWERS:
+            row[column] = int(value) if isinstance(value, str) else value
+        else:
+            row[column] = str(value).strip()
+
+    X_new = pd.DataFrame([row], columns=predictor.feature_columns)
+    for column in predictor.num_cols:
+        X_new[column] = pd.to_numeric(X_new[column], errors="coerce")
+    for column in predictor.cat_cols:
+        levels = predictor.category_levels.get(column, [])
+        if levels and isinstance(levels[0], int):
+            X_new[column] = pd.to_numeric(X_new[column], errors="coerce")
+        X_new[column] = X_new[column].astype("category").cat.set_categories(levels)
+    return X_new
+
+# Build sample candidates from the model's own category levels,
+# including some unknown answers and missing fields
+random.seed(7)
+candidates = []
+for i in range(200):
+    candidate = {'Age': random.randint(18, 25)}
+    for column in predictor.cat_cols:
+        levels = predictor.category_levels[column]
+        candidate[column] = random.choice(levels + ['unknown'] if i % 9 == 0 else levels)
+    if i % 13 == 0:
+        candidate.pop('Gender')
+    if i % 17 == 0:
+        candidate['Age'] = 'not a number'
+    candidates.append(candidate)
+
+
+def test_batch_matches_single_row():
+    batch = predictor.predict_dropout_batch(candidates)
+    single = [predictor.predict_dropout_percentage(c) for c in candidates]
+    assert batch == single
+
+
+def test_encoder_matches_pandas_path():
+    for candidate in candidates:
+        try:
+            X_new = reference_row(candidate)
+        except ValueError:
+            continue
+        expected = int(predictor.model.predict_proba(X_new)[:, 1][0] * 100)
+        assert predictor.predict_dropout_percentage(candidate) == expected
+
+
+def test_repeated_answers_hit_cache():
+    candidate = dict(candidates[1])
+    first = predictor.predict_dropout_percentage(candidate)
+    hits = predictor.cache.stats()['hits']
+    # Same answers in a different form encode to the same key
+    candidate['Sports_or_team_games'] = str(candidate['Sports_or_team_games'])
+    assert predictor.predict_dropout_percentage(candidate) == first
+    assert predictor.cache.stats()['hits'] == hits + 1
+
+
+def test_empty_batch():
+    assert predictor.predict_dropout_batch([]) == []
+
+
+if __name__ == '__main__':
+    test_batch_matches_single_row()
+    test_encoder_matches_pandas_path()
+    test_repeated_answers_hit_cache()
+    test_empty_batch()
+    print("✓ Encoded and batch predictions match the pandas path")
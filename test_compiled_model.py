@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Test script to verify the compiled tree evaluator matches native LightGBM"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+from compiled_model import CompiledEnsemble, check_parity
+import ml_model
+from ml_model import DropoutPredictor, predictor
+from score_table import ScoreTable, build_score_table
+
+# Encoded rows covering every category code, unknown answers and out-of-range ages
+sample = predictor._parity_sample(n_rows=5000, seed=42)
+
+
+def test_compiled_matches_lightgbm():
+    # Checked against the path the predictor serves when it runs LightGBM
+    saved, ml_model.DROPOUT_ENGINE = ml_model.DROPOUT_ENGINE, 'lightgbm'
+    try:
+        native = DropoutPredictor(predictor.bundle_path, predictor.model_version)
+    finally:
+        ml_model.DROPOUT_ENGINE = saved
+    assert native.engine is None
+    ensemble = CompiledEnsemble.from_booster(native.booster)
+    assert check_parity(ensemble, native, sample) < 1e-9
+
+    # An engine can't vouch for itself
+    native.engine = ensemble
+    try:
+        check_parity(ensemble, native, sample)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("parity was checked against the compiled engine itself")
+
+
+def test_save_and_load_roundtrip():
+    ensemble = CompiledEnsemble.from_booster(predictor.booster)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'engine.npz')
+        ensemble.save(path, metadata={'feature_columns': predictor.feature_columns})
+        loaded, metadata = CompiledEnsemble.load(path)
+    assert metadata['feature_columns'] == predictor.feature_columns
+    assert np.array_equal(loaded.predict(sample), ensemble.predict(sample))
+
+
+def test_score_table_matches_model():
+    # Pin most answers so the table stays small enough for a quick test
+    fixed = {column: predictor.category_levels[column][0] for column in predictor.cat_cols[:12]}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scores.npy')
+        header = build_score_table(predictor, path, fixed=fixed)
+        table = ScoreTable.open(path)
+
+        X_rows = sample.copy()
+        for column, value in fixed.items():
+            position = predictor.feature_columns.index(column)
+            X_rows[:, position] = predictor.encoder.encode({column: value})[0, position]
+        expected = (predictor._predict_proba_rows(X_rows) * 100).astype(int)
+        for X_row, score in zip(X_rows, expected):
+            tabled = table.lookup(X_row)
+            assert tabled is None or tabled == score
+        assert header['model_fingerprint'] == predictor.model_fingerprint
+        del table
+
+
+def test_score_table_mismatch_is_not_published():
+    fixed = {column: predictor.category_levels[column][0] for column in predictor.cat_cols[:12]}
+    # A model path that disagrees with the engine the table is scored with
+    disagreeing = SimpleNamespace(
+        engine=predictor.engine, booster=predictor.booster, encoder=predictor.encoder,
+        model_fingerprint=predictor.model_fingerprint,
+        _predict_proba_rows=lambda X_rows: 1 - predictor._predict_proba_rows(X_rows),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scores.npy')
+        with open(path + '.json', 'w') as f:
+            f.write('{}')
+        try:
+            build_score_table(disagreeing, path, fixed=fixed)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a table that disagrees with the model was accepted")
+        assert not os.path.exists(path) and not os.path.exists(path + '.json')
+
+
+if __name__ == '__main__':
+    test_compiled_matches_lightgbm()
+    test_save_and_load_roundtrip()
+    test_score_table_matches_model()
+    test_score_table_mismatch_is_not_published()
+    print("✓ Compiled evaluator matches LightGBM")
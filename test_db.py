@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Test script to verify pooled connections, pragmas and transactions"""
+
+import os
+import sqlite3
+import tempfile
+
+from db import SQLITE_BUSY_TIMEOUT, ConnectionPool, connect, transaction
+
+
+def test_connection_pragmas():
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(os.path.join(tmp, 'test.db'))
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == SQLITE_BUSY_TIMEOUT
+        assert isinstance(conn.execute('SELECT 1 AS one').fetchone(), sqlite3.Row)
+        conn.close()
+
+
+def test_pool_reuses_connections():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, 'test.db'), max_idle=1)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+
+        # Beyond max_idle, returned connections are closed instead of kept
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        try:
+            second.execute('SELECT 1')
+        except sqlite3.ProgrammingError:
+            pass
+        else:
+            raise AssertionError('connection beyond max_idle was kept open')
+        pool.close()
+
+
+def test_transaction_commits_or_rolls_back():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, 'test.db'))
+        conn = pool.acquire()
+        conn.execute('CREATE TABLE t (x INTEGER)')
+
+        with transaction(conn):
+            conn.execute('INSERT INTO t VALUES (1)')
+        try:
+            with transaction(conn):
+                conn.execute('INSERT INTO t VALUES (2)')
+                raise RuntimeError('fail mid-transaction')
+        except RuntimeError:
+            pass
+        assert [row['x'] for row in conn.execute('SELECT x FROM t')] == [1]
+
+        # A transaction left open by a failed request is rolled back on release
+        conn.execute('BEGIN')
+        conn.execute('INSERT INTO t VALUES (3)')
+        pool.release(conn)
+        conn = pool.acquire()
+        assert not conn.in_transaction
+        assert conn.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 1
+        pool.close()
+
+
+if __name__ == '__main__':
+    test_connection_pragmas()
+    test_pool_reuses_connections()
+    test_transaction_commits_or_rolls_back()
+    print("✓ Pooled connections, pragmas and transactions work")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Test script to verify compiled translation catalogs and bundles"""
+
+import json
+import re
+
+from languages import BUNDLE_VERSIONS, CATALOGS, LANGUAGES, TRANSLATIONS, get_bundle, get_text
+
+
+def test_catalogs_resolve_fallback_ahead_of_time():
+    for lang in LANGUAGES:
+        assert set(CATALOGS[lang]) == set(TRANSLATIONS['en'])
+    assert get_text('go_back', 'hi') == TRANSLATIONS['hi']['go_back']
+    assert get_text('go_back', 'xx') == TRANSLATIONS['en']['go_back']
+    assert get_text('no_such_key', 'kn') == 'no_such_key'
+
+
+def test_bundles_are_versioned_by_content():
+    for lang in LANGUAGES:
+        data, version = get_bundle(lang)
+        assert json.loads(data) == CATALOGS[lang]
+        assert version == BUNDLE_VERSIONS[lang]
+    assert len(set(BUNDLE_VERSIONS.values())) == len(LANGUAGES)
+    assert get_bundle('xx') is None
+
+
+def test_pre_assessment_keys_are_translated():
+    with open('templates/pre_assessment.html', encoding='utf-8') as f:
+        page = f.read()
+    with open('static/src/js/pre_assessment.js', encoding='utf-8') as f:
+        script = f.read()
+    # Strings the page's script looks up, and a few of its labels
+    keys = set(re.findall(r"t\(lang, '([^']+)'", script))
+    assert keys and keys <= set(CATALOGS['en'])
+    labels = set(re.findall(r'data-translate="([^"]+)"', page))
+    assert {'select_language', 'contact_info', 'analyzing_profile'} <= labels & set(CATALOGS['en'])
+
+
+if __name__ == '__main__':
+    test_catalogs_resolve_fallback_ahead_of_time()
+    test_bundles_are_versioned_by_content()
+    test_pre_assessment_keys_are_translated()
+    print("✓ Translation catalogs are compiled and bundled per language")
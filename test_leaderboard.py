@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""Test script to verify the materialized leaderboard matches the full aggregate"""
+
+import random
+import sqlite3
+
+from leaderboard import (board_around, board_page, board_standing, count_users, top_users,
+                         user_standing, window_start)
+from migrations import MIGRATIONS, migrate
+
+
+def make_db(n_users=40, n_scores=500, seed=3):
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    rng = random.Random(seed)
+    for i in range(n_users):
+        conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     (f'user{i}', f'user{i}@example.com', 'x'))
+    for _ in range(n_scores):
+        conn.execute('INSERT INTO game_scores (user_id, game_name, score) VALUES (?, ?, ?)',
+                     (rng.randint(1, n_users - 5), rng.choice(['trivia', 'memory']), rng.randint(0, 100)))
+    conn.commit()
+    return conn
+
+
+def full_aggregate(conn):
+    """The leaderboard as computed before user_totals existed"""
+    rows = conn.execute(
+        '''SELECT u.id, u.username,
+           COALESCE(SUM(CAST(gs.score AS INTEGER)), 0) as total_score,
+           COUNT(DISTINCT gs.id) as games_played
+        FROM users u
+        LEFT JOIN game_scores gs ON u.id = gs.user_id
+        GROUP BY u.id
+        ORDER BY total_score DESC, u.id'''
+    ).fetchall()
+    return [(row['id'], row['total_score'], row['games_played']) for row in rows]
+
+
+def materialized(conn):
+    return [(row['user_id'], row['total_score'], row['games_played'])
+            for row in top_users(conn, limit=1000)]
+
+
+def test_totals_match_full_aggregate():
+    conn = make_db()
+    assert materialized(conn) == full_aggregate(conn)
+
+    # Deleted scores are taken back out
+    conn.execute('DELETE FROM game_scores WHERE id % 7 = 0')
+    assert materialized(conn) == full_aggregate(conn)
+
+
+def test_backfill_existing_scores():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    migrate(conn, MIGRATIONS[:3])
+    conn.execute("INSERT INTO users (username, email, password) VALUES ('a', 'a@x', 'x')")
+    conn.execute("INSERT INTO game_scores (user_id, game_name, score) VALUES (1, 'trivia', '12')")
+    migrate(conn)
+    assert materialized(conn) == [(1, 12, 1)]
+
+
+def test_rank_lookup_and_pages():
+    conn = make_db()
+    ranking = full_aggregate(conn)
+    for position, (user_id, total_score, games_played) in enumerate(ranking, start=1):
+        standing = user_standing(conn, user_id)
+        assert (standing['rank'], standing['total_score']) == (position, total_score)
+
+    page_two = top_users(conn, limit=10, offset=10)
+    assert [row['rank'] for row in page_two] == list(range(11, 21))
+    assert [row['user_id'] for row in page_two] == [row[0] for row in ranking[10:20]]
+    assert count_users(conn) == len(ranking)
+    assert user_standing(conn, 9999) is None
+
+
+def walk_board(conn, limit, **board):
+    rows, cursor = board_page(conn, limit=limit, **board)
+    while cursor:
+        page, cursor = board_page(conn, limit=limit, cursor=cursor, **board)
+        rows += page
+    return rows
+
+
+def test_cursor_pages_cover_the_board():
+    conn = make_db()
+    rows = walk_board(conn, 7)
+    assert [(r['user_id'], r['total_score'], r['games_played']) for r in rows] == full_aggregate(conn)
+    assert [r['rank'] for r in rows] == list(range(1, len(rows) + 1))
+
+
+def test_game_and_window_boards():
+    conn = make_db()
+    expected = conn.execute(
+        '''SELECT user_id, SUM(score) AS total_score FROM game_scores
+        WHERE game_name = 'trivia' GROUP BY user_id ORDER BY total_score DESC, user_id'''
+    ).fetchall()
+    rows = walk_board(conn, 4, game='trivia')
+    assert [(r['user_id'], r['total_score']) for r in rows] == [tuple(e) for e in expected]
+
+    # Only scores from the window count
+    conn.execute("UPDATE game_scores SET created_at = '2000-01-01 00:00:00' WHERE id % 2 = 0")
+    recent = conn.execute(
+        '''SELECT user_id, SUM(score) AS total_score FROM game_scores
+        WHERE created_at >= ? GROUP BY user_id ORDER BY total_score DESC, user_id''',
+        (window_start('week'),)
+    ).fetchall()
+    rows = walk_board(conn, 5, window='week')
+    assert [(r['user_id'], r['total_score']) for r in rows] == [tuple(e) for e in recent]
+
+    # Users without scores in the window are not on it
+    assert board_standing(conn, 40, window='week') is None
+    try:
+        board_page(conn, window='month')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('unknown window accepted')
+
+
+def test_rank_around_me():
+    conn = make_db()
+    for board in ({}, {'game': 'memory'}):
+        ranking = walk_board(conn, 100, **board)
+        me = ranking[10]
+        around = board_around(conn, me['user_id'], n=3, **board)
+        assert around == ranking[7:14]
+        assert board_standing(conn, me['user_id'], **board) == me
+
+        top = board_around(conn, ranking[0]['user_id'], n=3, **board)
+        assert top == ranking[:4]
+
+
+if __name__ == '__main__':
+    test_totals_match_full_aggregate()
+    test_backfill_existing_scores()
+    test_rank_lookup_and_pages()
+    test_cursor_pages_cover_the_board()
+    test_game_and_window_boards()
+    test_rank_around_me()
+    print("✓ Materialized leaderboard matches the full aggregate")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Test script to verify logging levels and sampled payload dumps"""
+
+import logging
+
+from log_config import configure_logging, parse_levels, should_log_payload
+
+
+def test_parse_levels():
+    assert parse_levels('ml_model=DEBUG, app.payloads = warning,') == {
+        'ml_model': logging.DEBUG,
+        'app.payloads': logging.WARNING,
+    }
+    try:
+        parse_levels('app=LOUD')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('unknown level accepted')
+
+
+def test_payload_dumps_are_sampled():
+    payload_logger = logging.getLogger('test.payloads')
+    try:
+        # Off by default, even with the logger at DEBUG
+        configure_logging({'LOG_LEVELS': 'test.payloads=DEBUG'})
+        assert not should_log_payload(payload_logger)
+
+        configure_logging({'LOG_LEVELS': 'test.payloads=DEBUG', 'LOG_PAYLOAD_SAMPLE': '1'})
+        assert should_log_payload(payload_logger)
+
+        # A sample rate alone does nothing while the logger is above DEBUG
+        configure_logging({'LOG_LEVELS': 'test.payloads=INFO', 'LOG_PAYLOAD_SAMPLE': '1'})
+        assert not should_log_payload(payload_logger)
+    finally:
+        payload_logger.setLevel(logging.NOTSET)
+        configure_logging({})
+
+
+def test_queue_handler_delivers_records():
+    records = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    collector = Collect()
+    logging.getLogger('test.queue').addHandler(collector)
+    try:
+        configure_logging({'LOG_QUEUE': '1'})
+        logging.getLogger('test.queue').info('scored %d rows', 3)
+        assert records == ['scored 3 rows']
+    finally:
+        logging.getLogger('test.queue').removeHandler(collector)
+        configure_logging({})
+
+
+if __name__ == '__main__':
+    test_parse_levels()
+    test_payload_dumps_are_sampled()
+    test_queue_handler_delivers_records()
+    print("✓ Logging levels and payload sampling work")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Test script to verify login rate limits"""
+
+from login_guard import LoginGuard, TokenBuckets
+
+
+def test_token_buckets_refill_and_stay_bounded():
+    buckets = TokenBuckets(capacity=3, rate=1, max_entries=2)
+    assert [buckets.take('a', now=0) for _ in range(3)] == [0, 0, 0]
+    assert buckets.take('a', now=0) == 1.0
+    assert buckets.take('a', now=0.5) == 0.5
+    assert buckets.take('a', now=1.5) == 0
+
+    # Fully refilled buckets are forgotten; the table never outgrows its size
+    assert buckets.wait_time('a', now=100) == 0 and len(buckets) == 0
+    for key in 'bcd':
+        buckets.take(key, now=200)
+    assert len(buckets) == 2
+
+
+def test_flooding_new_keys_does_not_unlock_a_drained_bucket():
+    buckets = TokenBuckets(capacity=2, rate=0.01, max_entries=3)
+    buckets.take('victim', now=0)
+    buckets.take('victim', now=0)
+    assert buckets.wait_time('victim', now=1) > 0
+
+    # Fresh keys push the victim out of the LRU table, not out of its lockout
+    for i in range(10):
+        buckets.take(f'spray{i}', now=1)
+    assert buckets.wait_time('victim', now=2) > 0
+    assert buckets.take('victim', now=2) > 0
+    assert len(buckets) <= 6
+
+    # It still refills and is forgotten like any other bucket
+    assert buckets.take('victim', now=200) == 0
+    buckets.reset('victim')
+    assert buckets.wait_time('victim', now=200) == 0
+
+
+def test_guard_limits_failures_per_username_and_attempts_per_ip():
+    guard = LoginGuard(ip_burst=10, ip_rate=0.01, user_burst=2, user_rate=0.01)
+    for _ in range(2):
+        assert guard.admit('10.0.0.1', 'alice') == 0
+        guard.failed('alice')
+    assert guard.admit('10.0.0.2', 'alice') > 0
+
+    # Another user behind the same address is unaffected by alice's lockout
+    assert guard.admit('10.0.0.1', 'bob') == 0
+    guard.succeeded('bob')
+
+    # Every attempt from one address counts, successful or not
+    results = [guard.admit('10.0.0.3', f'user{i}') for i in range(11)]
+    assert results[:10] == [0] * 10 and results[10] > 0
+
+
+if __name__ == '__main__':
+    test_token_buckets_refill_and_stay_bounded()
+    test_flooding_new_keys_does_not_unlock_a_drained_bucket()
+    test_guard_limits_failures_per_username_and_attempts_per_ip()
+    print("✓ Login rate limits work")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Test script to verify schema migrations apply once and adopt old databases"""
+
+import sqlite3
+
+from migrations import LATEST_VERSION, MIGRATIONS, migrate, schema_version
+
+
+def columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def test_fresh_database():
+    conn = sqlite3.connect(':memory:')
+    assert migrate(conn) == LATEST_VERSION
+    assert 'model_version' in columns(conn, 'assessments')
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_game_scores_user_game' in indexes
+
+    # Already up to date: nothing to apply
+    assert migrate(conn) == LATEST_VERSION
+
+
+def test_adopts_database_created_before_migrations():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, password TEXT)')
+    conn.execute('CREATE TABLE assessments (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL)')
+    conn.execute("INSERT INTO users (username, email, password) VALUES ('a', 'a@x', 'h')")
+    conn.commit()
+    assert schema_version(conn) == 0
+
+    migrate(conn)
+    assert schema_version(conn) == LATEST_VERSION
+    assert 'model_version' in columns(conn, 'assessments')
+    assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 1
+
+
+def test_failed_migration_rolls_back():
+    conn = sqlite3.connect(':memory:')
+    broken = MIGRATIONS + [
+        (LATEST_VERSION + 1, 'broken', [
+            'CREATE TABLE half_done (id INTEGER)',
+            'CREATE TABLE users (id INTEGER)',
+        ]),
+    ]
+    try:
+        migrate(conn, broken)
+    except sqlite3.OperationalError:
+        pass
+    else:
+        raise AssertionError('broken migration applied')
+    assert schema_version(conn) == LATEST_VERSION
+    assert 'half_done' not in {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+
+if __name__ == '__main__':
+    test_fresh_database()
+    test_adopts_database_created_before_migrations()
+    test_failed_migration_rolls_back()
+    print("✓ Schema migrations apply once and adopt old databases")
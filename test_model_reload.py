@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Test script to verify a reload with the compiled engine runs the new bundle's trees"""
+
+import os
+import shutil
+import tempfile
+
+import joblib
+import lightgbm
+import numpy as np
+
+import ml_model
+from compiled_model import compile_bundle, engine_path_for, file_fingerprint
+from ml_model import LEGACY_BUNDLE_PATH, DropoutPredictor, ModelRegistry, reload_model, validate_predictor
+
+
+def retrained_bundle(path):
+    """A bundle with the legacy bundle's features but a different model"""
+    bundle = joblib.load(LEGACY_BUNDLE_PATH)
+    reference = DropoutPredictor(LEGACY_BUNDLE_PATH)
+    X_rows = reference._parity_sample(n_rows=2000, seed=1)
+    y = (np.random.default_rng(1).random(len(X_rows)) < 0.3).astype(int)
+    categorical = [position for position, *_ in reference.encoder.categorical_features]
+    model = lightgbm.LGBMClassifier(n_estimators=10, num_leaves=8, verbose=-1)
+    model.fit(X_rows, y, categorical_feature=categorical)
+    joblib.dump({**bundle, 'model': model}, path)
+
+
+def test_reload_switches_compiled_engine():
+    saved = (ml_model.DROPOUT_ENGINE, ml_model.DROPOUT_ENGINE_PATH, ml_model.registry, ml_model._predictor)
+    with tempfile.TemporaryDirectory() as directory:
+        v1, v2 = os.path.join(directory, 'v1.pkl'), os.path.join(directory, 'v2.pkl')
+        shutil.copy(LEGACY_BUNDLE_PATH, v1)
+        retrained_bundle(v2)
+        compile_bundle(v1)
+        compile_bundle(v2)
+        try:
+            ml_model.DROPOUT_ENGINE = 'compiled'
+            # A fixed engine path must not win over the reloaded bundle
+            ml_model.DROPOUT_ENGINE_PATH = str(engine_path_for(v1))
+            ml_model.registry = ModelRegistry(directory)
+            ml_model.registry.set_current('v1')
+            ml_model._predictor = None
+
+            old = ml_model.get_predictor()
+            assert old.model_version == 'v1' and old.engine is not None
+            sample = old._parity_sample(n_rows=500, seed=2)
+            old_scores = old._predict_proba_rows(sample)
+
+            reload_model('v2', wait=True)
+            new = ml_model.get_predictor()
+            assert new.model_version == 'v2' and new.engine is not None
+            assert new.model_fingerprint == new.engine_fingerprint == file_fingerprint(v2)
+            assert not np.allclose(new._predict_proba_rows(sample), old_scores)
+
+            # An engine compiled from another bundle is never used for this one
+            shutil.copy(engine_path_for(v1), engine_path_for(v2))
+            stale = DropoutPredictor(v2, 'v2')
+            assert stale.engine_fingerprint == file_fingerprint(v2)
+            assert np.allclose(stale._predict_proba_rows(sample), new._predict_proba_rows(sample))
+        finally:
+            (ml_model.DROPOUT_ENGINE, ml_model.DROPOUT_ENGINE_PATH,
+             ml_model.registry, ml_model._predictor) = saved
+
+
+def test_bundle_replaced_while_loading_is_rejected():
+    with tempfile.TemporaryDirectory() as directory:
+        v1, v2 = os.path.join(directory, 'v1.pkl'), os.path.join(directory, 'v2.pkl')
+        shutil.copy(LEGACY_BUNDLE_PATH, v1)
+        retrained_bundle(v2)
+        candidate = DropoutPredictor(v1, 'v1')
+        validate_predictor(candidate)
+
+        shutil.copy(v2, v1)
+        try:
+            validate_predictor(candidate)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a predictor loaded from a replaced bundle was accepted")
+
+
+if __name__ == '__main__':
+    test_reload_switches_compiled_engine()
+    test_bundle_replaced_while_loading_is_rejected()
+    print("✓ Reloading with the compiled engine runs the new bundle's trees")
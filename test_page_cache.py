@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Test script to verify rendered pages are cached, precompressed and invalidated"""
+
+import gzip
+import os
+import tempfile
+
+from flask import Flask
+
+from assets import Assets, build
+from page_cache import PageCache
+
+
+def make_app(folder):
+    app = Flask(__name__, template_folder=folder)
+    cache = PageCache(app)
+
+    @app.route('/game/<lang>')
+    def game(lang):
+        return cache.render('game.html', lang=lang)
+
+    return app, cache
+
+
+def write_template(folder, text):
+    path = os.path.join(folder, 'game.html')
+    with open(path, 'w') as f:
+        f.write(text * 200)
+    return path
+
+
+def test_repeat_views_come_from_the_cache():
+    with tempfile.TemporaryDirectory() as folder:
+        write_template(folder, '<p>{{ lang }} game</p>')
+        app, cache = make_app(folder)
+        client = app.test_client()
+
+        first = client.get('/game/en')
+        assert first.data.startswith(b'<p>en game</p>')
+        second = client.get('/game/en', headers={'Accept-Encoding': 'gzip, deflate'})
+        assert second.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(second.data) == first.data
+        assert 'Accept-Encoding' in second.headers['Vary']
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # The language is part of the key
+        assert client.get('/game/hi').data.startswith(b'<p>hi game</p>')
+        assert cache.misses == 2
+
+        # Revalidation with any variant's ETag is a 304
+        revalidated = client.get('/game/en', headers={'If-None-Match': second.headers['ETag']})
+        assert revalidated.status_code == 304 and revalidated.data == b''
+
+
+def test_template_change_invalidates():
+    with tempfile.TemporaryDirectory() as folder:
+        path = write_template(folder, '<p>old {{ lang }}</p>')
+        app, cache = make_app(folder)
+        client = app.test_client()
+        old = client.get('/game/en')
+        assert old.data.startswith(b'<p>old en</p>')
+
+        write_template(folder, '<p>new {{ lang }}</p>')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        # A key first rendered after the edit gets the new template...
+        assert client.get('/game/hi').data.startswith(b'<p>new hi</p>')
+        # ...and one cached before it is rebuilt
+        new = client.get('/game/en', headers={'If-None-Match': old.headers['ETag']})
+        assert new.status_code == 200 and new.data.startswith(b'<p>new en</p>')
+
+
+def test_asset_build_change_invalidates():
+    with tempfile.TemporaryDirectory() as folder:
+        write_template(folder, '<script src="{{ asset_url() }}"></script>')
+        source, dist = os.path.join(folder, 'src'), os.path.join(folder, 'dist')
+        os.makedirs(os.path.join(source, 'js'))
+        script = os.path.join(source, 'js', 'game.js')
+        with open(script, 'w') as f:
+            f.write('let level = 1;\n')
+
+        app = Flask(__name__, template_folder=folder)
+        assets = Assets(app, source=source, dist=dist)
+        app.add_template_global(lambda: assets.url('js/game.js'), 'asset_url')
+        cache = PageCache(app, version=assets.version)
+        app.add_url_rule('/game', 'game', lambda: cache.render('game.html'))
+        client = app.test_client()
+
+        old = client.get('/game').data
+        assert client.get('/game').data == old and cache.hits == 1
+
+        # A deploy rebuilds the assets; the template itself is untouched
+        with open(script, 'w') as f:
+            f.write('let level = 2;\n')
+        build(source, dist)
+        assets.load()
+        new = client.get('/game').data
+        assert new != old and assets.manifest['js/game.js'].encode() in new
+
+
+if __name__ == '__main__':
+    test_repeat_views_come_from_the_cache()
+    test_template_change_invalidates()
+    test_asset_build_change_invalidates()
+    print("✓ Rendered pages are cached, precompressed and invalidated")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Test script to verify password hashing runs in a bounded pool and rehashes old hashes"""
+
+import threading
+
+from werkzeug.security import generate_password_hash
+
+from passwords import PasswordHasher, PasswordHasherBusy
+
+FAST = 'pbkdf2:sha256:1000'
+
+
+def test_hash_verify_and_rehash():
+    hasher = PasswordHasher(method=FAST, workers=2)
+    stored = hasher.hash('secret')
+    assert stored.startswith(FAST + '$')
+    assert hasher.verify(stored, 'secret') == (True, False)
+    assert hasher.verify(stored, 'wrong') == (False, False)
+
+    # Older parameters verify, and ask to be replaced
+    old = generate_password_hash('secret', method='pbkdf2:sha256:500')
+    assert hasher.verify(old, 'secret') == (True, True)
+    assert hasher.verify(old, 'wrong') == (False, False)
+
+    # Missing users still cost a check, and never match
+    assert hasher.verify_dummy('secret') is False
+    hasher.close()
+
+
+def test_shorthand_method_is_not_always_stale():
+    # Werkzeug expands the shorthand to scrypt:<its default n:r:p>
+    hasher = PasswordHasher(method='scrypt', workers=1)
+    stored = hasher.hash('secret')
+    assert stored.split('$', 1)[0] != 'scrypt'
+    assert hasher.verify(stored, 'secret') == (True, False)
+    assert hasher.needs_rehash(generate_password_hash('secret', method=FAST))
+    hasher.close()
+
+
+def test_admission_control():
+    hasher = PasswordHasher(method=FAST, workers=1, queue_size=0, wait=0.05)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    holder = threading.Thread(target=hasher._run, args=(slow,))
+    holder.start()
+    started.wait(5)
+    try:
+        hasher.hash('secret')
+    except PasswordHasherBusy:
+        pass
+    else:
+        raise AssertionError('saturated pool accepted more work')
+    release.set()
+    holder.join()
+
+    # The slot is given back once the job finishes
+    assert hasher.verify(hasher.hash('secret'), 'secret')[0]
+    hasher.close()
+
+
+if __name__ == '__main__':
+    test_hash_verify_and_rehash()
+    test_shorthand_method_is_not_always_stale()
+    test_admission_control()
+    print("✓ Password hashing runs in a bounded pool and rehashes old hashes")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""Test script to verify document previews are made in the background and tracked"""
+
+import os
+import tempfile
+
+import pytest
+
+import previews
+from db import connect
+from documents import DocumentStore, parse_upload
+from migrations import migrate
+from previews import PREVIEW_MAX_SIZE, THUMBNAIL_SIZE, PreviewWorker, can_preview, render_previews
+from test_documents import save_document, upload_body
+
+
+def make_store(tmp):
+    store = DocumentStore(os.path.join(tmp, 'store'))
+    conn = connect(os.path.join(tmp, 'docs.db'))
+    migrate(conn)
+    return store, conn
+
+
+def upload(conn, store, user_id, content, filename):
+    stream, content_type = upload_body(content, filename=filename)
+    path = save_document(conn, store, user_id, parse_upload(stream, content_type, store)[1])
+    doc_id = conn.execute('SELECT id FROM documents WHERE file_path = ? AND user_id = ?', (path, user_id)).fetchone()[0]
+    return doc_id, path
+
+
+def fake_render(path, preview_path, thumbnail_path):
+    """Stands in for Pillow, which is optional"""
+    os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+    for derived in (preview_path, thumbnail_path):
+        with open(derived, 'wb') as f:
+            f.write(b'jpeg')
+    return preview_path
+
+
+def test_worker_records_previews_and_reuses_them():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, conn = make_store(tmp)
+        worker = PreviewWorker(os.path.join(tmp, 'docs.db'), store, workers=2)
+        render, previews.render_previews = previews.render_previews, fake_render
+        try:
+            first, path = upload(conn, store, 1, b'scan', 'scan.jpg')
+            assert worker.submit(first, path).result(timeout=10)
+            second, _ = upload(conn, store, 2, b'scan', 'scan.jpg')
+            assert worker.submit(second, path).result(timeout=10)
+        finally:
+            previews.render_previews = render
+            worker.close()
+
+        rows = conn.execute('SELECT processing_status, preview_path, thumbnail_path FROM documents').fetchall()
+        assert [tuple(row) for row in rows] == [('done', *store.derived_paths(path))] * 2
+
+        # Undecodable files are marked failed rather than retried forever
+        worker = PreviewWorker(worker.path, store)
+        if can_preview('jpg'):
+            broken, broken_path = upload(conn, store, 3, b'not a jpeg', 'broken.jpg')
+            assert not worker.submit(broken, broken_path).result(timeout=10)
+            status = conn.execute('SELECT processing_status FROM documents WHERE id = ?', (broken,)).fetchone()[0]
+            assert status == 'failed'
+        worker.close()
+
+
+def test_previews_are_reclaimed_with_their_object():
+    with tempfile.TemporaryDirectory() as tmp:
+        store, conn = make_store(tmp)
+        _, path = upload(conn, store, 1, b'old scan', 'scan.png')
+        preview_path, thumbnail_path = store.derived_paths(path)
+        fake_render(path, preview_path, thumbnail_path)
+
+        upload(conn, store, 1, b'new scan', 'scan.png')
+        assert not os.path.exists(path)
+        assert not os.path.exists(preview_path) and not os.path.exists(thumbnail_path)
+
+        # Previews whose object vanished some other way are swept too
+        fake_render(path, preview_path, thumbnail_path)
+        assert store.reclaim_orphans(conn, min_age=0) == 2
+
+
+def test_images_are_rendered_to_bounded_jpegs():
+    Image = pytest.importorskip('PIL.Image')
+    with tempfile.TemporaryDirectory() as tmp:
+        derived = os.path.join(tmp, 'derived')
+        preview_path, thumbnail_path = os.path.join(derived, 'p.jpg'), os.path.join(derived, 't.jpg')
+
+        # A phone-sized photo is scaled down to the preview bound
+        scan = os.path.join(tmp, 'scan.jpg')
+        Image.new('RGB', (3000, 2000), 'white').save(scan)
+        assert render_previews(scan, preview_path, thumbnail_path) == preview_path
+        with Image.open(preview_path) as preview:
+            assert preview.format == 'JPEG' and preview.size == (PREVIEW_MAX_SIZE, round(PREVIEW_MAX_SIZE * 2 / 3))
+        with Image.open(thumbnail_path) as thumbnail:
+            assert thumbnail.format == 'JPEG' and thumbnail.size == (THUMBNAIL_SIZE, round(THUMBNAIL_SIZE * 2 / 3))
+
+        # A small image is its own preview; only the thumbnail is written
+        os.remove(preview_path)
+        small = os.path.join(tmp, 'small.png')
+        Image.new('RGBA', (800, 600), (0, 0, 255, 128)).save(small)
+        assert render_previews(small, preview_path, thumbnail_path) == small
+        assert not os.path.exists(preview_path)
+        with Image.open(thumbnail_path) as thumbnail:
+            assert thumbnail.format == 'JPEG' and thumbnail.size == (THUMBNAIL_SIZE, round(THUMBNAIL_SIZE * 3 / 4))
+
+
+def test_pdf_first_page_is_rendered():
+    Image = pytest.importorskip('PIL.Image')
+    if not can_preview('pdf'):
+        pytest.skip('no PDF backend installed')
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, 'marks.pdf')
+        Image.new('RGB', (600, 800), 'white').save(pdf)
+        preview_path, thumbnail_path = os.path.join(tmp, 'p.jpg'), os.path.join(tmp, 't.jpg')
+        assert render_previews(pdf, preview_path, thumbnail_path) == preview_path
+        with Image.open(preview_path) as preview:
+            assert preview.format == 'JPEG' and max(preview.size) <= PREVIEW_MAX_SIZE
+            assert preview.height > preview.width
+        with Image.open(thumbnail_path) as thumbnail:
+            assert thumbnail.format == 'JPEG' and max(thumbnail.size) == THUMBNAIL_SIZE
+
+
+if __name__ == '__main__':
+    test_worker_records_previews_and_reuses_them()
+    test_previews_are_reclaimed_with_their_object()
+    test_images_are_rendered_to_bounded_jpegs()
+    test_pdf_first_page_is_rendered()
+    print("✓ Document previews are made in the background and tracked")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""Test script to verify hot queries are served by indexes, not full table scans"""
+
+import os
+import tempfile
+
+# Point the app at a scratch database before it is imported
+_tmp = tempfile.TemporaryDirectory()
+os.environ['HEXECUTIONERS_DB'] = os.path.join(_tmp.name, 'plans.db')
+
+import app
+from db import ConnectionPool, connect
+
+# Requests on the hot paths; every statement they run is checked
+HOT_REQUESTS = [
+    ('POST', '/login', {'data': {'username': 'player0', 'password': 'secret'}}),
+    ('GET', '/dashboard', {}),
+    ('GET', '/skill-performance', {}),
+    ('GET', '/assessment', {}),
+    ('GET', '/profile', {}),
+    ('GET', '/upload-documents-page', {}),
+    ('POST', '/api/save-score', {'json': {'game_name': 'Quick Trivia', 'score': 7}}),
+    ('GET', '/api/leaderboard?around=2', {}),
+    ('GET', '/api/leaderboard?game=Quick+Trivia&around=2', {}),
+    ('GET', '/api/leaderboard?window=week', {}),
+    ('GET', '/download-document/1', {}),
+]
+
+
+class TracedPool(ConnectionPool):
+    """Pool whose connections record every statement they run"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.statements = []
+
+    def acquire(self):
+        conn = super().acquire()
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
+def full_scans(conn, sql):
+    """Plan steps that read a whole table without an index"""
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + sql).fetchall()
+    # Materialized CTEs and subqueries are scanned by design
+    derived = {row[3].split()[-1] for row in plan if row[3].startswith(('MATERIALIZE', 'CO-ROUTINE'))}
+    scans = []
+    for row in plan:
+        detail = row[3]
+        if not detail.startswith('SCAN ') or ' USING ' in detail:
+            continue
+        name = detail.split()[1]
+        if name in derived or name.startswith('(') or detail == 'SCAN CONSTANT ROW':
+            continue
+        scans.append(detail)
+    return scans
+
+
+ASSESSMENT_ANSWERS = [
+    'age', 'passed12th', 'gender', 'familyMembers', 'earningMembers', 'highestEducation',
+    'familyHealthCondition', 'familySupport', 'dailyChores', 'groupActivities', 'sportsRating',
+    'communicationRating', 'technologyComfort', 'pastProgram', 'reasonForJoining', 'dailyCommitment',
+    'travelComfort', 'workExperience', 'healthCondition', 'programBenefit',
+]
+
+
+def seed(conn):
+    from werkzeug.security import generate_password_hash
+    password = generate_password_hash('secret')
+    for i in range(50):
+        conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     (f'player{i}', f'player{i}@example.com', password))
+        conn.execute(
+            f"INSERT INTO assessments (user_id, {', '.join(ASSESSMENT_ANSWERS)}) "
+            f"VALUES (?{', ?' * len(ASSESSMENT_ANSWERS)})",
+            (i + 1, *['x'] * len(ASSESSMENT_ANSWERS))
+        )
+        conn.execute("INSERT INTO documents (user_id, document_type, file_path) VALUES (?, 'Aadhar Card', 'x.pdf')",
+                     (i + 1,))
+        for game in ('Quick Trivia', 'Memory Match', 'Number Guess'):
+            conn.execute('INSERT INTO game_scores (user_id, game_name, score) VALUES (?, ?, ?)',
+                         (i + 1, game, i * 3 % 17))
+
+
+def test_hot_queries_use_indexes():
+    app.init_db()
+    pool = TracedPool(app.DATABASE)
+    conn = pool.acquire()
+    seed(conn)
+    pool.release(conn)
+    pool.statements.clear()
+    app.db_pool = pool
+
+    client = app.app.test_client()
+    for method, path, kwargs in HOT_REQUESTS:
+        response = client.open(path, method=method, **kwargs)
+        assert response.status_code < 500, (path, response.status_code)
+
+    checked = 0
+    conn = connect(app.DATABASE)
+    for sql in set(pool.statements):
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH', 'UPDATE', 'DELETE')):
+            continue
+        scans = full_scans(conn, sql)
+        assert not scans, f"Full scan {scans} in: {sql}"
+        checked += 1
+    conn.close()
+    assert checked >= 10
+
+
+if __name__ == '__main__':
+    test_hot_queries_use_indexes()
+    print("✓ Hot queries are served by indexes")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Test script to verify responses are compressed in a negotiated encoding, only when it helps"""
+
+import gzip
+import json
+
+from flask import Flask, Response, jsonify, request
+
+from response_compression import CompressionMiddleware
+
+PAGE = '<p>' + 'Skill assessment for every applicant. ' * 200 + '</p>'
+
+
+def make_app(**options):
+    app = Flask(__name__)
+
+    @app.route('/page')
+    def page():
+        response = Response(PAGE, mimetype='text/html')
+        response.set_etag('page-v1')
+        return response.make_conditional(request)
+
+    @app.route('/api')
+    def api():
+        return jsonify({'rows': [{'rank': rank, 'name': f'user{rank}'} for rank in range(200)]})
+
+    @app.route('/small')
+    def small():
+        return 'tiny'
+
+    @app.route('/photo')
+    def photo():
+        return Response(b'\xff\xd8' + b'\x00' * 4096, mimetype='image/jpeg')
+
+    @app.route('/precompressed')
+    def precompressed():
+        return Response(gzip.compress(PAGE.encode()), mimetype='text/html', headers={'Content-Encoding': 'gzip'})
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'<li>row {n}</li>\n' for n in range(5000)), mimetype='text/html')
+
+    compression = CompressionMiddleware(app.wsgi_app, **options)
+    app.wsgi_app = compression
+    return app, compression
+
+
+def test_text_is_compressed_in_the_accepted_encoding():
+    app, compression = make_app()
+    client = app.test_client()
+
+    plain = client.get('/page')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+
+    compressed = client.get('/page', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert int(compressed.headers['Content-Length']) == len(compressed.data) < len(plain.data)
+    assert compressed.headers['ETag'] == 'W/"page-v1"'
+
+    # The weakened ETag still revalidates
+    revalidated = client.get('/page', headers={'Accept-Encoding': 'gzip', 'If-None-Match': 'W/"page-v1"'})
+    assert revalidated.status_code == 304
+
+    api = client.get('/api', headers={'Accept-Encoding': 'gzip'})
+    assert api.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(api.data))['rows'][199]['rank'] == 199
+
+    stats = compression.stats()
+    assert stats['responses'] == 2
+    assert stats['bytes_saved'] == stats['bytes_in'] - stats['bytes_out'] > 0
+    assert stats['encodings']['gzip']['responses'] == 2
+
+
+def test_ineligible_responses_pass_through():
+    app, compression = make_app()
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+
+    assert 'Content-Encoding' not in client.get('/small', headers=headers).headers
+    photo = client.get('/photo', headers=headers)
+    assert 'Content-Encoding' not in photo.headers and 'Vary' not in photo.headers
+
+    precompressed = client.get('/precompressed', headers=headers)
+    assert gzip.decompress(precompressed.data).decode() == PAGE
+    assert client.head('/page', headers=headers).headers.get('Content-Encoding') is None
+    assert client.get('/page', headers={'Accept-Encoding': 'identity'}).data.decode() == PAGE
+    assert compression.stats()['responses'] == 0
+
+
+def test_large_responses_are_streamed():
+    app, compression = make_app(buffer_size=1024)
+    client = app.test_client()
+
+    response = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data).decode() == PAGE
+
+    streamed = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+    text = gzip.decompress(streamed.data).decode()
+    assert text.startswith('<li>row 0</li>') and text.endswith('<li>row 4999</li>\n')
+    assert compression.stats()['encodings']['gzip']['responses'] == 2
+
+
+if __name__ == '__main__':
+    test_text_is_compressed_in_the_accepted_encoding()
+    test_ineligible_responses_pass_through()
+    test_large_responses_are_streamed()
+    print("✓ Responses are compressed in a negotiated encoding, only when it helps")
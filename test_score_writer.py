@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Test script to verify buffered score writes are batched, flushed and durable"""
+
+import os
+import tempfile
+import threading
+import time
+
+from db import connect
+from migrations import migrate
+from score_writer import ScoreWriter
+
+
+def make_db(tmp):
+    path = os.path.join(tmp, 'scores.db')
+    conn = connect(path)
+    migrate(conn)
+    for i in range(10):
+        conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     (f'user{i}', f'user{i}@example.com', 'x'))
+    return path, conn
+
+
+def test_batches_by_size_and_flushes_on_close():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        writer = ScoreWriter(path, batch_size=100, interval=60)
+
+        def play(user_id):
+            for score in range(250):
+                assert writer.submit(user_id, 'Quick Trivia', score)
+
+        threads = [threading.Thread(target=play, args=(user_id,)) for user_id in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        assert conn.execute('SELECT COUNT(*) FROM game_scores').fetchone()[0] == 1000
+        stats = writer.stats()
+        assert stats['written'] == 1000 and stats['dropped'] == 0
+        assert stats['batches'] <= 12
+        # The leaderboard totals triggers ran for every batched row
+        totals = conn.execute('SELECT SUM(total_score), SUM(games_played) FROM user_totals').fetchone()
+        assert tuple(totals) == (4 * sum(range(250)), 1000)
+        assert not writer.submit(1, 'Quick Trivia', 1)
+
+
+def test_interval_flush_and_wait_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        writer = ScoreWriter(path, batch_size=1000, interval=0.05)
+
+        # wait=True returns only once the row is committed
+        assert writer.submit(1, 'Memory Match', 42, wait=True)
+        assert conn.execute('SELECT score FROM game_scores').fetchall()[0][0] == 42
+
+        writer.submit(2, 'Memory Match', 7)
+        assert writer.flush()
+        assert conn.execute('SELECT COUNT(*) FROM game_scores').fetchone()[0] == 2
+        created_at = conn.execute('SELECT created_at FROM game_scores WHERE user_id = 2').fetchone()[0]
+        assert len(created_at) == len('2024-01-01 00:00:00')
+        writer.close()
+
+
+def test_bad_event_does_not_lose_the_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        writer = ScoreWriter(path, batch_size=3, interval=60)
+        writer.submit(1, 'Number Guess', 1)
+        writer.submit(1, None, 2)  # violates NOT NULL
+        assert writer.submit(1, 'Number Guess', 3, wait=True)
+        writer.close()
+
+        assert [row[0] for row in conn.execute('SELECT score FROM game_scores ORDER BY id')] == [1, 3]
+        assert writer.stats()['dropped'] == 1
+
+
+def test_unexpected_failure_drops_and_reports_events():
+    class FlakyWriter(ScoreWriter):
+        failures = 1
+
+        def _write(self, conn, batch):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError('disk on fire')
+            super()._write(conn, batch)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        writer = FlakyWriter(path, batch_size=1, interval=60)
+        # The waiter hears about the loss instead of timing out
+        assert not writer.submit(1, 'Number Guess', 1, wait=True)
+        assert writer.submit(1, 'Number Guess', 2, wait=True)
+        writer.close()
+
+        assert [row[0] for row in conn.execute('SELECT score FROM game_scores')] == [2]
+        assert writer.stats()['dropped'] == 1
+
+
+def test_close_does_not_block_on_a_full_buffer():
+    release = threading.Event()
+
+    class StuckWriter(ScoreWriter):
+        def _write(self, conn, batch):
+            release.wait(10)
+            super()._write(conn, batch)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, conn = make_db(tmp)
+        writer = StuckWriter(path, batch_size=1, interval=60, max_pending=1)
+        writer.submit(1, 'Number Guess', 1)
+        while writer.stats()['pending']:
+            time.sleep(0.01)
+        writer.submit(1, 'Number Guess', 2)
+
+        started = time.monotonic()
+        writer.close(timeout=0.2)
+        assert time.monotonic() - started < 2
+        assert not writer.submit(1, 'Number Guess', 3)
+        release.set()
+
+
+if __name__ == '__main__':
+    test_batches_by_size_and_flushes_on_close()
+    test_interval_flush_and_wait_mode()
+    test_bad_event_does_not_lose_the_batch()
+    test_unexpected_failure_drops_and_reports_events()
+    test_close_does_not_block_on_a_full_buffer()
+    print("✓ Buffered score writes are batched, flushed and durable")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Test script to verify sessions are stored server-side behind an opaque cookie"""
+
+import os
+import tempfile
+
+from flask import Flask, jsonify, session
+
+from db import ConnectionPool, connect
+from migrations import migrate
+from sessions import MemoryStore, ServerSideSessionInterface, SessionStore, SqliteStore
+
+
+def make_app(store, **kwargs):
+    app = Flask(__name__)
+    app.session_interface = ServerSideSessionInterface(store, **kwargs)
+
+    @app.route('/pre-assessment')
+    def pre_assessment():
+        session['pre_assessment_data'] = {'name': 'A' * 500, 'answers': list(range(20))}
+        return 'ok'
+
+    @app.route('/login')
+    def login():
+        session.regenerate()
+        session['user_id'] = 1
+        return 'ok'
+
+    @app.route('/whoami')
+    def whoami():
+        return jsonify(dict(session))
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app
+
+
+def session_cookie(client):
+    cookie = client.get_cookie('session')
+    return cookie.value if cookie else None
+
+
+def check_store(store):
+    client = make_app(store).test_client()
+    client.get('/pre-assessment')
+    sid = session_cookie(client)
+    assert sid and len(sid) < 64
+    assert store.load(sid, 0) is not None
+    assert client.get('/whoami').json['pre_assessment_data']['answers'] == list(range(20))
+
+    # Login moves the values to a new id; the old one stops working
+    client.get('/login')
+    new_sid = session_cookie(client)
+    assert new_sid != sid and store.load(sid, 0) is None
+    assert client.get('/whoami').json['user_id'] == 1
+
+    client.get('/logout')
+    assert session_cookie(client) is None
+    assert store.load(new_sid, 0) is None
+
+
+def test_memory_store():
+    check_store(MemoryStore())
+
+
+def test_sqlite_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.db')
+        conn = connect(path)
+        migrate(conn)
+        pool = ConnectionPool(path)
+        check_store(SqliteStore(pool))
+        pool.close()
+        conn.close()
+
+
+def test_expiry_and_purge():
+    store = MemoryStore()
+    app = make_app(store, anon_lifetime=-1, purge_interval=0)
+    client = app.test_client()
+    store.save('abandoned', '{}', 1)
+    client.get('/pre-assessment')
+    # Born expired: never loaded again, and purged along with the abandoned one
+    assert client.get('/whoami').json == {}
+    assert store._sessions == {}
+
+
+def test_incomplete_store_is_refused():
+    class ReadOnlyStore(SessionStore):
+        def load(self, sid, now):
+            return None
+
+    try:
+        ReadOnlyStore()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("a store without save, delete and purge was instantiated")
+
+
+if __name__ == '__main__':
+    test_memory_store()
+    test_sqlite_store()
+    test_expiry_and_purge()
+    test_incomplete_store_is_refused()
+    print("✓ Sessions are stored server-side behind an opaque cookie")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Test script to verify skill aggregates track score saves and build the profile"""
+
+import sqlite3
+
+from migrations import SKILL_RECENT_PLAYS, migrate
+from skills import SKILL_AREAS, skill_profile, trend
+
+
+def make_db():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    for i in range(4):
+        conn.execute('INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                     (f'user{i}', f'user{i}@example.com', 'x'))
+    return conn
+
+
+def save(conn, user_id, game_name, *scores):
+    conn.executemany('INSERT INTO game_scores (user_id, game_name, score) VALUES (?, ?, ?)',
+                     [(user_id, game_name, score) for score in scores])
+
+
+def test_aggregates_update_incrementally():
+    conn = make_db()
+    scores = list(range(1, SKILL_RECENT_PLAYS + 6))
+    save(conn, 1, 'Quick Trivia', *scores)
+
+    row = conn.execute("SELECT * FROM skill_stats WHERE user_id = 1 AND game_name = 'Quick Trivia'").fetchone()
+    assert (row['plays'], row['best'], row['total_score']) == (len(scores), max(scores), sum(scores))
+    assert row['recent'] == '[' + ','.join(map(str, scores[-SKILL_RECENT_PLAYS:])) + ']'
+
+    # Deleting a score rebuilds the pair from what is left
+    conn.execute("DELETE FROM game_scores WHERE user_id = 1 AND score = ?", (max(scores),))
+    row = conn.execute("SELECT * FROM skill_stats WHERE user_id = 1").fetchone()
+    assert (row['plays'], row['best']) == (len(scores) - 1, max(scores) - 1)
+    assert row['recent'] == '[' + ','.join(map(str, scores[-SKILL_RECENT_PLAYS - 1:-1])) + ']'
+
+
+def test_profile_percentiles_and_trend():
+    conn = make_db()
+    save(conn, 1, 'Chart Detective', 10, 20, 30)
+    save(conn, 2, 'Chart Detective', 5)
+    save(conn, 3, 'Chart Detective', 50)
+    save(conn, 4, 'Chart Detective', 30)
+    save(conn, 1, 'Memory Match', 9, 3)
+
+    profile = skill_profile(conn, 1)
+    games = {game['name']: game for game in profile['games']}
+    assert [game['name'] for game in profile['games']] == ['Memory Match', 'Chart Detective']
+
+    chart = games['Chart Detective']
+    assert (chart['best'], chart['mean'], chart['plays']) == (30, 20.0, 3)
+    # One below, one tie (counted as half) out of four players
+    assert chart['percentile'] == round((1 + 2 / 2) / 4 * 100)
+    assert chart['trend'] == 10.0
+    assert games['Memory Match']['trend'] == -6.0
+
+    skills = {skill['name']: skill['score'] for skill in profile['skills']}
+    assert len(skills) == len(SKILL_AREAS)
+    assert skills['Data Interpretation'] == chart['percentile']
+    assert skills['Spatial Reasoning'] == games['Memory Match']['percentile'] == 50
+    assert skills['Abstract Thinking'] == 0
+
+    assert skill_profile(conn, 2)['games'][0]['percentile'] == round(0.5 / 4 * 100)
+    assert trend([7]) == 0.0
+
+
+if __name__ == '__main__':
+    test_aggregates_update_incrementally()
+    test_profile_percentiles_and_trend()
+    print("✓ Skill aggregates track score saves and build the profile")